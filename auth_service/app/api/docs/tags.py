@@ -5,6 +5,8 @@ class ApiTags(Enum):
     V1_AUTH = 'API V1 / Auth'
     V1_ROLES = 'API V1 / Roles'
     V1_USERS = 'API V1 / Users'
+    V1_SERVICE = 'API V1 / Service'
+    WELL_KNOWN = 'Well-known'
 
 
 # Теги отображаются в Swagger в порядке, заданном в списке
@@ -18,4 +20,10 @@ api_tags = [
     {
         'name': ApiTags.V1_USERS,
     },
+    {
+        'name': ApiTags.V1_SERVICE,
+    },
+    {
+        'name': ApiTags.WELL_KNOWN,
+    },
 ]
@@ -2,29 +2,39 @@ from fastapi import APIRouter, Depends, Query, Request, status
 
 from app.api.docs.tags import ApiTags
 from app.exceptions import (
+    InvalidCursorError,
+    PasswordServiceOverloadedError,
+    TokenBatchTooLargeError,
     TokenError,
     UserAlreadyExistsError,
     UserNotFoundError,
     WrongPasswordError,
     auth_error,
+    invalid_cursor_error,
+    service_overloaded_error,
+    token_batch_too_large_error,
     user_already_exists_error,
 )
 from app.schemas.api.v1.auth_schemas import (
     CredentialsLoginDataSchema,
-    HistoryResponseSchema,
+    HistoryPageResponseSchema,
     LoginType,
+    LogoutAllResponseSchema,
     RefreshLoginDataSchema,
     RegisterResponseSchema,
     RegisterUserCredentialsSchema,
     ResetPasswordSchema,
     ResetResponseSchema,
     ResetUsernameSchema,
+    SessionListResponseSchema,
     TokenPairSchema,
     UserCredentialsSchema,
+    VerifyBatchRequestSchema,
+    VerifyBatchResponseSchema,
 )
 from app.services.auth.auth_service import AuthenticationService
 from app.services.auth.registration_service import RegistrationService
-from app.services.fastapi.dependencies import get_bearer_token
+from app.services.fastapi.dependencies import get_bearer_token, use_unit_of_work
 
 from app.exceptions import ProviderAuthError
 from app.services.providers.provider_service import ProviderService
@@ -34,6 +44,7 @@ auth_router = APIRouter(prefix='/auth')
 
 @auth_router.post(
     '/register',
+    dependencies=[Depends(use_unit_of_work)],
     status_code=status.HTTP_201_CREATED,
     summary='Зарегистрировать пользователя',
     response_model=RegisterResponseSchema,
@@ -47,6 +58,8 @@ async def api_v1_register(
         return await service.create_user(user_credentials)
     except UserAlreadyExistsError:
         raise user_already_exists_error
+    except PasswordServiceOverloadedError:
+        raise service_overloaded_error
 
 
 @auth_router.post(
@@ -70,6 +83,8 @@ async def api_v1_login(
         return await service.authenticate_by_credentials(login_data=login_data)
     except (WrongPasswordError, UserNotFoundError):
         raise auth_error
+    except PasswordServiceOverloadedError:
+        raise service_overloaded_error
 
 
 @auth_router.post(
@@ -113,6 +128,42 @@ async def api_v1_logout(
     return {'detail': 'Successful logout'}
 
 
+@auth_router.post(
+    '/logout/all',
+    status_code=status.HTTP_200_OK,
+    summary='Удалить все сессии пользователя',
+    response_model=LogoutAllResponseSchema,
+    tags=[ApiTags.V1_AUTH],
+)
+async def api_v1_logout_all(
+    access_token: str = Depends(get_bearer_token),
+    service: AuthenticationService = Depends(),
+):
+    try:
+        revoked_sessions = await service.logout_all(access_token)
+    except TokenError:
+        raise auth_error
+
+    return LogoutAllResponseSchema(detail='Successful logout', revoked_sessions=revoked_sessions)
+
+
+@auth_router.get(
+    '/sessions',
+    status_code=status.HTTP_200_OK,
+    summary='Получить активные сессии пользователя',
+    response_model=SessionListResponseSchema,
+    tags=[ApiTags.V1_AUTH],
+)
+async def api_v1_sessions(
+    access_token: str = Depends(get_bearer_token),
+    service: AuthenticationService = Depends(),
+):
+    try:
+        return SessionListResponseSchema(sessions=await service.get_sessions(access_token))
+    except TokenError:
+        raise auth_error
+
+
 @auth_router.post(
     '/verify/access_token',
     status_code=status.HTTP_200_OK,
@@ -131,8 +182,26 @@ async def api_v1_verify_access_token(
     return {'detail': 'Successful verification'}
 
 
+@auth_router.post(
+    '/verify/batch',
+    status_code=status.HTTP_200_OK,
+    summary='Проверить пачку access-токенов',
+    response_model=VerifyBatchResponseSchema,
+    tags=[ApiTags.V1_AUTH],
+)
+async def api_v1_verify_batch(
+    verify_data: VerifyBatchRequestSchema,
+    service: AuthenticationService = Depends(),
+):
+    try:
+        return VerifyBatchResponseSchema(results=await service.verify_access_tokens(verify_data.tokens))
+    except TokenBatchTooLargeError:
+        raise token_batch_too_large_error
+
+
 @auth_router.post(
     '/reset/username',
+    dependencies=[Depends(use_unit_of_work)],
     status_code=status.HTTP_200_OK,
     summary='Поменять имя пользователя',
     response_model=ResetResponseSchema,
@@ -148,10 +217,13 @@ async def api_v1_reset_username(
         raise auth_error
     except UserAlreadyExistsError:
         raise user_already_exists_error
+    except PasswordServiceOverloadedError:
+        raise service_overloaded_error
 
 
 @auth_router.post(
     '/reset/password',
+    dependencies=[Depends(use_unit_of_work)],
     status_code=status.HTTP_200_OK,
     summary='Поменять пароль пользователя',
     response_model=ResetResponseSchema,
@@ -165,25 +237,29 @@ async def api_v1_reset_password(
         return await service.reset_password(reset_schema)
     except (WrongPasswordError, UserNotFoundError):
         raise auth_error
+    except PasswordServiceOverloadedError:
+        raise service_overloaded_error
 
 
 @auth_router.get(
     '/history',
     status_code=status.HTTP_200_OK,
     summary='Получить историю входов пользователя',
-    response_model=list[HistoryResponseSchema],
+    response_model=HistoryPageResponseSchema,
     tags=[ApiTags.V1_AUTH],
 )
 async def api_v1_get_history(
     access_token: str = Depends(get_bearer_token),
     service: AuthenticationService = Depends(),
-    limit: int = Query(10, description="Максимальное количество записей для возврата"),
-    offset: int = Query(0, description="Смещение для пагинации"),
+    limit: int = Query(10, ge=1, le=100, description="Максимальное количество записей для возврата"),
+    cursor: str | None = Query(None, description="Курсор следующей страницы из next_cursor предыдущего ответа"),
 ):
     try:
-        return await service.get_history(access_token, limit, offset)
+        return await service.get_history(access_token, limit, cursor)
     except (TokenError, UserNotFoundError):
         raise auth_error
+    except InvalidCursorError:
+        raise invalid_cursor_error
 
 
 @auth_router.post(
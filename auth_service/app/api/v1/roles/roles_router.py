@@ -3,7 +3,6 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Response, status
 
 from app.api.docs.tags import ApiTags
-from app.api.error_decorators import handle_auth_superuser_errors
 from app.exceptions import (
     RoleAlreadyExistsError,
     RoleNotFoundError,
@@ -15,11 +14,10 @@ from app.schemas.services.auth.role_service_schemas import (
     CreateRoleSchema,
     PartialUpdateRoleSchema,
 )
-from app.services.auth.auth_service import AuthenticationService
 from app.services.auth.role_services import RoleService
-from app.services.fastapi.dependencies import get_bearer_token
+from app.services.fastapi.dependencies import require_superuser, use_unit_of_work
 
-roles_router = APIRouter(prefix='/roles')
+roles_router = APIRouter(prefix='/roles', dependencies=[Depends(use_unit_of_work), Depends(require_superuser)])
 
 
 @roles_router.get(
@@ -29,13 +27,9 @@ roles_router = APIRouter(prefix='/roles')
     response_model=list[RoleResponseSchema],
     tags=[ApiTags.V1_ROLES],
 )
-@handle_auth_superuser_errors
 async def get_roles(
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     role_service: RoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     return await role_service.get_roles()
 
 
@@ -46,14 +40,10 @@ async def get_roles(
     response_model=RoleResponseSchema,
     tags=[ApiTags.V1_ROLES],
 )
-@handle_auth_superuser_errors
 async def get_role(
     role_id: UUID,
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     role_service: RoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     try:
         return await role_service.get_role(role_id)
     except RoleNotFoundError:
@@ -67,14 +57,10 @@ async def get_role(
     response_model=RoleResponseSchema,
     tags=[ApiTags.V1_ROLES],
 )
-@handle_auth_superuser_errors
 async def create_role(
     role_data: CreateRoleSchema,
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     role_service: RoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     try:
         return await role_service.create_role(role_data)
     except RoleAlreadyExistsError:
@@ -88,15 +74,11 @@ async def create_role(
     response_model=RoleResponseSchema,
     tags=[ApiTags.V1_ROLES],
 )
-@handle_auth_superuser_errors
 async def partially_update_role(
     role_id: UUID,
     role_data: PartialUpdateRoleSchema,
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     role_service: RoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     try:
         return await role_service.partially_update_role(role_id=role_id, role_data=role_data)
     except RoleAlreadyExistsError:
@@ -109,14 +91,10 @@ async def partially_update_role(
     summary='Удалить роль',
     tags=[ApiTags.V1_ROLES],
 )
-@handle_auth_superuser_errors
 async def delete_role(
     role_id: UUID,
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     role_service: RoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     try:
         await role_service.delete_role(role_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
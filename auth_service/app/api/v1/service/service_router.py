@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, status
+
+from app.api.docs.tags import ApiTags
+from app.db.postgres import base
+from app.schemas.api.v1.service_schemas import ServiceMetricsResponseSchema
+from app.services.fastapi.dependencies import require_superuser
+from app.services.repositories.history_writer import history_writer
+from app.services.utils.password_service import async_password_service
+from app.services.utils.principal_cache import principal_cache
+from app.services.utils.token_cache import token_cache
+
+service_router = APIRouter(prefix='/service', dependencies=[Depends(require_superuser)])
+
+
+@service_router.get(
+    '/metrics',
+    status_code=status.HTTP_200_OK,
+    summary='Получить внутренние метрики воркера',
+    response_model=ServiceMetricsResponseSchema,
+    tags=[ApiTags.V1_SERVICE],
+)
+async def get_metrics():
+    return ServiceMetricsResponseSchema(
+        password_pool=async_password_service.get_metrics(),
+        token_cache=token_cache.get_stats(),
+        principal_cache=principal_cache.get_stats(),
+        history_writer=history_writer.get_metrics(),
+        postgres_pool=base.get_pool_metrics(base.async_engine),
+        postgres_replica_pool=base.get_pool_metrics(base.replica_engine) if base.replica_engine else None,
+    )
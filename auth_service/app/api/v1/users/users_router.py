@@ -3,23 +3,27 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 
 from app.api.docs.tags import ApiTags
-from app.api.error_decorators import handle_auth_superuser_errors
 from app.exceptions import (
     RoleAlreadyAssignedError,
     RoleNotAssignedError,
     RoleNotFoundError,
     UserNotFoundError,
+    UserRolesBatchTooLargeError,
     role_already_assigned_error,
     role_not_assigned_error,
     role_not_found_error,
     user_not_found_error,
+    user_roles_batch_too_large_error,
 )
 from app.schemas.api.v1.roles_schemas import RoleResponseSchema
-from app.services.auth.auth_service import AuthenticationService
+from app.schemas.api.v1.users_schemas import (
+    BulkUserRolesRequestSchema,
+    BulkUserRolesResponseSchema,
+)
 from app.services.auth.role_services import UserRoleService
-from app.services.fastapi.dependencies import get_bearer_token
+from app.services.fastapi.dependencies import require_superuser, use_unit_of_work
 
-users_router = APIRouter(prefix='/users')
+users_router = APIRouter(prefix='/users', dependencies=[Depends(use_unit_of_work), Depends(require_superuser)])
 
 
 @users_router.get(
@@ -29,14 +33,10 @@ users_router = APIRouter(prefix='/users')
     response_model=list[RoleResponseSchema],
     tags=[ApiTags.V1_USERS],
 )
-@handle_auth_superuser_errors
 async def get_user_roles(
     user_id: UUID,
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     user_role_service: UserRoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     try:
         return await user_role_service.get_user_roles(user_id)
     except UserNotFoundError:
@@ -49,15 +49,11 @@ async def get_user_roles(
     summary='Назначить роль пользователю',
     tags=[ApiTags.V1_USERS],
 )
-@handle_auth_superuser_errors
 async def assign_user_role(
     user_id: UUID,
     role_id: UUID,
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     user_role_service: UserRoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     try:
         await user_role_service.assign_user_role(user_id, role_id)
         return {'detail': 'Successful assign'}
@@ -75,15 +71,11 @@ async def assign_user_role(
     summary='Отозвать роль у пользователя',
     tags=[ApiTags.V1_USERS],
 )
-@handle_auth_superuser_errors
 async def revoke_user_role(
     user_id: UUID,
     role_id: UUID,
-    access_token: str = Depends(get_bearer_token),
-    auth_service: AuthenticationService = Depends(),
     user_role_service: UserRoleService = Depends(),
 ):
-    await auth_service.authorize_superuser(access_token=access_token)
     try:
         await user_role_service.revoke_user_role(user_id, role_id)
         return {'detail': 'Successful revoke'}
@@ -93,3 +85,47 @@ async def revoke_user_role(
         raise role_not_found_error
     except RoleNotAssignedError:
         raise role_not_assigned_error
+
+
+@users_router.post(
+    '/roles:bulk-assign',
+    status_code=status.HTTP_200_OK,
+    summary='Назначить роли пачке пользователей',
+    response_model=BulkUserRolesResponseSchema,
+    tags=[ApiTags.V1_USERS],
+)
+async def bulk_assign_user_roles(
+    bulk_data: BulkUserRolesRequestSchema,
+    user_role_service: UserRoleService = Depends(),
+):
+    try:
+        requested, affected = await user_role_service.bulk_assign_user_roles(bulk_data.pairs)
+        return BulkUserRolesResponseSchema(requested=requested, affected=affected)
+    except UserNotFoundError:
+        raise user_not_found_error
+    except RoleNotFoundError:
+        raise role_not_found_error
+    except UserRolesBatchTooLargeError:
+        raise user_roles_batch_too_large_error
+
+
+@users_router.post(
+    '/roles:bulk-revoke',
+    status_code=status.HTTP_200_OK,
+    summary='Отозвать роли у пачки пользователей',
+    response_model=BulkUserRolesResponseSchema,
+    tags=[ApiTags.V1_USERS],
+)
+async def bulk_revoke_user_roles(
+    bulk_data: BulkUserRolesRequestSchema,
+    user_role_service: UserRoleService = Depends(),
+):
+    try:
+        requested, affected = await user_role_service.bulk_revoke_user_roles(bulk_data.pairs)
+        return BulkUserRolesResponseSchema(requested=requested, affected=affected)
+    except UserNotFoundError:
+        raise user_not_found_error
+    except RoleNotFoundError:
+        raise role_not_found_error
+    except UserRolesBatchTooLargeError:
+        raise user_roles_batch_too_large_error
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Response, status
+
+from app.api.docs.tags import ApiTags
+from app.core.config import app_settings
+from app.services.utils.jwt_service import jwt_service
+
+well_known_router = APIRouter(prefix='/.well-known')
+
+
+@well_known_router.get(
+    '/jwks.json',
+    status_code=status.HTTP_200_OK,
+    summary='Получить публичные ключи для проверки токенов',
+    tags=[ApiTags.WELL_KNOWN],
+)
+async def jwks(response: Response):
+    response.headers['Cache-Control'] = f'public, max-age={app_settings.JWKS_CACHE_MAX_AGE_SECONDS}'
+    return jwt_service.get_jwks()
@@ -1,10 +1,15 @@
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import PostgresDsn, RedisDsn, SecretStr, field_validator
 from pydantic_core.core_schema import ValidationInfo
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.schemas.services.rate_limit.rate_limit_schemas import (
+    RateLimitAlgorithm,
+    RateLimitRule,
+)
+
 BASEDIR = Path(__file__).resolve().parent.parent.parent
 
 
@@ -16,11 +21,33 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = 'INFO'
     REQUEST_LIMIT_PER_MINUTE: int
 
+    # Rate limit
+    RATE_LIMIT_ALGORITHM: RateLimitAlgorithm = RateLimitAlgorithm.SLIDING_WINDOW_COUNTER
+    RATE_LIMIT_ROUTE_RULES: dict[str, RateLimitRule] = {}  # Префикс пути -> правило, JSON
+    RATE_LIMIT_PRINCIPAL_RULES: dict[str, RateLimitRule] = {}  # 'user:<login>' или 'ip:<адрес>' -> правило, JSON
+    RATE_LIMIT_EXEMPT_PATHS: list[str] = []
+
     # Auth
     JWT_SECRET_KEY: SecretStr
-    JWT_ALGORITHM: str = 'HS256'
+    JWT_ALGORITHM: str = 'HS256'  # HS256, RS256 или EdDSA
+    JWT_KEYS_DIR: Path | None = None  # Каталог с приватными ключами <kid>.pem для RS256/EdDSA
+    JWT_ACTIVE_KID: str | None = None  # kid ключа, которым подписываются новые токены
+    JWKS_CACHE_MAX_AGE_SECONDS: int = 60 * 60
     JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS: int = 60 * 60  # 1 hour
     JWT_REFRESH_TOKEN_EXPIRE_TIME_SECONDS: int = 86400 * 30  # 30 days
+    TOKEN_CACHE_MAX_SIZE: int = 10000  # 0 отключает локальный кеш проверенных access-токенов
+    TOKEN_VERIFY_BATCH_MAX_SIZE: int = 100
+    # Длиннее hash-max-listpack-value (64 по умолчанию) Редис хранит хеш сессии в некомпактной кодировке
+    SESSION_USER_AGENT_MAX_LENGTH: int = 64
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30  # 0 отключает кеш принципалов для авторизации суперпользователя
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    USER_ROLES_BULK_MAX_SIZE: int = 1000  # Максимум пар (user_id, role_id) в одном bulk-запросе
+    USER_IMPORT_CHUNK_SIZE: int = 5000  # Пользователей в одной транзакции COPY команды import-users
+
+    # Password hashing
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASH_MAX_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Сверх этого числа задач логин сразу получает 503
 
     # Postgres
     POSTGRES_HOST: str
@@ -29,12 +56,35 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_PORT: int
     POSTGRES_DSN: PostgresDsn | str = ''
+    POSTGRES_POOL_SIZE: int = 10  # На один воркер uvicorn
+    POSTGRES_POOL_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = 30
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 30 * 60
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100  # Кеш подготовленных выражений asyncpg на соединение
+    POSTGRES_PGBOUNCER_MODE: bool = False  # Совместимость с PgBouncer в режиме transaction pooling
+    POSTGRES_REPLICA_DSN: str = ''  # Пусто - все запросы идут в мастер
+    POSTGRES_READ_YOUR_WRITES_SECONDS: float = 5  # Сколько читать таблицу с мастера после записи в неё
+
+    # History writer
+    HISTORY_WRITER_BATCH_SIZE: int = 500
+    HISTORY_WRITER_FLUSH_INTERVAL_SECONDS: float = 1.0
+    HISTORY_WRITER_QUEUE_SIZE: int = 10000
+
+    # History partitions
+    HISTORY_PARTITIONS_MANAGE_ON_STARTUP: bool = True
+    HISTORY_PARTITIONS_CHECK_INTERVAL_SECONDS: float = 6 * 60 * 60  # 0 - только при старте
+    HISTORY_PARTITIONS_MONTHS_AHEAD: int = 3
+    HISTORY_PARTITIONS_RETENTION_MONTHS: int | None = None  # None - хранить историю бессрочно
+    HISTORY_PARTITIONS_RETENTION_MODE: Literal['detach', 'drop'] = 'detach'
 
     # Redis
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_DB: str
     REDIS_DSN: RedisDsn | str = ''
+    REDIS_MAX_CONNECTIONS: int = 100
+    REDIS_POOL_TIMEOUT_SECONDS: float = 5  # Сколько ждать свободное соединение, когда пул исчерпан
 
     # Jaeger
     JAEGER_ENABLE: bool = True
@@ -47,6 +97,15 @@ class Settings(BaseSettings):
     YANDEX_CLIENT_SECRET: str
     YANDEX_REDIRECT_URI: str
     YANDEX_BASE_URL: str
+    YANDEX_TOKEN_URL: str = 'https://oauth.yandex.ru/token'
+    YANDEX_USER_INFO_URL: str = 'https://login.yandex.ru/info'
+
+    # HTTP-клиенты OAuth-провайдеров: один пул соединений на провайдера
+    PROVIDER_HTTP_TIMEOUT_SECONDS: float = 5
+    PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS: float = 2
+    PROVIDER_HTTP_MAX_CONNECTIONS: int = 20
+    PROVIDER_HTTP_RETRIES: int = 2  # Повторы сверх первой попытки
+    PROVIDER_HTTP_RETRY_BACKOFF_SECONDS: float = 0.2  # База экспоненциальной задержки, к ней добавляется джиттер
 
     model_config = SettingsConfigDict(env_file=BASEDIR / '.env')
 
@@ -1,22 +1,236 @@
 import functools
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from inspect import isawaitable
+from typing import AsyncIterator, Awaitable, Callable
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import inspect
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.core.config import app_settings
+from app.core.logs import logger
+from app.schemas.services.repositories.postgres_repository_schemas import PoolMetrics
 
-async_engine = create_async_engine(url=app_settings.POSTGRES_DSN, echo=False)
 
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Пул, считающий выдачи соединений и время ожидания свободного соединения."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            logger.warning('Postgres pool exhausted: %s', self.status())
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+def build_async_engine(url: str) -> AsyncEngine:
+    connect_args: dict = {
+        'statement_cache_size': app_settings.POSTGRES_STATEMENT_CACHE_SIZE,
+        'prepared_statement_cache_size': app_settings.POSTGRES_STATEMENT_CACHE_SIZE,
+    }
+    if app_settings.POSTGRES_PGBOUNCER_MODE:
+        # PgBouncer в режиме transaction pooling сам держит пул и не переносит подготовленные выражения
+        # между транзакциями: отключаем кеши asyncpg и делаем имена выражений уникальными
+        connect_args = {
+            'statement_cache_size': 0,
+            'prepared_statement_cache_size': 0,
+            'prepared_statement_name_func': lambda: f'__asyncpg_{uuid.uuid4()}__',
+        }
+        return create_async_engine(url=url, echo=False, poolclass=NullPool, connect_args=connect_args)
+
+    return create_async_engine(
+        url=url,
+        echo=False,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=app_settings.POSTGRES_POOL_SIZE,
+        max_overflow=app_settings.POSTGRES_POOL_MAX_OVERFLOW,
+        pool_timeout=app_settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+        pool_recycle=app_settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=app_settings.POSTGRES_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def get_pool_metrics(engine: AsyncEngine) -> PoolMetrics | None:
+    if not isinstance(pool := engine.pool, InstrumentedAsyncPool):
+        return None
+
+    return PoolMetrics(
+        pool_size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=pool.overflow(),
+        checkouts=pool.checkouts,
+        timeouts=pool.timeouts,
+        wait_seconds_total=pool.wait_seconds_total,
+        wait_seconds_max=pool.wait_seconds_max,
+    )
+
+
+async_engine = build_async_engine(app_settings.POSTGRES_DSN)
+replica_engine = build_async_engine(app_settings.POSTGRES_REPLICA_DSN) if app_settings.POSTGRES_REPLICA_DSN else None
+
+# Сессия единицы работы текущего запроса: все вызовы репозиториев внутри неё идут в одной транзакции
+current_session: ContextVar[AsyncSession | None] = ContextVar('current_session', default=None)
+# Действия, которые нужно выполнить только после фиксации транзакции текущей единицы работы
+AfterCommitCallback = Callable[[], Awaitable[None] | None]
+current_after_commit: ContextVar[list[AfterCommitCallback] | None] = ContextVar('current_after_commit', default=None)
+
+
+def get_entity_tables(entity, relationships: list | None = None) -> set[str]:
+    """
+    Таблицы, которые затрагивает запрос к модели/колонке/объекту вместе с подгружаемыми связями.
+    Выражение, которое пишет в несколько таблиц, передаёт список моделей.
+    """
+    entities = entity if isinstance(entity, (list, tuple)) else [entity]
+    tables = {
+        inspect(entity.class_ if isinstance(entity, QueryableAttribute) else entity).mapper.local_table.name
+        for entity in entities
+    }
+    for relationship in relationships or []:
+        tables.add(relationship.property.mapper.local_table.name)
+        if (secondary := relationship.property.secondary) is not None:
+            tables.add(secondary.name)
+    return tables
+
+
+class ReadYourWritesGuard:
+    """
+    Помнит время последней записи в каждую таблицу в пределах воркера. Пока не прошло window секунд,
+    чтения этих таблиц идут в мастер, чтобы не получить с реплики данные до собственной записи.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._last_write: dict[str, float] = {}
+
+    def mark(self, tables: set[str]) -> None:
+        now = time.monotonic()
+        for table in tables:
+            self._last_write[table] = now
+
+    def is_recently_written(self, tables: set[str]) -> bool:
+        now = time.monotonic()
+        return any(now - self._last_write.get(table, -self.window) < self.window for table in tables)
+
+
+read_your_writes_guard = ReadYourWritesGuard(app_settings.POSTGRES_READ_YOUR_WRITES_SECONDS)
+
+
+def get_read_engine(tables: set[str]) -> AsyncEngine:
+    if replica_engine is None or read_your_writes_guard.is_recently_written(tables):
+        return async_engine
+    return replica_engine
+
+
+def manage_async_session(func=None, *, read_only: bool = False):
+    """
+    Выдаёт методу репозитория сессию: переданную явно, сессию текущей единицы работы или новую.
+    Новая сессия для read_only-метода открывается на реплике, если она настроена. Первый позиционный
+    аргумент метода после self - модель, объект или список моделей, по нему определяются затронутые таблицы.
+    """
+    if func is None:
+        return functools.partial(manage_async_session, read_only=read_only)
+
+    async def call(args, kwargs):
+        result = await func(*args, **kwargs)
+        if not read_only:
+            read_your_writes_guard.mark(get_entity_tables(args[1]))
+        return result
 
-def manage_async_session(func):
     @functools.wraps(func)
     async def inner(*args, **kwargs):
         if (session := kwargs.get('session')) and isinstance(session, AsyncSession):
-            return await func(*args, **kwargs)
+            return await call(args, kwargs)
 
-        async with AsyncSession(bind=async_engine, expire_on_commit=False) as session:
+        if (session := current_session.get()) is not None:
             kwargs['session'] = session
-            result = await func(*args, **kwargs)
+            return await call(args, kwargs)
+
+        engine = async_engine
+        if read_only:
+            engine = get_read_engine(get_entity_tables(args[1], kwargs.get('select_in_load')))
+
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            kwargs['session'] = session
+            result = await call(args, kwargs)
             await session.commit()
             return result
 
     return inner
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    """Открывает одну сессию и транзакцию на весь блок. Вложенный вызов переиспользует внешнюю сессию."""
+    if (session := current_session.get()) is not None:
+        yield session
+        return
+
+    callbacks: list[AfterCommitCallback] = []
+    async with AsyncSession(bind=async_engine, expire_on_commit=False) as session:
+        token = current_session.set(session)
+        callbacks_token = current_after_commit.set(callbacks)
+        try:
+            yield session
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            current_after_commit.reset(callbacks_token)
+            current_session.reset(token)
+
+    for callback in callbacks:
+        try:
+            await _run_callback(callback)
+        except Exception as err:
+            logger.error('After commit callback %s failed: %s', callback, err)
+
+
+@asynccontextmanager
+async def savepoint() -> AsyncIterator[None]:
+    """
+    Внутри единицы работы оборачивает блок в SAVEPOINT: если ошибку блока перехватывают и не пробрасывают,
+    откатывается только он, а общая транзакция запроса остаётся рабочей. Вне единицы работы не нужен.
+    """
+    if (session := current_session.get()) is None:
+        yield
+        return
+
+    async with session.begin_nested():
+        yield
+
+
+async def _run_callback(callback: AfterCommitCallback) -> None:
+    if isawaitable(result := callback()):
+        await result
+
+
+async def after_commit(callback: AfterCommitCallback) -> None:
+    """
+    Внутри единицы работы откладывает callback до коммита, вне её - вызывает сразу: запись уже зафиксирована.
+    Callback может быть как корутинной, так и обычной функцией.
+    """
+    if (callbacks := current_after_commit.get()) is not None:
+        callbacks.append(callback)
+    else:
+        await _run_callback(callback)
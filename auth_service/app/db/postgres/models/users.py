@@ -1,7 +1,8 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 from sqlalchemy.sql import expression
 
@@ -30,6 +31,8 @@ class UserModel(Base):
         cascade="all, delete",
     )
 
+    __table_args__ = (Index('users_email_lower_idx', sql_text('lower(email)'), unique=True),)
+
 
 class RoleModel(Base):
     __tablename__ = 'roles'
@@ -57,6 +60,10 @@ class HistoryModel(Base):
     user_id: Mapped[UUID] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     user: Mapped[UserModel] = relationship(back_populates='history')
 
+    __table_args__ = (
+        Index('history_user_id_auth_date_id_idx', 'user_id', sql_text('auth_date DESC'), sql_text('id DESC')),
+    )
+
 
 class UserRoleAssociationModel(Base):
     __tablename__ = 'user_role_associations'
@@ -0,0 +1,178 @@
+import asyncio
+import datetime
+from enum import StrEnum
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import app_settings
+from app.core.logs import logger
+from app.db.postgres import base
+
+# Произвольный ключ advisory-lock, чтобы воркеры не создавали партиции одновременно
+PARTITIONS_LOCK_KEY = 2031320
+
+
+class RetentionMode(StrEnum):
+    DETACH = 'detach'  # Партиция отсоединяется и остаётся отдельной таблицей для архивации
+    DROP = 'drop'
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def build_partition_name(table: str, month: datetime.date) -> str:
+    return f'{table}_{month.year}_{month.month:02d}'
+
+
+def parse_partition_month(table: str, partition_name: str) -> datetime.date | None:
+    try:
+        year, month = partition_name.removeprefix(f'{table}_').split('_')
+        return datetime.date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def plan_partitions(
+    today: datetime.date, months_ahead: int, since: datetime.date | None = None
+) -> list[tuple[datetime.date, datetime.date]]:
+    """
+    Месячные диапазоны [начало, конец) от текущего месяца на months_ahead месяцев вперёд. Если since раньше
+    текущего месяца, план начинается с него: пропущенные месяцы нужны записям истории, отложенным на время простоя.
+    """
+    current_month = today.replace(day=1)
+    first_month = min(since, current_month) if since else current_month
+    last_month = add_months(current_month, months_ahead)
+    months = []
+    while first_month <= last_month:
+        months.append((first_month, add_months(first_month, 1)))
+        first_month = add_months(first_month, 1)
+    return months
+
+
+class PartitionManager:
+    """Создаёт будущие месячные партиции таблицы и отсоединяет/удаляет партиции старше срока хранения."""
+
+    def __init__(self, table: str):
+        self.table = table
+
+    @staticmethod
+    async def _lock(conn: AsyncConnection) -> None:
+        await conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': PARTITIONS_LOCK_KEY})
+
+    async def list_partitions(self, conn: AsyncConnection) -> list[str]:
+        result = await conn.execute(
+            text(
+                '''
+                SELECT child.relname FROM pg_inherits
+                JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+                JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+                WHERE parent.relname = :table
+                ORDER BY child.relname
+                '''
+            ),
+            {'table': self.table},
+        )
+        return list(result.scalars())
+
+    async def ensure_partitions(self, months_ahead: int, today: datetime.date | None = None) -> list[str]:
+        created = []
+        async with base.async_engine.begin() as conn:
+            await self._lock(conn)
+            existing = set(await self.list_partitions(conn))
+            # Пропуск после последней партиции заполняем: более старые месяцы могли быть удалены сроком хранения
+            existing_months = [month for name in existing if (month := parse_partition_month(self.table, name))]
+            since = add_months(max(existing_months), 1) if existing_months else None
+            for start, end in plan_partitions(today or datetime.date.today(), months_ahead, since):
+                if (partition := build_partition_name(self.table, start)) in existing:
+                    continue
+                await conn.execute(
+                    text(
+                        f'CREATE TABLE IF NOT EXISTS "{partition}" PARTITION OF "{self.table}" '
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    )
+                )
+                created.append(partition)
+
+        if created:
+            logger.info('Created %s partitions: %s', self.table, ', '.join(created))
+        return created
+
+    async def apply_retention(
+        self, retention_months: int, mode: RetentionMode, today: datetime.date | None = None
+    ) -> list[str]:
+        cutoff = add_months((today or datetime.date.today()).replace(day=1), -retention_months)
+        removed = []
+        async with base.async_engine.begin() as conn:
+            await self._lock(conn)
+            for partition in await self.list_partitions(conn):
+                month = parse_partition_month(self.table, partition)
+                # Партиция устарела целиком, только если её верхняя граница не позже cutoff
+                if month is None or add_months(month, 1) > cutoff:
+                    continue
+                await conn.execute(text(f'ALTER TABLE "{self.table}" DETACH PARTITION "{partition}"'))
+                if mode == RetentionMode.DROP:
+                    await conn.execute(text(f'DROP TABLE "{partition}"'))
+                removed.append(partition)
+
+        if removed:
+            logger.info('Retention %s applied to %s partitions: %s', mode, self.table, ', '.join(removed))
+        return removed
+
+
+history_partition_manager = PartitionManager('history')
+
+
+async def manage_history_partitions() -> None:
+    """Партиции вперёд создаём всегда, срок хранения применяем, только если он задан."""
+    await history_partition_manager.ensure_partitions(app_settings.HISTORY_PARTITIONS_MONTHS_AHEAD)
+    if app_settings.HISTORY_PARTITIONS_RETENTION_MONTHS is not None:
+        await history_partition_manager.apply_retention(
+            app_settings.HISTORY_PARTITIONS_RETENTION_MONTHS,
+            RetentionMode(app_settings.HISTORY_PARTITIONS_RETENTION_MODE),
+        )
+
+
+class PartitionMaintenance:
+    """
+    Периодически вызывает manage_history_partitions: воркер, работающий дольше months_ahead месяцев,
+    не должен упереться в отсутствующую партицию. Одновременный запуск в нескольких воркерах
+    безопасен - партиции меняются под advisory-lock.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await manage_history_partitions()
+            except Exception as err:
+                logger.error('Can not manage history partitions: %s', err)
+
+    async def start(self) -> None:
+        if app_settings.HISTORY_PARTITIONS_MANAGE_ON_STARTUP:
+            try:
+                await manage_history_partitions()
+            except Exception as err:
+                logger.error('Can not manage history partitions: %s', err)
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name='history_partitions')
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+history_partition_maintenance = PartitionMaintenance(app_settings.HISTORY_PARTITIONS_CHECK_INTERVAL_SECONDS)
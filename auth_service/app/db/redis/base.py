@@ -0,0 +1,12 @@
+import redis.asyncio as redis
+
+from app.core.config import app_settings
+
+# Общий пул соединений для всех клиентов Редиса внутри воркера. При всплеске запросов, исчерпавшем пул,
+# запрос ждёт освободившееся соединение до REDIS_POOL_TIMEOUT_SECONDS, а не падает с ConnectionError
+redis_pool: redis.BlockingConnectionPool = redis.BlockingConnectionPool.from_url(
+    str(app_settings.REDIS_DSN),
+    max_connections=app_settings.REDIS_MAX_CONNECTIONS,
+    timeout=app_settings.REDIS_POOL_TIMEOUT_SECONDS,
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
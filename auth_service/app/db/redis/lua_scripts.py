@@ -0,0 +1,37 @@
+"""
+Lua-скрипты операций с сессиями, которые должны выполняться в Редисе атомарно за один запрос.
+"""
+
+# Ротация refresh-токена в семействе сессий. Сессия - хеш {l: логин, c: создана, a: агент, r: обновлена}.
+# KEYS: [1] семейство (id текущей сессии), [2] старая сессия, [3] новая сессия, [4] индекс сессий пользователя.
+# ARGV: [1] id старой сессии, [2] id новой сессии, [3] логин, [4] время жизни сессии в секундах,
+#       [5] текущее время в секундах, [6] префикс ключей сессий, [7] агент.
+# Возвращает {status, id сессии, отозванной из-за повторного использования токена}:
+# status 1 - ротация выполнена, 0 - сессия не найдена, -1 - повторное использование, семейство отозвано.
+ROTATE_SESSION = '''
+local current = redis.call('GET', KEYS[1])
+
+if current and current ~= ARGV[1] then
+    redis.call('DEL', KEYS[1], ARGV[6] .. current)
+    redis.call('ZREM', KEYS[4], current)
+    return {-1, current}
+end
+
+-- Семейство живёт всю сессию, поэтому время создания переносим из старой сессии в новую
+local created_at = redis.call('HGET', KEYS[2], 'c')
+if not created_at then
+    return {0, ''}
+end
+
+local expire_time = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+redis.call('DEL', KEYS[2])
+redis.call('HSET', KEYS[3], 'l', ARGV[3], 'c', created_at, 'a', ARGV[7], 'r', now)
+redis.call('EXPIRE', KEYS[3], expire_time)
+redis.call('SET', KEYS[1], ARGV[2], 'EX', expire_time)
+redis.call('ZREM', KEYS[4], ARGV[1])
+redis.call('ZADD', KEYS[4], now + expire_time, ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[4], '-inf', now)
+redis.call('EXPIRE', KEYS[4], expire_time)
+return {1, ''}
+'''
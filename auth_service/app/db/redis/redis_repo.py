@@ -1,32 +1,384 @@
+import time
 import uuid
-
-import redis.asyncio as redis
+from typing import AsyncIterator
 
 from app.core.config import app_settings
+from app.db.redis import lua_scripts
+from app.db.redis.base import redis_client
+from app.schemas.services.auth.session_service_schemas import (
+    KeyMemoryStatsSchema,
+    SessionMemoryReportSchema,
+    SessionRotationResult,
+    SessionRotationStatus,
+    StoredSessionSchema,
+)
+
+
+class SessionField:
+    """Короткие имена полей хеша сессии: хеш из коротких значений Редис хранит компактно (listpack)."""
+
+    LOGIN = 'l'
+    CREATED_AT = 'c'
+    USER_AGENT = 'a'
+    REFRESHED_AT = 'r'
 
 
 class RedisRepository:
+    # Ключи и id сессий храним как 16 байт UUID вместо 36-символьной строки
+    SESSION_KEY_PREFIX = b's:'
+    FAMILY_KEY_PREFIX = b'f:'
+    # Ключи старого формата читаем, пока они не перенесены командой migrate-sessions
+    LEGACY_SESSION_KEY_PREFIX = 'session:'
+    LEGACY_FAMILY_KEY_PREFIX = 'refresh_family:'
+    LEGACY_SESSION_KEY_PATTERN = LEGACY_SESSION_KEY_PREFIX + '*'
+    LEGACY_FAMILY_KEY_PATTERN = LEGACY_FAMILY_KEY_PREFIX + '*'
+    PACKED_SESSION_ID_LENGTH = 16
+
     def __init__(self):
-        self.redis = redis.from_url(app_settings.REDIS_DSN)
+        self.redis = redis_client
         self.expire_time: int = max(
             app_settings.JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS, app_settings.JWT_REFRESH_TOKEN_EXPIRE_TIME_SECONDS
         )
+        self.user_agent_max_length = app_settings.SESSION_USER_AGENT_MAX_LENGTH
+        self.rotate_session_script = self.redis.register_script(lua_scripts.ROTATE_SESSION)
+
+    @staticmethod
+    def _pack_session_id(session_id: uuid.UUID | str) -> bytes:
+        return uuid.UUID(str(session_id)).bytes
 
     @staticmethod
-    def _build_session_key(session_id: uuid.UUID) -> str:
-        return f'session:{str(session_id)}'
+    def _unpack_session_id(session_id: bytes) -> str:
+        return str(uuid.UUID(bytes=session_id))
+
+    def _build_session_key(self, session_id: uuid.UUID | str) -> bytes:
+        return self.SESSION_KEY_PREFIX + self._pack_session_id(session_id)
+
+    def _build_family_key(self, family_id: uuid.UUID | str) -> bytes:
+        return self.FAMILY_KEY_PREFIX + self._pack_session_id(family_id)
+
+    def _build_legacy_session_key(self, session_id: uuid.UUID | str) -> str:
+        return f'{self.LEGACY_SESSION_KEY_PREFIX}{session_id}'
+
+    def _build_legacy_family_key(self, family_id: uuid.UUID | str) -> str:
+        return f'{self.LEGACY_FAMILY_KEY_PREFIX}{family_id}'
+
+    @staticmethod
+    def _build_user_sessions_key(login: str) -> str:
+        return f'user_sessions:{login}'
+
+    def _parse_user_sessions_member(self, member: bytes) -> tuple[str, bytes | str] | None:
+        """
+        Id и ключ сессии по элементу индекса сессий пользователя: 16 байт - текущий формат, строка UUID - старый.
+        Прочие значения пропускаем.
+        """
+        if len(member) == self.PACKED_SESSION_ID_LENGTH:
+            return self._unpack_session_id(member), self.SESSION_KEY_PREFIX + member
+        try:
+            session_id = str(uuid.UUID(member.decode()))
+        except ValueError:
+            return None
+        return session_id, self._build_legacy_session_key(session_id)
 
     async def get_session(self, session_id: uuid.UUID) -> str | None:
-        session_key = self._build_session_key(session_id)
-        return await self.redis.get(session_key)
+        return (await self.get_sessions([session_id]))[0]
 
-    async def save_session(self, login: str, session_id: uuid.UUID) -> None:
-        session_key = self._build_session_key(session_id)
-        await self.redis.set(session_key, login, ex=self.expire_time)
+    async def get_sessions(self, session_ids: list[uuid.UUID]) -> list[str | None]:
+        """Логины сессий. Сессия ищется в хеше и, если ещё не перенесена, в строковом ключе старого формата."""
+        if not session_ids:
+            return []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hget(self._build_session_key(session_id), SessionField.LOGIN)
+                pipe.get(self._build_legacy_session_key(session_id))
+            logins = await pipe.execute()
+        return [login or legacy_login for login, legacy_login in zip(logins[::2], logins[1::2])]
 
-    async def delete_session(self, session_id: uuid.UUID) -> None:
+    async def save_session(self, login: str, session_id: uuid.UUID, family_id: uuid.UUID, user_agent: str) -> None:
+        """
+        Сохраняет сессию и в той же транзакции добавляет её в индекс сессий пользователя: sorted set,
+        где score - время истечения сессии. Истёкшие элементы индекса вычищаются при каждой записи.
+        Семейство refresh-токенов указывает на единственную сессию, refresh-токен которой ещё можно обменять.
+        """
+        now = int(time.time())
+        packed_session_id = self._pack_session_id(session_id)
         session_key = self._build_session_key(session_id)
-        await self.redis.delete(session_key)
+        user_sessions_key = self._build_user_sessions_key(login)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                session_key,
+                mapping={
+                    SessionField.LOGIN: login,
+                    SessionField.CREATED_AT: now,
+                    SessionField.USER_AGENT: user_agent[: self.user_agent_max_length],
+                    SessionField.REFRESHED_AT: now,
+                },
+            )
+            pipe.expire(session_key, self.expire_time)
+            pipe.set(self._build_family_key(family_id), packed_session_id, ex=self.expire_time)
+            pipe.zadd(user_sessions_key, {packed_session_id: now + self.expire_time})
+            pipe.zremrangebyscore(user_sessions_key, '-inf', now)
+            pipe.expire(user_sessions_key, self.expire_time)
+            await pipe.execute()
+
+    async def delete_session(
+        self, session_id: uuid.UUID, login: str | None = None, family_id: uuid.UUID | None = None
+    ) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._build_session_key(session_id), self._build_legacy_session_key(session_id))
+            if login:
+                pipe.zrem(self._build_user_sessions_key(login), self._pack_session_id(session_id), str(session_id))
+            if family_id:
+                pipe.delete(self._build_family_key(family_id), self._build_legacy_family_key(family_id))
+            await pipe.execute()
+
+    async def rotate_session(
+        self,
+        login: str,
+        family_id: uuid.UUID,
+        old_session_id: uuid.UUID,
+        new_session_id: uuid.UUID,
+        user_agent: str,
+    ) -> SessionRotationResult:
+        """
+        За один вызов Lua-скрипта проверяет, что старая сессия - текущая в семействе, и заменяет её новой.
+        Повторное предъявление уже обменянного токена отзывает семейство.
+        Сессия старого формата, которую скрипт не нашёл, переносится в хеш, и ротация повторяется.
+        """
+        result = await self._rotate_session(login, family_id, old_session_id, new_session_id, user_agent)
+        if result.status == SessionRotationStatus.NOT_FOUND and await self._migrate_legacy_session(
+            old_session_id, family_id
+        ):
+            result = await self._rotate_session(login, family_id, old_session_id, new_session_id, user_agent)
+        return result
+
+    async def _rotate_session(
+        self,
+        login: str,
+        family_id: uuid.UUID,
+        old_session_id: uuid.UUID,
+        new_session_id: uuid.UUID,
+        user_agent: str,
+    ) -> SessionRotationResult:
+        status, revoked_session_id = await self.rotate_session_script(
+            keys=[
+                self._build_family_key(family_id),
+                self._build_session_key(old_session_id),
+                self._build_session_key(new_session_id),
+                self._build_user_sessions_key(login),
+            ],
+            args=[
+                self._pack_session_id(old_session_id),
+                self._pack_session_id(new_session_id),
+                login,
+                self.expire_time,
+                int(time.time()),
+                self.SESSION_KEY_PREFIX,
+                user_agent[: self.user_agent_max_length],
+            ],
+        )
+        return SessionRotationResult(
+            status=SessionRotationStatus(status),
+            revoked_session_id=self._unpack_session_id(revoked_session_id) if revoked_session_id else None,
+        )
+
+    async def _get_user_sessions_index(
+        self, login: str, clean_expired: bool
+    ) -> list[tuple[bytes, str, bytes | str, float]]:
+        """Элементы индекса сессий пользователя: (элемент, id сессии, ключ сессии, время истечения)."""
+        user_sessions_key = self._build_user_sessions_key(login)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if clean_expired:
+                pipe.zremrangebyscore(user_sessions_key, '-inf', time.time())
+            pipe.zrange(user_sessions_key, 0, -1, withscores=True)
+            *_, members = await pipe.execute()
+
+        sessions = []
+        for member, expire_at in members:
+            if (parsed := self._parse_user_sessions_member(member)) is not None:
+                sessions.append((member, *parsed, expire_at))
+        return sessions
+
+    async def get_user_sessions(self, login: str) -> list[StoredSessionSchema]:
+        """Активные сессии пользователя вместе с данными устройства. У сессий старого формата их нет."""
+        if not (sessions := await self._get_user_sessions_index(login, clean_expired=True)):
+            return []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for member, _, session_key, _ in sessions:
+                if len(member) == self.PACKED_SESSION_ID_LENGTH:
+                    pipe.hmget(
+                        session_key, [SessionField.CREATED_AT, SessionField.USER_AGENT, SessionField.REFRESHED_AT]
+                    )
+                else:
+                    pipe.exists(session_key)
+            sessions_data = await pipe.execute()
+
+        stored_sessions = []
+        for (_, session_id, _, expire_at), session_data in zip(sessions, sessions_data):
+            if not isinstance(session_data, list):
+                if session_data:
+                    stored_sessions.append(StoredSessionSchema(session_id=session_id, expires_at=expire_at))
+                continue
+            created_at, user_agent, refreshed_at = session_data
+            # Сессия удалена, а индекс ещё не почищен
+            if created_at:
+                stored_sessions.append(
+                    StoredSessionSchema(
+                        session_id=session_id,
+                        expires_at=expire_at,
+                        created_at=int(created_at),
+                        user_agent=user_agent.decode() if user_agent else None,
+                        refreshed_at=int(refreshed_at) if refreshed_at else None,
+                    )
+                )
+        return stored_sessions
+
+    async def delete_user_sessions(self, login: str) -> list[tuple[str, float]]:
+        """Удаляет все сессии пользователя одним пайплайном. Возвращает пары (session_id, время истечения)."""
+        if not (sessions := await self._get_user_sessions_index(login, clean_expired=False)):
+            return []
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*[session_key for _, _, session_key, _ in sessions])
+            # Удаляем из индекса только прочитанные сессии: созданные за это время логины остаются
+            pipe.zrem(self._build_user_sessions_key(login), *[member for member, _, _, _ in sessions])
+            await pipe.execute()
+        return [(session_id, expire_at) for _, session_id, _, expire_at in sessions]
+
+    async def _scan_batches(self, pattern: str, batch_size: int) -> AsyncIterator[list[bytes]]:
+        keys = []
+        async for key in self.redis.scan_iter(match=pattern, count=batch_size):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                yield keys
+                keys = []
+        if keys:
+            yield keys
+
+    async def migrate_legacy_sessions(self, batch_size: int = 1000) -> int:
+        """
+        Переводит сессии из строковых ключей session:{uuid} -> login в хеши, а семейства refresh-токенов
+        и индексы сессий пользователей - на бинарные id. Время создания сессии восстанавливается по оставшемуся
+        TTL, агент неизвестен. Возвращает число перенесённых сессий.
+        """
+        migrated = 0
+        async for keys in self._scan_batches(self.LEGACY_SESSION_KEY_PATTERN, batch_size):
+            migrated += await self._migrate_legacy_sessions_batch(keys)
+        async for keys in self._scan_batches(self.LEGACY_FAMILY_KEY_PATTERN, batch_size):
+            await self._migrate_legacy_families_batch(keys)
+        return migrated
+
+    async def _migrate_legacy_session(self, session_id: uuid.UUID, family_id: uuid.UUID) -> bool:
+        """
+        Переносит сессию старого формата и её семейство. Семейство переносим и без сессии: по нему скрипт ротации
+        распознает повторное предъявление уже обменянного токена. True, если что-то было перенесено.
+        """
+        migrated_sessions = await self._migrate_legacy_sessions_batch(
+            [self._build_legacy_session_key(session_id).encode()]
+        )
+        migrated_families = await self._migrate_legacy_families_batch(
+            [self._build_legacy_family_key(family_id).encode()]
+        )
+        return bool(migrated_sessions or migrated_families)
+
+    async def _migrate_legacy_sessions_batch(self, keys: list[bytes]) -> int:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+                pipe.ttl(key)
+            values = await pipe.execute()
+
+        now = int(time.time())
+        migrated = 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, login, ttl in zip(keys, values[::2], values[1::2]):
+                if not login or ttl <= 0:
+                    continue
+                session_id = key.decode().removeprefix(self.LEGACY_SESSION_KEY_PREFIX)
+                session_key = self._build_session_key(session_id)
+                user_sessions_key = self._build_user_sessions_key(login.decode())
+                pipe.hset(
+                    session_key,
+                    mapping={
+                        SessionField.LOGIN: login,
+                        SessionField.CREATED_AT: now - (self.expire_time - ttl),
+                        SessionField.USER_AGENT: '',
+                    },
+                )
+                pipe.expire(session_key, ttl)
+                pipe.zrem(user_sessions_key, session_id)
+                pipe.zadd(user_sessions_key, {self._pack_session_id(session_id): now + ttl})
+                pipe.delete(key)
+                migrated += 1
+            await pipe.execute()
+        return migrated
+
+    async def _migrate_legacy_families_batch(self, keys: list[bytes]) -> int:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+                pipe.ttl(key)
+            values = await pipe.execute()
+
+        migrated = 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, session_id, ttl in zip(keys, values[::2], values[1::2]):
+                if session_id and ttl > 0:
+                    family_id = key.decode().removeprefix(self.LEGACY_FAMILY_KEY_PREFIX)
+                    pipe.set(self._build_family_key(family_id), self._pack_session_id(session_id.decode()), ex=ttl)
+                    migrated += 1
+                pipe.delete(key)
+            await pipe.execute()
+        return migrated
+
+    async def get_memory_report(self, sample_size: int) -> SessionMemoryReportSchema:
+        """Средний размер ключей сессий по выборке из sample_size ключей каждого вида (MEMORY USAGE)."""
+        key_stats = []
+        for pattern in (
+            self.SESSION_KEY_PREFIX + b'*',
+            self.FAMILY_KEY_PREFIX + b'*',
+            b'user_sessions:*',
+            self.LEGACY_SESSION_KEY_PATTERN.encode(),
+            self.LEGACY_FAMILY_KEY_PATTERN.encode(),
+        ):
+            keys = []
+            async for key in self.redis.scan_iter(match=pattern, count=sample_size):
+                keys.append(key)
+                if len(keys) >= sample_size:
+                    break
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.memory_usage(key, samples=0)
+                usages = [usage for usage in await pipe.execute() if usage is not None] if keys else []
+
+            key_stats.append(
+                KeyMemoryStatsSchema(
+                    pattern=pattern.decode(),
+                    sampled_keys=len(usages),
+                    avg_bytes=sum(usages) / len(usages) if usages else 0,
+                )
+            )
+
+        memory_info = await self.redis.info('memory')
+        return SessionMemoryReportSchema(
+            used_memory=memory_info['used_memory'], total_keys=await self.redis.dbsize(), key_stats=key_stats
+        )
+
+    @staticmethod
+    def _build_permissions_version_key(user_id: uuid.UUID) -> str:
+        return f'permissions_version:{str(user_id)}'
+
+    async def get_permissions_version(self, user_id: uuid.UUID) -> int:
+        return int(await self.redis.get(self._build_permissions_version_key(user_id)) or 0)
+
+    async def incr_permissions_versions(self, user_ids: list[uuid.UUID]) -> None:
+        if not user_ids:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.incr(self._build_permissions_version_key(user_id))
+            await pipe.execute()
 
 
 redis_repo = RedisRepository()
@@ -13,7 +13,10 @@ class BaseError(Exception):
 
 
 class UserAlreadyExistsError(BaseError):
-    pass
+    def __init__(self, *args: object, field: str | None = None, message: str | None = None) -> None:
+        # Поле, по которому найден дубликат: email или username
+        self.field = field
+        super().__init__(*args, message=message)
 
 
 class UserNotFoundError(BaseError):
@@ -56,6 +59,10 @@ class ExpiredSessionError(TokenError):
     pass
 
 
+class RefreshTokenReuseError(TokenError):
+    pass
+
+
 class RoleAlreadyExistsError(BaseError):
     pass
 
@@ -76,6 +83,22 @@ class ProviderAuthError(BaseError):
     pass
 
 
+class PasswordServiceOverloadedError(BaseError):
+    pass
+
+
+class TokenBatchTooLargeError(BaseError):
+    pass
+
+
+class UserRolesBatchTooLargeError(BaseError):
+    pass
+
+
+class InvalidCursorError(BaseError):
+    pass
+
+
 auth_error = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Unauthorized')
 not_found_error = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Not Found')
 user_not_found_error = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='User not found')
@@ -84,3 +107,13 @@ user_already_exists_error = HTTPException(status_code=status.HTTP_409_CONFLICT,
 role_already_exists_error = HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Role already exists')
 role_already_assigned_error = HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Role already assigned')
 role_not_assigned_error = HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Role not assigned')
+invalid_cursor_error = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor')
+token_batch_too_large_error = HTTPException(
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Too many tokens in batch'
+)
+user_roles_batch_too_large_error = HTTPException(
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Too many user-role pairs in batch'
+)
+service_overloaded_error = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail='Service overloaded, try again later'
+)
@@ -1,7 +1,7 @@
-import datetime
+import math
+from contextlib import asynccontextmanager
 from pprint import pformat
 
-import redis
 import uvicorn
 from fastapi import FastAPI
 from starlette import status
@@ -9,25 +9,51 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from app.api.api_router import api_router
+from app.api.well_known_router import well_known_router
 from app.core.config import app_settings
 from app.core.logs import logger
+from app.db.postgres.partitions import history_partition_maintenance
+from app.db.redis.base import redis_pool
+from app.services.providers.provider_service import close_providers
+from app.services.rate_limit.rate_limiter import rate_limiter
+from app.services.repositories.history_writer import history_writer
+from app.services.repositories.role_catalog import role_catalog
+from app.services.utils.password_service import async_password_service
+from app.services.utils.revocation_list import revocation_list
 from app.utils.jaeger import configure_tracer
 
 if app_settings.JAEGER_ENABLE:
     configure_tracer(app_settings.JAEGER_HOST, app_settings.JAEGER_PORT)
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await history_partition_maintenance.start()
+    history_writer.start()
+    await role_catalog.start()
+    await revocation_list.start()
+    yield
+    await revocation_list.stop()
+    await role_catalog.stop()
+    await history_writer.stop()
+    await history_partition_maintenance.stop()
+    await close_providers()
+    async_password_service.shutdown()
+    await redis_pool.disconnect()
+
+
 app = FastAPI(
     title=app_settings.APP_TITLE,
     description=app_settings.APP_DESCRIPTION,
     version='1.0.0',
     debug=app_settings.DEBUG,
     docs_url='/api/docs/',
-    openapi_url="/api/docs/openapi.json"
+    openapi_url="/api/docs/openapi.json",
+    lifespan=lifespan,
 )
 
 app.include_router(api_router)
-
-redis_conn = redis.Redis(host=app_settings.REDIS_HOST, port=app_settings.REDIS_PORT, decode_responses=True)
+app.include_router(well_known_router)
 
 
 @app.middleware("http")
@@ -42,23 +68,26 @@ async def rate_limit_middleware(request: Request, call_next):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Missing Access Identifier"}
         )
 
-    pipe = redis_conn.pipeline()
-    now = datetime.datetime.now()
-    key = f'{client_ip}:{now.minute}'
+    if request.url.path.startswith(tuple(app_settings.RATE_LIMIT_EXEMPT_PATHS)):
+        return await call_next(request)
 
-    pipe.incr(key, 1)
-    pipe.expire(key, 59)
-    result = pipe.execute()
+    principal = rate_limiter.get_principal(request, client_ip)
+    result = await rate_limiter.hit(request.url.path, principal)
+    rate_limit_headers = {'X-RateLimit-Limit': str(result.limit), 'X-RateLimit-Remaining': str(result.remaining)}
 
-    request_number = result[0]
-    if request_number > app_settings.REQUEST_LIMIT_PER_MINUTE:
-        return JSONResponse(status_code=status.HTTP_429_TOO_MANY_REQUESTS, content={"detail": "Too Many Requests"})
+    if not result.allowed:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Too Many Requests"},
+            headers=rate_limit_headers | {'Retry-After': str(math.ceil(result.retry_after))},
+        )
 
     response = await call_next(request)
 
     if not request_id:
         return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={'detail': 'X-Request-Id is required'})
 
+    response.headers.update(rate_limit_headers)
     return response
 
 
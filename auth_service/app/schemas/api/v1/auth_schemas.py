@@ -1,8 +1,9 @@
 import datetime
 import uuid
 from enum import StrEnum
+from typing import Generic, TypeVar
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from app.schemas.services.auth.role_service_schemas import RoleSchemaBase
 from app.schemas.services.auth.user_service_schemas import UserSchema
@@ -13,6 +14,11 @@ class LoginType(StrEnum):
     REFRESH = 'refresh'
 
 
+class SessionStatus(StrEnum):
+    ACTIVE = 'active'
+    EXPIRED = 'expired'
+
+
 class UserCredentialsSchema(BaseModel):
     login: str
     password: str
@@ -41,9 +47,18 @@ class RefreshLoginDataSchema(BaseLoginDataSchema):
     refresh_token: str
 
 
+# Версия набора claims access-токена: токены другой версии авторизуются через БД
+ACCESS_CLAIMS_VERSION = 1
+
+
 class UserTokenDataSchema(BaseModel):
     login: str
     roles: list[RoleSchemaBase]
+    uid: uuid.UUID
+    sup: bool  # is_superuser
+    rid: list[uuid.UUID]  # id ролей
+    pv: int  # Версия прав пользователя на момент выдачи токена
+    cv: int = ACCESS_CLAIMS_VERSION
 
 
 class TokenPairSchema(BaseModel):
@@ -91,3 +106,50 @@ class HistorySchema(BaseModel):
 
 class HistoryResponseSchema(HistorySchema):
     pass
+
+
+HistoryItemT = TypeVar('HistoryItemT', bound=HistorySchema)
+
+
+class HistoryPageSchema(BaseModel, Generic[HistoryItemT]):
+    items: list[HistoryItemT]
+    next_cursor: str | None = None
+
+
+class HistoryPageResponseSchema(HistoryPageSchema[HistoryResponseSchema]):
+    pass
+
+
+class VerifyBatchRequestSchema(BaseModel):
+    tokens: list[str] = Field(min_length=1)
+
+
+class TokenVerificationSchema(BaseModel):
+    valid: bool
+    login: str | None = None
+    roles: list[RoleSchemaBase] = []
+    session_id: uuid.UUID | None = None
+    session_status: SessionStatus | None = None
+    error: str | None = None
+
+
+class VerifyBatchResponseSchema(BaseModel):
+    results: list[TokenVerificationSchema]
+
+
+class SessionInfoSchema(BaseModel):
+    session_id: uuid.UUID
+    expires_at: datetime.datetime
+    created_at: datetime.datetime | None = None
+    user_agent: str | None = None
+    refreshed_at: datetime.datetime | None = None
+    current: bool = False
+
+
+class SessionListResponseSchema(BaseModel):
+    sessions: list[SessionInfoSchema]
+
+
+class LogoutAllResponseSchema(BaseModel):
+    detail: str
+    revoked_sessions: int
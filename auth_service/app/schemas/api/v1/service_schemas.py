@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from app.schemas.services.repositories.history_repository_schemas import (
+    HistoryWriterMetrics,
+)
+from app.schemas.services.repositories.postgres_repository_schemas import PoolMetrics
+from app.schemas.services.utils.hash_service_schemas import PasswordPoolMetrics
+from app.schemas.services.utils.jwt_service_schemas import TokenCacheStats
+from app.schemas.services.utils.principal_cache_schemas import PrincipalCacheStats
+
+
+class ServiceMetricsResponseSchema(BaseModel):
+    password_pool: PasswordPoolMetrics
+    token_cache: TokenCacheStats
+    principal_cache: PrincipalCacheStats
+    history_writer: HistoryWriterMetrics
+    postgres_pool: PoolMetrics | None
+    postgres_replica_pool: PoolMetrics | None = None
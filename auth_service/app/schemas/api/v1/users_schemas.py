@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+from app.schemas.services.auth.role_service_schemas import UserRolePairSchema
+
+
+class BulkUserRolesRequestSchema(BaseModel):
+    pairs: list[UserRolePairSchema] = Field(min_length=1)
+
+
+class BulkUserRolesResponseSchema(BaseModel):
+    requested: int  # Число уникальных пар в запросе
+    affected: int  # Сколько назначений реально создано или удалено
@@ -21,3 +21,8 @@ class PartialUpdateRoleSchema(BaseModel):
 
 class RoleSchema(RoleSchemaBase):
     id: uuid.UUID
+
+
+class UserRolePairSchema(BaseModel):
+    user_id: uuid.UUID
+    role_id: uuid.UUID
@@ -0,0 +1,36 @@
+import datetime
+import uuid
+from enum import IntEnum
+
+from pydantic import BaseModel
+
+
+class SessionRotationStatus(IntEnum):
+    ROTATED = 1
+    NOT_FOUND = 0
+    REUSED = -1  # Предъявлен refresh-токен старого поколения, семейство сессий отозвано
+
+
+class SessionRotationResult(BaseModel):
+    status: SessionRotationStatus
+    revoked_session_id: str | None = None
+
+
+class StoredSessionSchema(BaseModel):
+    session_id: uuid.UUID
+    expires_at: datetime.datetime
+    created_at: datetime.datetime | None = None
+    user_agent: str | None = None
+    refreshed_at: datetime.datetime | None = None
+
+
+class KeyMemoryStatsSchema(BaseModel):
+    pattern: str
+    sampled_keys: int
+    avg_bytes: float
+
+
+class SessionMemoryReportSchema(BaseModel):
+    used_memory: int
+    total_keys: int
+    key_stats: list[KeyMemoryStatsSchema]
@@ -0,0 +1,103 @@
+import uuid
+from enum import StrEnum
+
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+
+ARGON2_HASH_PREFIX = '$argon2'
+
+
+class ImportFormat(StrEnum):
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+
+class ImportSocialSchema(BaseModel):
+    social_name: str
+    social_id: str
+
+
+class ImportUserSchema(BaseModel):
+    """
+    Запись входного файла. В CSV роли перечисляются через '|', социальные аккаунты - как 'name:id' через '|'.
+    Нужен либо пароль, либо готовый argon2-хеш.
+    """
+
+    username: str
+    email: EmailStr
+    password: str | None = None
+    hashed_password: str | None = None
+    is_superuser: bool = False
+    roles: list[str] = []
+    socials: list[ImportSocialSchema] = []
+
+    @field_validator('password', 'hashed_password', mode='before')
+    @classmethod
+    def empty_as_none(cls, value):
+        return value or None
+
+    @field_validator('is_superuser', mode='before')
+    @classmethod
+    def empty_as_false(cls, value):
+        return value or False
+
+    @field_validator('roles', mode='before')
+    @classmethod
+    def split_roles(cls, value):
+        if isinstance(value, str):
+            return [role for role in value.split('|') if role]
+        return value
+
+    @field_validator('socials', mode='before')
+    @classmethod
+    def split_socials(cls, value):
+        if isinstance(value, str):
+            socials = [social.partition(':') for social in value.split('|') if social]
+            return [{'social_name': name, 'social_id': social_id} for name, _, social_id in socials]
+        return value
+
+    @model_validator(mode='after')
+    def check_password(self) -> 'ImportUserSchema':
+        if self.hashed_password is None and self.password is None:
+            raise ValueError('password or hashed_password is required')
+        if self.hashed_password is not None and not self.hashed_password.startswith(ARGON2_HASH_PREFIX):
+            raise ValueError('hashed_password must be an argon2 hash')
+        return self
+
+
+class ImportChunkSchema(BaseModel):
+    """Подготовленная к COPY пачка: строки staging-таблиц и счётчики."""
+
+    users: list[tuple[uuid.UUID, str, str, str, bool]] = []
+    user_roles: list[tuple[uuid.UUID, str]] = []
+    socials: list[tuple[uuid.UUID, str, str]] = []
+    records: int = 0
+    invalid: int = 0
+    hashed: int = 0
+
+
+class ImportChunkResultSchema(BaseModel):
+    users: int
+    user_roles: int
+    socials: int
+
+
+class UserImportReportSchema(BaseModel):
+    processed: int = 0  # Прочитано записей, включая пропущенные и невалидные
+    imported: int = 0
+    skipped: int = 0  # Логин или email уже заняты
+    invalid: int = 0
+    hashed: int = 0  # Паролей захешировано при импорте
+    user_roles: int = 0
+    socials: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0
+
+
+class UserImportCheckpointSchema(BaseModel):
+    source: str
+    offset: int  # Сколько записей файла уже загружено и закоммичено
+    report: UserImportReportSchema
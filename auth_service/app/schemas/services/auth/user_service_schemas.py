@@ -19,3 +19,11 @@ class UserCreateSchema(BaseModel):
     username: str
     email: EmailStr
     hashed_password: str
+
+
+class PrincipalSchema(BaseModel):
+    """Минимум данных о пользователе для авторизации админских запросов."""
+
+    id: UUID
+    is_superuser: bool
+    roles: list[str]
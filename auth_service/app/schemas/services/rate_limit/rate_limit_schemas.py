@@ -0,0 +1,23 @@
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class RateLimitAlgorithm(StrEnum):
+    SLIDING_WINDOW_LOG = 'sliding_window_log'
+    SLIDING_WINDOW_COUNTER = 'sliding_window_counter'
+    TOKEN_BUCKET = 'token_bucket'
+    GCRA = 'gcra'
+
+
+class RateLimitRule(BaseModel):
+    limit: int = Field(gt=0, description='Количество запросов за период')
+    period: int = Field(default=60, gt=0, description='Период в секундах')
+    algorithm: RateLimitAlgorithm | None = Field(default=None, description='По умолчанию RATE_LIMIT_ALGORITHM')
+
+
+class RateLimitResult(BaseModel):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # Секунды до следующей разрешённой попытки
@@ -17,3 +17,13 @@ class UserHistoryDBSchema(BaseModel):
     user_history: list[HistoryDBSchema] = Field(alias='history')
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class HistoryWriterMetrics(BaseModel):
+    queue_size: int
+    queue_max_size: int
+    enqueued: int
+    written: int
+    failed: int
+    batches: int
+    backpressure_waits: int
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class PoolMetrics(BaseModel):
+    pool_size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
@@ -1,4 +1,6 @@
+import datetime
 import uuid
+from enum import StrEnum
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
@@ -6,13 +8,47 @@ from app.schemas.api.v1.auth_schemas import HistorySchema
 from app.schemas.services.auth.role_service_schemas import RoleSchema
 
 
-class UserDBSchema(BaseModel):
+class UserProjection(StrEnum):
+    AUTH = 'auth'  # Учётные данные и роли: логин, refresh, проверка суперпользователя
+    PROFILE = 'profile'  # Публичные данные пользователя без хеша пароля
+    HISTORY = 'history'  # Полная загрузка вместе с историей входов
+
+
+class UserProfileDBSchema(BaseModel):
+    id: uuid.UUID
     username: str
     email: EmailStr
-    hashed_password: str
+    is_superuser: bool
     roles: list[RoleSchema] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserDBSchema(UserProfileDBSchema):
+    hashed_password: str
+
+
+class UserWithHistoryDBSchema(UserDBSchema):
     history: list[HistorySchema] = []
+
+
+class UserExportFormat(StrEnum):
+    TABLE = 'table'
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+
+class UserListFiltersSchema(BaseModel):
+    superusers_only: bool = False
+    role: str | None = None  # Название роли
+    created_after: datetime.datetime | None = None
+
+
+class UserExportSchema(BaseModel):
     id: uuid.UUID
+    username: str
+    email: str
     is_superuser: bool
+    created_at: datetime.datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -4,3 +4,14 @@ from pydantic import BaseModel
 class HashedRegistrationData(BaseModel):
     hashed_password: str
     dynamic_salt: str
+
+
+class PasswordPoolMetrics(BaseModel):
+    executor: str
+    max_workers: int
+    max_pending: int
+    pending: int
+    queue_depth: int
+    completed: int
+    failed: int
+    rejected: int
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class TokenCacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class PrincipalCacheStats(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int
+    size: int
+    max_size: int
@@ -1,30 +1,46 @@
 import datetime
+import functools
 import uuid
 
+from redis.exceptions import RedisError
+
+from app.core.config import app_settings
+from app.db.postgres.base import after_commit
 from app.exceptions import (
     AuthorizationError,
+    InvalidCursorError,
+    TokenBatchTooLargeError,
     TokenError,
     UserAlreadyExistsError,
     UserNotFoundError,
     WrongPasswordError,
 )
 from app.schemas.api.v1.auth_schemas import (
+    ACCESS_CLAIMS_VERSION,
+    BaseLoginDataSchema,
     CredentialsLoginDataSchema,
-    HistorySchema,
+    HistoryPageSchema,
     HistorySchemaCreate,
     LoginType,
     RefreshLoginDataSchema,
     ResetPasswordSchema,
     ResetUsernameSchema,
     SessionDataSchema,
+    SessionInfoSchema,
     TokenPairSchema,
+    TokenVerificationSchema,
     UserTokenDataSchema,
 )
 from app.schemas.services.auth.user_service_schemas import UserSchema
-from app.schemas.services.repositories.user_repository_schemas import UserDBSchema
+from app.schemas.services.repositories.user_repository_schemas import (
+    UserDBSchema,
+    UserProfileDBSchema,
+    UserProjection,
+)
 from app.services.auth.session_service import session_service
 from app.services.auth.user_service import user_service
-from app.services.utils.password_service import password_service
+from app.services.utils.password_service import async_password_service
+from app.services.utils.permissions_version import permissions_version_service
 from app.utils.yandex_id.yandex_id_schema import User as SocialUser
 
 from app.exceptions import ProviderAuthError
@@ -33,47 +49,81 @@ from app.services.providers.base_provider import BaseProvider
 
 class AuthenticationService:
     def __init__(self):
-        self.password_service = password_service
+        self.password_service = async_password_service
         self.user_service = user_service
         self.session_service = session_service
+        self.permissions_version_service = permissions_version_service
 
-    def _verify_user_password(self, user: UserDBSchema, password: str):
-        if not self.password_service.verify_password(user.hashed_password, password):
+    async def _verify_user_password(self, user: UserDBSchema, password: str):
+        if not await self.password_service.verify_password(user.hashed_password, password):
             raise WrongPasswordError
 
-    async def _create_session(self, user: UserDBSchema) -> SessionDataSchema:
-        return await self.session_service.create_session(UserTokenDataSchema(login=user.email, roles=user.roles))
+    @staticmethod
+    def _build_user_token_data(user: UserProfileDBSchema, permissions_version: int) -> UserTokenDataSchema:
+        return UserTokenDataSchema(
+            login=user.email,
+            roles=user.roles,
+            uid=user.id,
+            sup=user.is_superuser,
+            rid=[role.id for role in user.roles],
+            pv=permissions_version,
+        )
+
+    async def _load_user_token_data(self, user_id: uuid.UUID, permissions_version: int) -> UserTokenDataSchema:
+        # Пользователь загружается только после чтения версии прав: версия увеличивается после коммита изменения прав,
+        # поэтому права, изменённые позже чтения, достанутся токену вместе со старой версией и не пройдут проверку pv
+        user = await self.user_service.get_user_by_id(user_id, projection=UserProjection.PROFILE)
+        return self._build_user_token_data(user, permissions_version)
+
+    async def _create_session(self, user_id: uuid.UUID, user_agent: str) -> SessionDataSchema:
+        permissions_version = await self.permissions_version_service.get(user_id)
+        return await self.session_service.create_session(
+            await self._load_user_token_data(user_id, permissions_version), user_agent=user_agent
+        )
 
     async def _save_user_login_history(
-        self, user: UserDBSchema, login_data: CredentialsLoginDataSchema | RefreshLoginDataSchema, session_id: uuid.UUID
+        self, user_id: uuid.UUID, login_data: BaseLoginDataSchema, session_id: uuid.UUID
     ):
         await self.user_service.save_login_history(
             HistorySchemaCreate(
-                user_id=user.id,
+                user_id=user_id,
                 auth_date=datetime.datetime.utcnow(),
                 user_agent=login_data.user_agent,
                 login_type=login_data.login_type,
                 session_id=session_id,
             )
-        )  # TODO сделать фоновой таской
+        )
 
     async def authenticate_by_credentials(self, login_data: CredentialsLoginDataSchema) -> TokenPairSchema:
         try:
             user = await self.user_service.get_user(login=login_data.login)
-            self._verify_user_password(user=user, password=login_data.password)
-            session_data = await self._create_session(user=user)
-            await self._save_user_login_history(user=user, login_data=login_data, session_id=session_data.session_id)
+            await self._verify_user_password(user=user, password=login_data.password)
+            session_data = await self._create_session(user.id, user_agent=login_data.user_agent)
+            await self._save_user_login_history(user.id, login_data=login_data, session_id=session_data.session_id)
             return TokenPairSchema(**session_data.model_dump())
         except (UserNotFoundError, WrongPasswordError) as err:
             raise err
 
     async def authenticate_by_refresh_token(self, login_data: RefreshLoginDataSchema) -> TokenPairSchema:
         try:
-            login = await self.session_service.get_login_from_refresh_token(refresh_token=login_data.refresh_token)
-            user = await self.user_service.get_user(login=login)
-            session_data = await self._create_session(user=user)
-            await self.session_service.delete_session(token=login_data.refresh_token)
-            await self._save_user_login_history(user=user, login_data=login_data, session_id=session_data.session_id)
+            refresh_token_payload = await self.session_service.get_validated_refresh_token_payload(
+                login_data.refresh_token
+            )
+            if uid := refresh_token_payload.get('uid'):
+                user_id = uuid.UUID(uid)
+            else:
+                # refresh-токены, выданные до появления uid, содержат только логин
+                user = await self.user_service.get_user(login=refresh_token_payload['login'])
+                user_id = user.id
+            # Пара выпускается до обмена refresh-токена: если версия прав изменится между чтением и обменом,
+            # access-токен не пройдёт проверку pv, и клиент обновит пару ещё раз уже новым refresh-токеном
+            permissions_version = await self.permissions_version_service.get(user_id)
+            session_data = await self.session_service.rotate_session(
+                refresh_token_payload,
+                await self._load_user_token_data(user_id, permissions_version),
+                user_agent=login_data.user_agent,
+            )
+            await self._save_user_login_history(user_id, login_data=login_data, session_id=session_data.session_id)
             return TokenPairSchema(**session_data.model_dump())
         except (TokenError, UserNotFoundError) as err:
             raise err
@@ -84,24 +134,42 @@ class AuthenticationService:
         except TokenError as err:
             raise err
 
-    async def verify_access_token(self, access_token: str) -> bool:
+    async def logout_all(self, access_token: str) -> int:
+        try:
+            return await self.session_service.delete_all_sessions(access_token)
+        except TokenError as err:
+            raise err
+
+    async def get_sessions(self, access_token: str) -> list[SessionInfoSchema]:
         try:
-            return self.session_service.verify_access_token(access_token)
+            return await self.session_service.get_sessions(access_token)
         except TokenError as err:
             raise err
 
-    async def get_history(self, access_token: str, limit: int, offset: int) -> list[HistorySchema]:
+    async def verify_access_token(self, access_token: str) -> None:
+        try:
+            return await self.session_service.verify_access_token(access_token)
+        except TokenError as err:
+            raise err
+
+    async def verify_access_tokens(self, access_tokens: list[str]) -> list[TokenVerificationSchema]:
+        if len(access_tokens) > app_settings.TOKEN_VERIFY_BATCH_MAX_SIZE:
+            raise TokenBatchTooLargeError
+
+        return await self.session_service.verify_access_tokens(access_tokens)
+
+    async def get_history(self, access_token: str, limit: int, cursor: str | None) -> HistoryPageSchema:
         try:
             login = await self.session_service.get_login_from_access_token(access_token)
-            user = await self.user_service.get_user(login)
-            return await self.user_service.get_history(user, limit, offset)
-        except (TokenError, UserNotFoundError) as err:
+            user = await self.user_service.get_user(login, projection=UserProjection.PROFILE)
+            return await self.user_service.get_history(user, limit, cursor)
+        except (TokenError, UserNotFoundError, InvalidCursorError) as err:
             raise err
 
     async def reset_username(self, reset_schema: ResetUsernameSchema) -> UserSchema:
         try:
             user = await self.user_service.get_user(login=reset_schema.login)
-            self._verify_user_password(user=user, password=reset_schema.password)
+            await self._verify_user_password(user=user, password=reset_schema.password)
             return await self.user_service.set_username(user.id, reset_schema.new_username)
         except (UserNotFoundError, WrongPasswordError, UserAlreadyExistsError) as err:
             raise err
@@ -109,20 +177,36 @@ class AuthenticationService:
     async def reset_password(self, reset_schema: ResetPasswordSchema) -> UserSchema:
         try:
             user = await self.user_service.get_user(login=reset_schema.login)
-            self._verify_user_password(user=user, password=reset_schema.password)
-            new_hashed_password = self.password_service.hash_password(reset_schema.new_password)
-            return await self.user_service.set_password(user.id, new_hashed_password)
+            await self._verify_user_password(user=user, password=reset_schema.password)
+            new_hashed_password = await self.password_service.hash_password(reset_schema.new_password)
+            updated_user = await self.user_service.set_password(user.id, new_hashed_password)
+            # Старые сессии завершаем, только когда новый пароль уже зафиксирован
+            await after_commit(functools.partial(self.session_service.delete_user_sessions, user.email))
+            return updated_user
         except (UserNotFoundError, WrongPasswordError) as err:
             raise err
 
+    async def _get_superuser_claim(self, token_payload: dict) -> bool | None:
+        """Признак суперпользователя из токена или None, если токен старого формата или права с тех пор менялись."""
+        if token_payload.get('cv') != ACCESS_CLAIMS_VERSION:
+            return None
+
+        try:
+            permissions_version = await self.permissions_version_service.get(uuid.UUID(token_payload['uid']))
+        except RedisError:
+            return None
+
+        return token_payload['sup'] if token_payload['pv'] == permissions_version else None
+
     async def authorize_superuser(self, access_token: str) -> None:
         try:
-            login = await self.session_service.get_login_from_access_token(access_token=access_token)
-            user = await self.user_service.get_user(login=login)
+            token_payload = await self.session_service.get_validated_access_token_payload(access_token)
+            if (is_superuser := await self._get_superuser_claim(token_payload)) is None:
+                is_superuser = (await self.user_service.get_principal(token_payload['login'])).is_superuser
         except (TokenError, UserNotFoundError) as err:
             raise err
 
-        if not user.is_superuser:
+        if not is_superuser:
             raise AuthorizationError
 
     async def login_by_provider(self, code: int, provider: BaseProvider, user_agent: str) -> TokenPairSchema:
@@ -132,17 +216,15 @@ class AuthenticationService:
         if not social_user:
             raise ProviderAuthError
 
-        user: UserDBSchema = await self.user_service.get_or_create_user_by_provider(
+        user = await self.user_service.get_or_create_user_by_provider(
             social_user=social_user, social_name=provider.NAME
         )
 
         try:
-            session_data = await self._create_session(user=user)
-            login_data = CredentialsLoginDataSchema(
-                login=user.email, password=user.hashed_password, user_agent=user_agent, login_type=LoginType.CREDENTIALS
-            )
+            session_data = await self._create_session(user.id, user_agent=user_agent)
+            login_data = BaseLoginDataSchema(user_agent=user_agent, login_type=LoginType.CREDENTIALS)
 
-            await self._save_user_login_history(user=user, login_data=login_data, session_id=session_data.session_id)
+            await self._save_user_login_history(user.id, login_data=login_data, session_id=session_data.session_id)
             return TokenPairSchema(**session_data.model_dump())
         except (UserNotFoundError, WrongPasswordError) as err:
             raise err
@@ -1,20 +1,38 @@
+import asyncio
+
 from app.exceptions import UserAlreadyExistsError
 from app.schemas.api.v1.auth_schemas import CreateUserCredentialsSchema
 from app.schemas.services.auth.user_service_schemas import UserCreateSchema, UserSchema
 from app.services.auth.user_service import user_service
-from app.services.utils.password_service import password_service
+from app.services.utils.password_service import async_password_service
 
 
 class RegistrationService:
     def __init__(self):
-        self.password_service = password_service
+        self.password_service = async_password_service
         self.user_service = user_service
 
+    @staticmethod
+    def _cancel_hashing(hash_task: asyncio.Task) -> None:
+        # Ещё не начатый хеш снимается с очереди пула, начатый досчитывается и остаётся в счётчике ожидающих
+        # до конца. Ошибку уже завершённого забираем, чтобы её не логировал цикл
+        hash_task.cancel()
+        hash_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
     async def create_user(self, user_credentials: CreateUserCredentialsSchema) -> UserSchema:
-        if await self.user_service.get_user_by_credentials(user_credentials=user_credentials):
-            raise UserAlreadyExistsError
+        # argon2 считается в пуле параллельно с проверкой логина, вставка - один INSERT ... ON CONFLICT
+        hash_task = asyncio.create_task(self.password_service.hash_password(user_credentials.password))
+        try:
+            taken_field = await self.user_service.get_taken_field(user_credentials)
+        except Exception:
+            self._cancel_hashing(hash_task)
+            raise
+
+        if taken_field:
+            self._cancel_hashing(hash_task)
+            raise UserAlreadyExistsError(field=taken_field)
 
-        hashed_password = self.password_service.hash_password(user_credentials.password)
+        hashed_password = await hash_task
         return await self.user_service.create(
             UserCreateSchema(**user_credentials.model_dump(), hashed_password=hashed_password)
         )
@@ -1,17 +1,23 @@
 import uuid
 
+from app.core.config import app_settings
+from app.db.postgres.base import after_commit
 from app.exceptions import (
     RoleAlreadyAssignedError,
     RoleAlreadyExistsError,
     RoleNotAssignedError,
     RoleNotFoundError,
     UserNotFoundError,
+    UserRolesBatchTooLargeError,
 )
 from app.schemas.services.auth.role_service_schemas import (
     CreateRoleSchema,
     PartialUpdateRoleSchema,
     RoleSchema,
+    UserRolePairSchema,
 )
+from app.schemas.services.repositories.user_repository_schemas import UserProjection
+from app.services.repositories.role_catalog import role_catalog
 from app.services.repositories.role_repository import role_repository
 from app.services.repositories.user_repository import user_repository
 from app.services.repositories.user_role_repository import user_role_repository
@@ -20,53 +26,60 @@ from app.services.repositories.user_role_repository import user_role_repository
 class RoleService:
     def __init__(self):
         self.role_repository = role_repository
+        self.role_catalog = role_catalog
 
     async def get_roles(self) -> list[RoleSchema]:
-        return [RoleSchema.validate(role) for role in await self.role_repository.get_all()]
+        return [RoleSchema.validate(role) for role in await self.role_catalog.get_all()]
 
     async def get_role(self, role_id: uuid.UUID) -> RoleSchema:
-        if not (role := await self.role_repository.get(role_id)):
+        if not (role := await self.role_catalog.get(role_id)):
             raise RoleNotFoundError
 
         return role
 
     async def create_role(self, role_data: CreateRoleSchema) -> RoleSchema:
-        if await self.role_repository.get_by_title(role_title=role_data.title):
+        if await self.role_catalog.get_by_title(role_title=role_data.title):
             raise RoleAlreadyExistsError
 
-        return await self.role_repository.create(role_data)
+        role = await self.role_repository.create(role_data)
+        await after_commit(self.role_catalog.refresh)
+        return role
 
     async def partially_update_role(self, role_id: uuid.UUID, role_data: PartialUpdateRoleSchema) -> RoleSchema:
-        if not await self.role_repository.get(role_id=role_id):
+        if not await self.role_catalog.get(role_id):
             raise RoleNotFoundError
 
-        if (role := await self.role_repository.get_by_title(role_title=role_data.title)) and role.id != role_id:
+        if (role := await self.role_catalog.get_by_title(role_title=role_data.title)) and role.id != role_id:
             raise RoleAlreadyExistsError
 
-        return await self.role_repository.update(role_id=role_id, data=role_data.model_dump(exclude_unset=True))
+        role = await self.role_repository.update(role_id=role_id, data=role_data.model_dump(exclude_unset=True))
+        await after_commit(self.role_catalog.refresh)
+        return role
 
     async def delete_role(self, role_id: uuid.UUID) -> bool:
-        if not await self.role_repository.get(role_id):
+        if not await self.role_catalog.get(role_id):
             raise RoleNotFoundError
 
-        return await self.role_repository.delete(role_id)
+        is_deleted = await self.role_repository.delete(role_id)
+        await after_commit(self.role_catalog.refresh)
+        return is_deleted
 
 
 class UserRoleService:
     def __init__(self):
         self.user_repository = user_repository
-        self.role_repository = role_repository
+        self.role_catalog = role_catalog
         self.user_role_repository = user_role_repository
 
     async def get_user_roles(self, user_id: uuid.UUID) -> list[RoleSchema]:
-        if not (user := await self.user_repository.get(user_id)):
+        if not (user := await self.user_repository.get(user_id, projection=UserProjection.PROFILE)):
             raise UserNotFoundError
         return [RoleSchema.model_validate(role) for role in user.roles]
 
     async def assign_user_role(self, user_id: uuid.UUID, role_id: uuid.UUID) -> None:
-        if not await self.user_repository.get(user_id):
+        if not await self.user_repository.exists(user_id):
             raise UserNotFoundError
-        if not await self.role_repository.get(role_id):
+        if not await self.role_catalog.get(role_id):
             raise RoleNotFoundError
 
         try:
@@ -75,12 +88,35 @@ class UserRoleService:
             raise err
 
     async def revoke_user_role(self, user_id: uuid.UUID, role_id: uuid.UUID) -> None:
-        if not await self.user_repository.get(user_id):
+        if not await self.user_repository.exists(user_id):
             raise UserNotFoundError
-        if not await self.role_repository.get(role_id):
+        if not await self.role_catalog.get(role_id):
             raise RoleNotFoundError
 
         try:
             await self.user_role_repository.revoke_user_role(user_id, role_id)
         except RoleNotAssignedError as err:
             raise err
+
+    async def _validate_pairs(self, pairs: list[UserRolePairSchema]) -> list[tuple[uuid.UUID, uuid.UUID]]:
+        """Убирает дубли и проверяет существование всех пользователей и ролей двумя запросами на множество."""
+        unique_pairs = list(dict.fromkeys((pair.user_id, pair.role_id) for pair in pairs))
+        if len(unique_pairs) > app_settings.USER_ROLES_BULK_MAX_SIZE:
+            raise UserRolesBatchTooLargeError
+
+        user_ids = {user_id for user_id, _ in unique_pairs}
+        if await self.user_repository.get_existing_ids(user_ids) != user_ids:
+            raise UserNotFoundError
+        role_ids = {role_id for _, role_id in unique_pairs}
+        if await self.role_catalog.get_existing_ids(role_ids) != role_ids:
+            raise RoleNotFoundError
+
+        return unique_pairs
+
+    async def bulk_assign_user_roles(self, pairs: list[UserRolePairSchema]) -> tuple[int, int]:
+        unique_pairs = await self._validate_pairs(pairs)
+        return len(unique_pairs), await self.user_role_repository.assign_many(unique_pairs)
+
+    async def bulk_revoke_user_roles(self, pairs: list[UserRolePairSchema]) -> tuple[int, int]:
+        unique_pairs = await self._validate_pairs(pairs)
+        return len(unique_pairs), await self.user_role_repository.revoke_many(unique_pairs)
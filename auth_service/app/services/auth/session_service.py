@@ -1,48 +1,111 @@
+import time
 import uuid
 from datetime import datetime
 
 from jwt import InvalidTokenError
 
+from app.core.config import app_settings
 from app.db.redis.redis_repo import redis_repo
 from app.exceptions import (
     AccessTokenValidationError,
     ExpiredSessionError,
+    RefreshTokenReuseError,
     RefreshTokenValidationError,
     TokenDoesNotContainLogin,
     TokenDoesNotContainSessionId,
     TokenError,
     TokenValidationError,
 )
-from app.schemas.api.v1.auth_schemas import SessionDataSchema, UserTokenDataSchema
+from app.schemas.api.v1.auth_schemas import (
+    SessionDataSchema,
+    SessionInfoSchema,
+    SessionStatus,
+    TokenVerificationSchema,
+    UserTokenDataSchema,
+)
+from app.schemas.services.auth.session_service_schemas import SessionRotationStatus
 from app.services.utils.jwt_service import jwt_service
+from app.services.utils.revocation_list import revocation_list
+from app.services.utils.token_cache import token_cache
 
 
 class SessionService:
     def __init__(self):
         self.jwt_service = jwt_service
         self.redis_repo = redis_repo
+        self.token_cache = token_cache
+        self.revocation_list = revocation_list
+
+    @staticmethod
+    def _get_access_expire_at(token_payload: dict) -> float:
+        """Момент истечения access-токена сессии: оба токена пары отсчитывают exp от одного базового времени."""
+        token_ttl = (
+            app_settings.JWT_REFRESH_TOKEN_EXPIRE_TIME_SECONDS
+            if token_payload.get('refresh')
+            else app_settings.JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS
+        )
+        return token_payload['exp'] - token_ttl + app_settings.JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS
 
-    async def create_session(self, user_token_data: UserTokenDataSchema) -> SessionDataSchema:
-        user_login = user_token_data.login
-        session_id = uuid.uuid4()
+    def _create_tokens(
+        self, user_token_data: UserTokenDataSchema, session_id: uuid.UUID, family_id: uuid.UUID
+    ) -> SessionDataSchema:
         base_expire_time = datetime.utcnow()
         base_token_payload = {'session_id': str(session_id)}
 
-        access_token_payload = user_token_data.model_dump()
+        access_token_payload = user_token_data.model_dump(mode='json')
         access_token_payload |= base_token_payload
         access_token = self.jwt_service.create_access_token(
             payload=access_token_payload, base_expire_time=base_expire_time
         )
 
-        refresh_token_payload = {'login': user_login}
+        refresh_token_payload = {
+            'login': user_token_data.login,
+            'uid': str(user_token_data.uid),
+            'family_id': str(family_id),
+        }
         refresh_token_payload |= base_token_payload
         refresh_token = self.jwt_service.create_refresh_token(
             payload=refresh_token_payload, base_expire_time=base_expire_time
         )
 
-        await self.redis_repo.save_session(user_login, session_id=session_id)
         return SessionDataSchema(access_token=access_token, refresh_token=refresh_token, session_id=session_id)
 
+    async def create_session(self, user_token_data: UserTokenDataSchema, user_agent: str) -> SessionDataSchema:
+        session_id = uuid.uuid4()
+        family_id = uuid.uuid4()
+        await self.redis_repo.save_session(
+            user_token_data.login, session_id=session_id, family_id=family_id, user_agent=user_agent
+        )
+        return self._create_tokens(user_token_data, session_id, family_id)
+
+    async def rotate_session(
+        self, refresh_token_payload: dict, user_token_data: UserTokenDataSchema, user_agent: str
+    ) -> SessionDataSchema:
+        """
+        Обменивает refresh-токен на новую пару за один запрос в Редис. Токены подписываются до обмена,
+        поэтому ошибка при их выпуске не расходует семейство: клиент может повторить запрос со старым токеном.
+        """
+        old_session_id = refresh_token_payload['session_id']
+        # У refresh-токенов, выданных до появления семейств, семейство совпадает с сессией
+        family_id = refresh_token_payload.get('family_id', old_session_id)
+        new_session_id = uuid.uuid4()
+        session_data = self._create_tokens(user_token_data, new_session_id, family_id)
+        result = await self.redis_repo.rotate_session(
+            refresh_token_payload['login'], family_id, old_session_id, new_session_id, user_agent
+        )
+
+        if result.status == SessionRotationStatus.REUSED:
+            # Токен уже обменяли: возможно, он украден. Гасим и access-токен текущей сессии семейства
+            self.token_cache.invalidate_session(result.revoked_session_id)
+            await self.revocation_list.revoke(
+                {result.revoked_session_id: time.time() + app_settings.JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS}
+            )
+            raise RefreshTokenReuseError
+        if result.status == SessionRotationStatus.NOT_FOUND:
+            raise ExpiredSessionError
+
+        return session_data
+
     async def get_validated_token_payload(
         self,
         token: str,
@@ -76,26 +139,61 @@ class SessionService:
 
         return token_payload
 
-    async def get_login_from_refresh_token(self, refresh_token: str) -> str:
+    async def get_validated_access_token_payload(self, access_token: str) -> dict:
+        if not (token_payload := self.token_cache.get(access_token)):
+            token_payload = await self.get_validated_token_payload(token=access_token, check_access=True)
+            self.token_cache.set(access_token, token_payload)
+
+        # Проверка отзыва - поиск в памяти воркера, без обращения к Редису
+        if self.revocation_list.is_revoked(token_payload['session_id']):
+            raise ExpiredSessionError
+        return token_payload
+
+    async def get_validated_refresh_token_payload(self, refresh_token: str) -> dict:
         try:
-            token_payload = await self.get_validated_token_payload(token=refresh_token, check_refresh=True)
-            return token_payload['login']
+            return await self.get_validated_token_payload(token=refresh_token, check_refresh=True)
         except TokenError as err:
             raise err
 
     async def get_login_from_access_token(self, access_token: str) -> str | None:
         try:
-            token_payload = await self.get_validated_token_payload(token=access_token, check_access=True)
+            token_payload = await self.get_validated_access_token_payload(access_token)
             return token_payload['login']
         except TokenError as err:
             raise err
 
     async def verify_access_token(self, access_token: str) -> None:
         try:
-            await self.get_validated_token_payload(token=access_token, check_access=True)
+            await self.get_validated_access_token_payload(access_token)
         except TokenError as err:
             raise err
 
+    async def verify_access_tokens(self, access_tokens: list[str]) -> list[TokenVerificationSchema]:
+        results: list[TokenVerificationSchema] = []
+        for access_token in access_tokens:
+            try:
+                token_payload = await self.get_validated_access_token_payload(access_token)
+            except TokenError as err:
+                results.append(TokenVerificationSchema(valid=False, error=err.__class__.__name__))
+                continue
+
+            results.append(
+                TokenVerificationSchema(
+                    valid=True,
+                    login=token_payload['login'],
+                    roles=token_payload.get('roles', []),
+                    session_id=token_payload['session_id'],
+                )
+            )
+
+        # Статусы всех сессий пачки получаем одним MGET
+        valid_results = [result for result in results if result.valid]
+        sessions = await self.redis_repo.get_sessions([result.session_id for result in valid_results])
+        for result, session in zip(valid_results, sessions):
+            result.session_status = SessionStatus.ACTIVE if session else SessionStatus.EXPIRED
+
+        return results
+
     async def delete_session(self, token: str) -> None:
         try:
             token_payload = await self.get_validated_token_payload(
@@ -104,7 +202,44 @@ class SessionService:
         except TokenError as err:
             raise err
 
-        await self.redis_repo.delete_session(token_payload['session_id'])
+        await self.redis_repo.delete_session(
+            token_payload['session_id'], login=token_payload['login'], family_id=token_payload.get('family_id')
+        )
+        self.token_cache.invalidate_session(token_payload['session_id'])
+        await self.revocation_list.revoke({token_payload['session_id']: self._get_access_expire_at(token_payload)})
+
+    async def get_sessions(self, access_token: str) -> list[SessionInfoSchema]:
+        try:
+            token_payload = await self.get_validated_access_token_payload(access_token)
+        except TokenError as err:
+            raise err
+
+        return [
+            SessionInfoSchema(**session.model_dump(), current=str(session.session_id) == token_payload['session_id'])
+            for session in await self.redis_repo.get_user_sessions(token_payload['login'])
+        ]
+
+    async def delete_user_sessions(self, login: str) -> int:
+        sessions = await self.redis_repo.delete_user_sessions(login)
+        for session_id, _ in sessions:
+            self.token_cache.invalidate_session(session_id)
+
+        # Ключ сессии живёт expire_time от создания сессии, access-токен - JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS
+        access_ttl_delta = app_settings.JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS - self.redis_repo.expire_time
+        await self.revocation_list.revoke(
+            {session_id: expire_at + access_ttl_delta for session_id, expire_at in sessions}
+        )
+        return len(sessions)
+
+    async def delete_all_sessions(self, access_token: str) -> int:
+        try:
+            token_payload = await self.get_validated_token_payload(
+                token=access_token, check_access=True, check_session_expired=True
+            )
+        except TokenError as err:
+            raise err
+
+        return await self.delete_user_sessions(token_payload['login'])
 
 
 session_service = SessionService()
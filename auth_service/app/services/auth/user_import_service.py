@@ -0,0 +1,161 @@
+import asyncio
+import csv
+import itertools
+import json
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+from pydantic import ValidationError
+
+from app.core.logs import logger
+from app.schemas.services.auth.user_import_service_schemas import (
+    ImportChunkSchema,
+    ImportFormat,
+    ImportUserSchema,
+    UserImportCheckpointSchema,
+    UserImportReportSchema,
+)
+from app.services.repositories.user_import_repository import UserImportRepository
+from app.services.utils.password_service import password_service
+
+T = TypeVar('T')
+
+
+# Функция уровня модуля, чтобы её можно было передать в ProcessPoolExecutor (pickle)
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    return [password_service.hash_password(password) for password in passwords]
+
+
+def read_records(path: Path, import_format: ImportFormat) -> Iterator[dict | None]:
+    """
+    Читает файл потоково, по одной записи: весь файл в память не загружается.
+    Вместо битой строки NDJSON отдаёт None, чтобы она считалась невалидной записью и не сбивала смещение.
+    """
+    with path.open(newline='', encoding='utf-8') as file:
+        if import_format == ImportFormat.CSV:
+            yield from csv.DictReader(file)
+            return
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as err:
+                logger.warning('Malformed import line %s: %s', line_number, err)
+                yield None
+
+
+def load_checkpoint(checkpoint_path: Path, source: Path) -> UserImportCheckpointSchema | None:
+    if not checkpoint_path.exists():
+        return None
+    checkpoint = UserImportCheckpointSchema.model_validate_json(checkpoint_path.read_text())
+    if checkpoint.source != str(source.resolve()):
+        raise ValueError(f'Checkpoint {checkpoint_path} belongs to {checkpoint.source}')
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path: Path, checkpoint: UserImportCheckpointSchema) -> None:
+    # Через временный файл и rename: прерванная запись не портит предыдущую контрольную точку
+    tmp_path = checkpoint_path.with_suffix(checkpoint_path.suffix + '.tmp')
+    tmp_path.write_text(checkpoint.model_dump_json())
+    tmp_path.replace(checkpoint_path)
+
+
+class UserImportService:
+    """
+    Массовый импорт пользователей: файл читается пачками, пароли хешируются в пуле процессов,
+    пачка загружается через COPY в одной транзакции. Хеширование следующей пачки идёт параллельно
+    с загрузкой текущей. После коммита каждой пачки сохраняется контрольная точка для продолжения.
+    """
+
+    def __init__(self, repository: UserImportRepository, hash_workers: int):
+        self.repository = repository
+        self.hash_workers = hash_workers
+
+    async def _hash(self, passwords: list[str], executor: Executor) -> list[str]:
+        if not passwords:
+            return []
+        loop = asyncio.get_running_loop()
+        part_size = -(-len(passwords) // self.hash_workers)
+        parts = list(self._read_chunks(iter(passwords), part_size))
+        hashed_parts = await asyncio.gather(*(loop.run_in_executor(executor, _hash_passwords, part) for part in parts))
+        return list(itertools.chain.from_iterable(hashed_parts))
+
+    async def _prepare_chunk(self, records: list[dict | None], executor: Executor) -> ImportChunkSchema:
+        chunk = ImportChunkSchema(records=len(records))
+        users = []
+        for record in records:
+            if record is None:
+                chunk.invalid += 1
+                continue
+            try:
+                users.append(ImportUserSchema.model_validate(record))
+            except ValidationError as err:
+                chunk.invalid += 1
+                logger.warning('Invalid import record %s: %s', record.get('email') or record.get('username'), err)
+
+        # Схема гарантирует пароль у каждой записи без хеша, поэтому хеши раздаются по порядку
+        to_hash = [user.password for user in users if user.hashed_password is None and user.password is not None]
+        hashed_passwords = iter(await self._hash(to_hash, executor))
+        chunk.hashed = len(to_hash)
+
+        for user in users:
+            user_id = uuid.uuid4()
+            hashed_password = user.hashed_password or next(hashed_passwords)
+            chunk.users.append((user_id, user.username, user.email, hashed_password, user.is_superuser))
+            chunk.user_roles.extend((user_id, role) for role in user.roles)
+            chunk.socials.extend((user_id, social.social_name, social.social_id) for social in user.socials)
+        return chunk
+
+    @staticmethod
+    def _read_chunks(records: Iterator[T], chunk_size: int) -> Iterator[list[T]]:
+        while chunk := list(itertools.islice(records, chunk_size)):
+            yield chunk
+
+    async def import_users(
+        self,
+        path: Path,
+        import_format: ImportFormat,
+        chunk_size: int,
+        checkpoint_path: Path,
+        on_progress: Callable[[UserImportReportSchema], None] | None = None,
+    ) -> UserImportReportSchema:
+        checkpoint = load_checkpoint(checkpoint_path, path) or UserImportCheckpointSchema(
+            source=str(path.resolve()), offset=0, report=UserImportReportSchema()
+        )
+        report = checkpoint.report
+        started_at = time.monotonic() - report.elapsed_seconds
+
+        records = itertools.islice(read_records(path, import_format), checkpoint.offset, None)
+        chunks = self._read_chunks(records, chunk_size)
+        with ProcessPoolExecutor(max_workers=self.hash_workers) as executor:
+            next_records = next(chunks, None)
+            pending = asyncio.create_task(self._prepare_chunk(next_records, executor)) if next_records else None
+            while pending is not None:
+                chunk = await pending
+                if next_records := next(chunks, None):
+                    pending = asyncio.create_task(self._prepare_chunk(next_records, executor))
+                else:
+                    pending = None
+
+                result = await self.repository.load_chunk(chunk) if chunk.users else None
+                imported = result.users if result else 0
+                report.processed += chunk.records
+                report.imported += imported
+                report.skipped += len(chunk.users) - imported
+                report.invalid += chunk.invalid
+                report.hashed += chunk.hashed
+                report.user_roles += result.user_roles if result else 0
+                report.socials += result.socials if result else 0
+                report.chunks += 1
+                report.elapsed_seconds = time.monotonic() - started_at
+
+                checkpoint.offset += chunk.records
+                save_checkpoint(checkpoint_path, checkpoint)
+                if on_progress:
+                    on_progress(report)
+
+        return report
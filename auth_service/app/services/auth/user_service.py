@@ -1,17 +1,29 @@
 import uuid
 
-from app.exceptions import UserAlreadyExistsError, UserNotFoundError
+from app.db.postgres.base import unit_of_work
+from app.exceptions import ProviderAuthError, UserAlreadyExistsError, UserNotFoundError
 from app.schemas.api.v1.auth_schemas import (
     CreateUserCredentialsSchema,
+    HistoryPageSchema,
     HistorySchema,
     HistorySchemaCreate,
 )
-from app.schemas.services.auth.user_service_schemas import UserCreateSchema, UserSchema
-from app.schemas.services.repositories.social_repository_schema import SocialDBSchema
-from app.schemas.services.repositories.user_repository_schemas import UserDBSchema
+from app.schemas.services.auth.user_service_schemas import (
+    PrincipalSchema,
+    UserCreateSchema,
+    UserSchema,
+)
+from app.schemas.services.repositories.user_repository_schemas import (
+    UserDBSchema,
+    UserProfileDBSchema,
+    UserProjection,
+)
 from app.services.repositories.history_repository import history_repository
+from app.services.repositories.history_writer import history_writer
 from app.services.repositories.social_repository import social_repository
 from app.services.repositories.user_repository import user_repository
+from app.services.utils.principal_cache import principal_cache
+from app.utils.pagination import HistoryCursor, decode_cursor, encode_cursor
 from app.utils.pass_generator import generate_random_string
 from app.utils.yandex_id.yandex_id_schema import User as SocialUser
 
@@ -20,34 +32,62 @@ class UserService:
     def __init__(self):
         self.user_repository = user_repository
         self.history_repository = history_repository
+        self.history_writer = history_writer
         self.social_repository = social_repository
+        self.principal_cache = principal_cache
 
     async def create(self, user_data: UserCreateSchema) -> UserSchema:
-        try:
-            user = await self.user_repository.create(user_data)
-            return UserSchema.model_validate(user)
-        except UserAlreadyExistsError as err:
-            raise err
-
-    async def get_user(self, login: str) -> UserDBSchema:
-        if not (user := await self.user_repository.get_user_by_login(login)):
+        user = await self.user_repository.create(user_data)
+        return UserSchema.model_validate(user)
+
+    async def get_user(
+        self, login: str, projection: UserProjection = UserProjection.AUTH
+    ) -> UserDBSchema | UserProfileDBSchema:
+        if not (user := await self.user_repository.get_user_by_login(login, projection=projection)):
+            raise UserNotFoundError
+
+        return user
+
+    async def get_user_by_id(
+        self, user_id: uuid.UUID, projection: UserProjection = UserProjection.AUTH
+    ) -> UserDBSchema | UserProfileDBSchema:
+        if not (user := await self.user_repository.get(user_id, projection=projection)):
             raise UserNotFoundError
 
         return user
 
-    async def get_user_by_credentials(self, user_credentials: CreateUserCredentialsSchema) -> UserDBSchema | None:
-        return await self.user_repository.get_user_by_credentials(
+    async def get_principal(self, login: str) -> PrincipalSchema:
+        if principal := self.principal_cache.get(login):
+            return principal
+
+        user = await self.get_user(login, projection=UserProjection.PROFILE)
+        principal = PrincipalSchema(
+            id=user.id, is_superuser=user.is_superuser, roles=[role.title for role in user.roles]
+        )
+        self.principal_cache.set(login, principal)
+        return principal
+
+    async def get_taken_field(self, user_credentials: CreateUserCredentialsSchema) -> str | None:
+        return await self.user_repository.get_taken_field(
             email=user_credentials.email, username=user_credentials.username
         )
 
     async def save_login_history(self, history_data: HistorySchemaCreate) -> None:
-        await self.history_repository.create(history_data)
+        await self.history_writer.put(history_data)
 
-    async def get_history(self, user: UserDBSchema, limit: int, offset: int) -> list[HistorySchema]:
-        return [HistorySchema.model_validate(entry) for entry in await self.history_repository.get(user, limit, offset)]
+    async def get_history(self, user: UserProfileDBSchema, limit: int, cursor: str | None) -> HistoryPageSchema:
+        # Запрашиваем на одну запись больше, чтобы понять, есть ли следующая страница
+        history = await self.history_repository.get(
+            user, limit + 1, decode_cursor(cursor, HistoryCursor) if cursor else None
+        )
+        items = [HistorySchema.model_validate(entry) for entry in history[:limit]]
+        next_cursor = None
+        if len(history) > limit:
+            next_cursor = encode_cursor(HistoryCursor(auth_date=items[-1].auth_date, id=items[-1].id))
+        return HistoryPageSchema(items=items, next_cursor=next_cursor)
 
     async def set_username(self, user_id: uuid.UUID, new_username: str) -> UserSchema:
-        if await self.user_repository.get_user_by_login(login=new_username):
+        if await self.user_repository.get_user_by_login(login=new_username, projection=UserProjection.PROFILE):
             raise UserAlreadyExistsError
 
         user = await self.user_repository.update(user_id, {'username': new_username})
@@ -57,30 +97,33 @@ class UserService:
         user = await self.user_repository.update(user_id, {'hashed_password': new_password})
         return UserSchema.model_validate(user)
 
-    async def get_or_create_user_by_provider(self, social_user: SocialUser, social_name: str) -> UserDBSchema:
-
-        social: SocialDBSchema = await self.social_repository.get_user_by_psuid(
-            psuid=social_user.psuid,
-        )
-
-        try:
-            user: UserDBSchema = await self.get_user(login=social_user.default_email)
-        except UserNotFoundError:
-            user_data: UserCreateSchema = UserCreateSchema(
+    async def get_or_create_user_by_provider(self, social_user: SocialUser, social_name: str) -> UserProfileDBSchema:
+        """
+        Одна транзакция из двух запросов для нового и уже привязанного аккаунта: upsert привязывает аккаунт
+        к пользователю с тем же email или к созданному (привязанный не меняется), затем пользователь читается
+        по (social_name, social_id). Третий и четвёртый запросы - только если username занят.
+        """
+        async with unit_of_work():
+            if not social_user.default_email:
+                # Без email новый аккаунт не привязать, но уже привязанный найдётся
+                if user := await self.user_repository.get_by_social_account(social_name, social_user.psuid):
+                    return user
+                raise ProviderAuthError(f'{social_name} account {social_user.psuid} has no email')
+
+            user_data = UserCreateSchema(
                 username=social_user.login, email=social_user.default_email, hashed_password=generate_random_string()
             )
-            user = await self.user_repository.create(user_data)
-
-        if social and user:
+            linked = await self.social_repository.link_user(social_name, social_user.psuid, user_data)
+            user = await self.user_repository.get_by_social_account(social_name, social_user.psuid)
+            if not linked and user is None:
+                # Аккаунт не привязан и не был привязан раньше - значит, username занят: добавляем суффикс
+                user_data.username = f'{social_user.login}_{generate_random_string()[:8]}'
+                await self.social_repository.link_user(social_name, social_user.psuid, user_data)
+                user = await self.user_repository.get_by_social_account(social_name, social_user.psuid)
+
+            if user is None:
+                raise ProviderAuthError(f'Can not link {social_name} account {social_user.psuid}')
             return user
 
-        if not social:
-            social_data: SocialDBSchema = SocialDBSchema(
-                user_id=user.id, social_id=social_user.psuid, social_name=social_name
-            )
-            await self.social_repository.create(social_data=social_data)
-
-        return user
-
 
 user_service = UserService()
@@ -1,6 +1,10 @@
-from fastapi import Request
+from typing import AsyncIterator
 
-from app.exceptions import auth_error
+from fastapi import Depends, Request
+
+from app.db.postgres.base import unit_of_work
+from app.exceptions import AuthorizationError, TokenError, UserNotFoundError, auth_error
+from app.services.auth.auth_service import AuthenticationService
 
 
 def get_bearer_token(request: Request) -> str:
@@ -15,3 +19,18 @@ def get_bearer_token(request: Request) -> str:
         raise auth_error
 
     return token
+
+
+async def use_unit_of_work() -> AsyncIterator[None]:
+    async with unit_of_work():
+        yield
+
+
+async def require_superuser(
+    access_token: str = Depends(get_bearer_token), auth_service: AuthenticationService = Depends()
+) -> None:
+    """Пускает только суперпользователя. Решение принимается по claims токена, к БД - только при смене прав."""
+    try:
+        await auth_service.authorize_superuser(access_token=access_token)
+    except (TokenError, UserNotFoundError, AuthorizationError):
+        raise auth_error
@@ -1,14 +1,22 @@
-from abc import abstractmethod, ABC
+from abc import ABC, abstractmethod
+
+from app.services.providers.http_client import ProviderHTTPClient
+from app.utils.yandex_id.yandex_id_schema import User as SocialUser
 
 
 class BaseProvider(ABC):
     NAME: str
-    @staticmethod
+
+    def __init__(self, http_client: ProviderHTTPClient):
+        self.http_client = http_client
+
     @abstractmethod
-    def get_auth_url() -> str:
+    def get_auth_url(self) -> str:
         """Возвращает url для авторизации через соцсети."""
 
-    @staticmethod
     @abstractmethod
-    async def get_userdata(code):
+    async def get_userdata(self, code) -> SocialUser:
         """Возвращает данные пользователя, предоставленные провайдером."""
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
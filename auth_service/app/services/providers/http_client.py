@@ -0,0 +1,85 @@
+import asyncio
+import random
+
+import httpx
+
+from app.core.config import app_settings
+from app.core.logs import logger
+from app.exceptions import ProviderAuthError
+
+# Ответы, при которых провайдер запрос не обработал: повтор безопасен для любого метода
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class ProviderHTTPClient:
+    """
+    Общий для всех логинов через провайдера httpx.AsyncClient с пулом соединений и строгими таймаутами.
+    Повторы идут с экспоненциальной задержкой и полным джиттером. Запрос, который мог дойти до провайдера
+    (таймаут чтения, 500), повторяется только для идемпотентных методов: код авторизации одноразовый.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        connect_timeout: float,
+        max_connections: int,
+        retries: int,
+        backoff: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.retries = retries
+        self.backoff = backoff
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, transport=self.transport)
+        return self._client
+
+    def _get_delay(self, attempt: int) -> float:
+        return random.uniform(0, self.backoff * 2**attempt)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        is_idempotent = method in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._get_client().request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as err:
+                # Соединение не установлено - запрос точно не дошёл до провайдера
+                error = f'{type(err).__name__}: {err}'
+            except httpx.TransportError as err:
+                if not is_idempotent:
+                    raise ProviderAuthError(f'{method} {url} failed: {err}')
+                error = f'{type(err).__name__}: {err}'
+            else:
+                if response.status_code in RETRY_STATUSES or (is_idempotent and response.is_server_error):
+                    error = f'status {response.status_code}'
+                elif response.is_error:
+                    raise ProviderAuthError(f'{method} {url} returned {response.status_code}')
+                else:
+                    return response
+
+            if attempt == self.retries:
+                raise ProviderAuthError(f'{method} {url} failed after {attempt + 1} attempts: {error}')
+            logger.warning('Provider request %s %s failed (%s), retrying', method, url, error)
+            await asyncio.sleep(self._get_delay(attempt))
+        raise ProviderAuthError(f'{method} {url} failed: no attempts made')
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_provider_http_client() -> ProviderHTTPClient:
+    return ProviderHTTPClient(
+        timeout=app_settings.PROVIDER_HTTP_TIMEOUT_SECONDS,
+        connect_timeout=app_settings.PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS,
+        max_connections=app_settings.PROVIDER_HTTP_MAX_CONNECTIONS,
+        retries=app_settings.PROVIDER_HTTP_RETRIES,
+        backoff=app_settings.PROVIDER_HTTP_RETRY_BACKOFF_SECONDS,
+    )
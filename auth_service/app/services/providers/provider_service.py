@@ -1,11 +1,11 @@
 from app.exceptions import ProviderAuthError
 from app.services.providers.base_provider import BaseProvider
-from app.services.providers.yandex_provider import YandexProvider
+from app.services.providers.yandex_provider import yandex_provider
 
 
 class ProviderService:
-    PROVIDERS = {
-        'yandex': YandexProvider
+    PROVIDERS: dict[str, BaseProvider] = {
+        yandex_provider.NAME: yandex_provider,
     }
 
     def get_provider(self, provider_name: str) -> BaseProvider:
@@ -13,3 +13,9 @@ class ProviderService:
         if not provider:
             raise ProviderAuthError(f'Вход через {provider_name} невозможен')
         return provider
+
+
+async def close_providers() -> None:
+    """Закрывает пулы соединений провайдеров при остановке приложения."""
+    for provider in ProviderService.PROVIDERS.values():
+        await provider.aclose()
@@ -1,15 +1,24 @@
-from yandex_oauth import yao
+from pydantic import ValidationError
 
-from .base_provider import BaseProvider
-from ...core.config import app_settings
-from ...utils.yandex_id.yandex_id import YandexID
+from app.core.config import app_settings
+from app.exceptions import ProviderAuthError
+from app.services.providers.base_provider import BaseProvider
+from app.services.providers.http_client import (
+    ProviderHTTPClient,
+    create_provider_http_client,
+)
+from app.utils.yandex_id.yandex_id_schema import User as SocialUser
 
 
 class YandexProvider(BaseProvider):
     NAME: str = 'yandex'
 
-    @staticmethod
-    def get_auth_url():
+    def __init__(self, http_client: ProviderHTTPClient, token_url: str, user_info_url: str):
+        super().__init__(http_client)
+        self.token_url = token_url
+        self.user_info_url = user_info_url
+
+    def get_auth_url(self):
         return (
             f'{app_settings.YANDEX_BASE_URL}?'
             f'response_type=code&'
@@ -17,10 +26,35 @@ class YandexProvider(BaseProvider):
             f'client_id={app_settings.YANDEX_CLIENT_ID}'
         )
 
-    @staticmethod
-    async def get_userdata(code):
-        token = yao.get_token_by_code(code, app_settings.YANDEX_CLIENT_ID, app_settings.YANDEX_CLIENT_SECRET)
-        social_user = YandexID(token.get('access_token'))
-        user_data = social_user.get_user_info_json()
+    async def _get_access_token(self, code) -> str:
+        response = await self.http_client.request(
+            'POST',
+            self.token_url,
+            data={
+                'grant_type': 'authorization_code',
+                'code': str(code),
+                'client_id': app_settings.YANDEX_CLIENT_ID,
+                'client_secret': app_settings.YANDEX_CLIENT_SECRET,
+            },
+        )
+        try:
+            return response.json()['access_token']
+        except (ValueError, KeyError) as err:
+            raise ProviderAuthError(f'Invalid token response: {err}')
+
+    async def get_userdata(self, code) -> SocialUser:
+        access_token = await self._get_access_token(code)
+        response = await self.http_client.request(
+            'GET', self.user_info_url, params={'format': 'json'}, headers={'Authorization': f'OAuth {access_token}'}
+        )
+        try:
+            return SocialUser.model_validate_json(response.content)
+        except ValidationError as err:
+            raise ProviderAuthError(f'Invalid user info response: {err}')
+
 
-        return user_data
+yandex_provider = YandexProvider(
+    http_client=create_provider_http_client(),
+    token_url=app_settings.YANDEX_TOKEN_URL,
+    user_info_url=app_settings.YANDEX_USER_INFO_URL,
+)
@@ -0,0 +1,89 @@
+"""
+Lua-скрипты алгоритмов ограничения запросов.
+
+Каждый скрипт выполняется в Редисе атомарно и возвращает {allowed, remaining, retry_after_ms}.
+Общие аргументы: ARGV[1] - текущее время в мс, ARGV[2] - период в мс, ARGV[3] - лимит запросов.
+"""
+
+SLIDING_WINDOW_LOG = '''
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - period)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return {0, 0, math.ceil(tonumber(oldest[2]) + period - now)}
+end
+
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, period)
+return {1, limit - count - 1, 0}
+'''
+
+SLIDING_WINDOW_COUNTER = '''
+local current_key = KEYS[1]
+local previous_key = KEYS[2]
+local now = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+local elapsed = now % period
+local current = tonumber(redis.call('GET', current_key) or '0')
+local previous = tonumber(redis.call('GET', previous_key) or '0')
+local weighted = previous * (period - elapsed) / period + current
+
+if weighted + 1 > limit then
+    return {0, 0, period - elapsed}
+end
+
+redis.call('INCR', current_key)
+redis.call('PEXPIRE', current_key, period * 2)
+return {1, math.floor(limit - weighted - 1), 0}
+'''
+
+TOKEN_BUCKET = '''
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local rate = limit / period
+
+local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or limit
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(limit, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, period)
+return {allowed, math.floor(tokens), retry_after}
+'''
+
+GCRA = '''
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local emission_interval = period / limit
+
+local tat = math.max(tonumber(redis.call('GET', key) or now), now)
+local allow_at = tat + emission_interval - period
+if now < allow_at then
+    return {0, 0, math.ceil(allow_at - now)}
+end
+
+local new_tat = tat + emission_interval
+redis.call('SET', key, string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((period - (new_tat - now)) / emission_interval), 0}
+'''
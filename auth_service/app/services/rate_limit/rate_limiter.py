@@ -0,0 +1,96 @@
+import time
+import uuid
+
+from jwt import InvalidTokenError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.requests import Request
+
+from app.core.config import app_settings
+from app.core.logs import logger
+from app.db.redis.base import redis_client
+from app.schemas.services.rate_limit.rate_limit_schemas import (
+    RateLimitAlgorithm,
+    RateLimitResult,
+    RateLimitRule,
+)
+from app.services.rate_limit import lua_scripts
+from app.services.utils.jwt_service import jwt_service
+from app.services.utils.token_cache import token_cache
+
+
+class RateLimiter:
+    """Ограничивает число запросов от принципала через атомарные Lua-скрипты в Редисе."""
+
+    KEY_PREFIX = 'rate_limit'
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.default_rule = RateLimitRule(
+            limit=app_settings.REQUEST_LIMIT_PER_MINUTE, period=60, algorithm=app_settings.RATE_LIMIT_ALGORITHM
+        )
+        self.route_rules = app_settings.RATE_LIMIT_ROUTE_RULES
+        self.principal_rules = app_settings.RATE_LIMIT_PRINCIPAL_RULES
+        self.scripts = {
+            RateLimitAlgorithm.SLIDING_WINDOW_LOG: redis.register_script(lua_scripts.SLIDING_WINDOW_LOG),
+            RateLimitAlgorithm.SLIDING_WINDOW_COUNTER: redis.register_script(lua_scripts.SLIDING_WINDOW_COUNTER),
+            RateLimitAlgorithm.TOKEN_BUCKET: redis.register_script(lua_scripts.TOKEN_BUCKET),
+            RateLimitAlgorithm.GCRA: redis.register_script(lua_scripts.GCRA),
+        }
+
+    @staticmethod
+    def get_principal(request: Request, client_ip: str) -> str:
+        """Аутентифицированный пользователь ограничивается по логину, остальные - по IP."""
+        prefix, _, token = request.headers.get('Authorization', '').partition(' ')
+        if prefix == 'Bearer' and token:
+            try:
+                token_payload = token_cache.get(token) or jwt_service.get_token_payload(token)
+                if login := token_payload.get('login'):
+                    return f'user:{login}'
+            except InvalidTokenError:
+                pass
+        return f'ip:{client_ip}'
+
+    def get_rule(self, path: str, principal: str) -> tuple[str, RateLimitRule]:
+        """Возвращает область действия лимита и правило: принципал > самый длинный префикс маршрута > дефолт."""
+        if rule := self.principal_rules.get(principal):
+            return 'principal', rule
+
+        matched_routes = [route for route in self.route_rules if path.startswith(route)]
+        if matched_routes:
+            route = max(matched_routes, key=len)
+            return route, self.route_rules[route]
+
+        return 'default', self.default_rule
+
+    def _build_keys(self, algorithm: RateLimitAlgorithm, scope: str, principal: str, now_ms: int, period_ms: int):
+        key = f'{self.KEY_PREFIX}:{algorithm}:{scope}:{principal}'
+        if algorithm == RateLimitAlgorithm.SLIDING_WINDOW_COUNTER:
+            window = now_ms // period_ms
+            return [f'{key}:{window}', f'{key}:{window - 1}']
+        return [key]
+
+    async def hit(self, path: str, principal: str) -> RateLimitResult:
+        scope, rule = self.get_rule(path, principal)
+        algorithm = rule.algorithm or app_settings.RATE_LIMIT_ALGORITHM
+        now_ms = int(time.time() * 1000)
+        period_ms = rule.period * 1000
+
+        keys = self._build_keys(algorithm, scope, principal, now_ms, period_ms)
+        args: list[int | str] = [now_ms, period_ms, rule.limit]
+        if algorithm == RateLimitAlgorithm.SLIDING_WINDOW_LOG:
+            args.append(uuid.uuid4().hex)
+
+        try:
+            allowed, remaining, retry_after_ms = await self.scripts[algorithm](keys=keys, args=args)
+        except RedisError as err:
+            # Недоступность Редиса не должна ронять авторизацию: пропускаем запрос
+            logger.error('Rate limiter is unavailable: %s', err)
+            return RateLimitResult(allowed=True, limit=rule.limit, remaining=rule.limit, retry_after=0)
+
+        return RateLimitResult(
+            allowed=bool(allowed), limit=rule.limit, remaining=max(int(remaining), 0), retry_after=retry_after_ms / 1000
+        )
+
+
+rate_limiter = RateLimiter(redis_client)
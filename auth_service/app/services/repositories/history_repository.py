@@ -1,21 +1,43 @@
+from sqlalchemy import literal, tuple_
+
 from app.core.logs import logger
+from app.db.postgres.base import savepoint
 from app.db.postgres.models.users import HistoryModel
 from app.schemas.api.v1.auth_schemas import HistorySchemaCreate
 from app.schemas.services.repositories.history_repository_schemas import HistoryDBSchema
-from app.schemas.services.repositories.user_repository_schemas import UserDBSchema
+from app.schemas.services.repositories.user_repository_schemas import (
+    UserProfileDBSchema,
+)
 from app.services.repositories.postgres_repository import (
     PostgresRepository,
     postgres_repository,
 )
+from app.utils.pagination import HistoryCursor
 
 
 class HistoryRepository:
     def __init__(self):
         self.db: PostgresRepository = postgres_repository
 
-    async def get(self, user: UserDBSchema, limit: int | None, offset: int | None) -> list[HistoryDBSchema]:
+    async def get(
+        self, user: UserProfileDBSchema, limit: int, cursor: HistoryCursor | None = None
+    ) -> list[HistoryDBSchema]:
+        """
+        Keyset-пагинация от новых записей к старым по (auth_date, id).
+        Отдельное условие auth_date <= cursor.auth_date позволяет планировщику отсечь более новые партиции.
+        """
+        filters = []
+        if cursor:
+            filters = [
+                HistoryModel.auth_date <= cursor.auth_date,
+                tuple_(HistoryModel.auth_date, HistoryModel.id) < tuple_(literal(cursor.auth_date), literal(cursor.id)),
+            ]
         history = await self.db.get_all_obj(
-            HistoryModel, where_value=[(HistoryModel.user_id, user.id)], limit=limit, offset=offset
+            HistoryModel,
+            where_value=[(HistoryModel.user_id, user.id)],
+            filters=filters,
+            order_by=[HistoryModel.auth_date.desc(), HistoryModel.id.desc()],
+            limit=limit,
         )
         return [HistoryDBSchema.model_validate(entry) for entry in history]
 
@@ -28,10 +50,14 @@ class HistoryRepository:
                 login_type=history_data.login_type,
                 session_id=history_data.session_id,
             )
-            await self.db.create_obj(add_history)
+            async with savepoint():
+                await self.db.create_obj(add_history)
         except Exception as err:
             logger.error('Oops do not create history %s', err)
             return None
 
+    async def create_many(self, history_data: list[HistorySchemaCreate]) -> None:
+        await self.db.create_many_obj(HistoryModel, [entry.model_dump() for entry in history_data])
+
 
 history_repository = HistoryRepository()
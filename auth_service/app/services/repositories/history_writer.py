@@ -0,0 +1,126 @@
+import asyncio
+
+from app.core.config import app_settings
+from app.core.logs import logger
+from app.schemas.api.v1.auth_schemas import HistorySchemaCreate
+from app.schemas.services.repositories.history_repository_schemas import (
+    HistoryWriterMetrics,
+)
+from app.services.repositories.history_repository import (
+    HistoryRepository,
+    history_repository,
+)
+
+
+class HistoryWriter:
+    """
+    Фоновая запись истории входов: логин кладёт запись в очередь, а фоновая задача пишет записи пачками
+    одним многострочным INSERT по достижении batch_size или раз в flush_interval секунд.
+    """
+
+    def __init__(self, repository: HistoryRepository, batch_size: int, flush_interval: float, queue_size: int):
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[HistorySchemaCreate | None] = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task | None = None
+        self._enqueued = 0
+        self._written = 0
+        self._failed = 0
+        self._batches = 0
+        self._backpressure_waits = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def put(self, history_data: HistorySchemaCreate) -> None:
+        # Без запущенного воркера (CLI, тесты без lifespan) пишем сразу
+        if not self.is_running:
+            await self.repository.create(history_data)
+            return
+
+        try:
+            self._queue.put_nowait(history_data)
+        except asyncio.QueueFull:
+            # Очередь переполнена: притормаживаем логин, пока воркер не освободит место
+            self._backpressure_waits += 1
+            await self._queue.put(history_data)
+        self._enqueued += 1
+
+    async def _collect_batch(self) -> tuple[list[HistorySchemaCreate], bool]:
+        """Собирает пачку записей. Второй элемент результата - получен ли сигнал остановки (None)."""
+        if (history_data := await self._queue.get()) is None:
+            return [], True
+
+        batch = [history_data]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                history_data = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+            if history_data is None:
+                return batch, True
+            batch.append(history_data)
+        return batch, False
+
+    async def _write_batch(self, batch: list[HistorySchemaCreate]) -> None:
+        try:
+            await self.repository.create_many(batch)
+            self._written += len(batch)
+            self._batches += 1
+        except Exception as err:
+            self._failed += len(batch)
+            logger.error('Can not write history batch of %s entries: %s', len(batch), err)
+
+    async def _run(self) -> None:
+        while True:
+            batch, stopping = await self._collect_batch()
+            if batch:
+                await self._write_batch(batch)
+            if stopping:
+                return
+
+    def start(self) -> None:
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run(), name='history_writer')
+
+    async def stop(self) -> None:
+        """Дописывает очередь и останавливает воркер."""
+        if self._task is None:
+            return
+
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+        # Записи, попавшие в очередь после сигнала остановки
+        leftover = []
+        while not self._queue.empty():
+            if history_data := self._queue.get_nowait():
+                leftover.append(history_data)
+        if leftover:
+            await self._write_batch(leftover)
+
+    def get_metrics(self) -> HistoryWriterMetrics:
+        return HistoryWriterMetrics(
+            queue_size=self._queue.qsize(),
+            queue_max_size=self._queue.maxsize,
+            enqueued=self._enqueued,
+            written=self._written,
+            failed=self._failed,
+            batches=self._batches,
+            backpressure_waits=self._backpressure_waits,
+        )
+
+
+history_writer = HistoryWriter(
+    repository=history_repository,
+    batch_size=app_settings.HISTORY_WRITER_BATCH_SIZE,
+    flush_interval=app_settings.HISTORY_WRITER_FLUSH_INTERVAL_SECONDS,
+    queue_size=app_settings.HISTORY_WRITER_QUEUE_SIZE,
+)
@@ -1,8 +1,9 @@
 from typing import Any, Union
 
-from sqlalchemy import Column, and_, delete, select, update
+from sqlalchemy import Column, and_, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from app.db.postgres.base import manage_async_session
 
@@ -14,9 +15,13 @@ class PostgresRepository:
         action: Union[select, delete, update] = select,
         where_value: list[tuple[Column, Any]] | None = None,
         select_in_load: Column | None = None,
+        load_columns: list[Column] | None = None,
+        filters: list | None = None,
+        order_by: list | None = None,
         update_values: dict | None = None,
         limit: int | None = None,
         offset: int | None = None,
+        returning: list[Column] | None = None,
     ):
         query = action(model)
         if where_value and len(where_value) == 1:
@@ -24,6 +29,12 @@ class PostgresRepository:
             query = query.where(_column == _value)
         if where_value and len(where_value) > 1:
             query = query.where(and_(_column == _value for _column, _value in where_value))
+        if filters:
+            query = query.where(*filters)
+        if order_by:
+            query = query.order_by(*order_by)
+        if load_columns:
+            query = query.options(load_only(*load_columns))
         if select_in_load:
             query = query.options(*[selectinload(column) for column in select_in_load])
         if action == update:
@@ -32,16 +43,18 @@ class PostgresRepository:
             query = query.limit(limit)
         if offset is not None:
             query = query.offset(offset)
+        if returning:
+            query = query.returning(*returning)
 
         return query
 
-    @manage_async_session
+    @manage_async_session(read_only=True)
     async def get_one_obj(self, model, *, session: AsyncSession | None = None, limit=None, offset=None, **kwargs):
         query = self._build_query(model, limit=limit, offset=offset, **kwargs)
         result = await session.execute(query)
         return result.scalar_one_or_none()
 
-    @manage_async_session
+    @manage_async_session(read_only=True)
     async def get_all_obj(self, model, *, session: AsyncSession | None = None, **kwargs):
         query = self._build_query(model, **kwargs)
         result = await session.execute(query)
@@ -50,6 +63,53 @@ class PostgresRepository:
     @manage_async_session
     async def create_obj(self, obj, *, session: AsyncSession | None = None) -> None:
         session.add(obj)
+        # Ошибки целостности должны подниматься здесь, а не при коммите общей транзакции запроса
+        await session.flush()
+
+    @manage_async_session
+    async def create_obj_ignore_conflicts(
+        self,
+        model,
+        values: dict,
+        *,
+        returning: list[Column],
+        index_elements: list | None = None,
+        session: AsyncSession | None = None,
+    ):
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING: строка без повторного SELECT, при конфликте - None.
+        # С index_elements пропускается только конфликт по этому уникальному индексу, остальные поднимают ошибку
+        query = (
+            pg_insert(model)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=index_elements)
+            .returning(*returning)
+        )
+        result = await session.execute(query)
+        return result.one_or_none()
+
+    @manage_async_session
+    async def create_many_obj(self, model, values: list[dict], *, session: AsyncSession | None = None) -> None:
+        # executemany с asyncpg собирается SQLAlchemy в многострочные INSERT ... VALUES
+        await session.execute(insert(model), values)
+
+    @manage_async_session
+    async def create_many_obj_ignore_conflicts(
+        self, model, values: list[dict], *, returning: list[Column] | None = None, session: AsyncSession | None = None
+    ) -> list:
+        # Один INSERT ... VALUES (...), (...) ON CONFLICT DO NOTHING: уже существующие строки пропускаются
+        query = pg_insert(model).values(values).on_conflict_do_nothing()
+        if returning:
+            query = query.returning(*returning)
+        result = await session.execute(query)
+        return list(result.scalars()) if returning else []
+
+    @manage_async_session
+    async def execute_obj(
+        self, models: list, statement, *, params: dict | None = None, session: AsyncSession | None = None
+    ):
+        # Готовое выражение; models - все таблицы, в которые оно пишет, для учёта записей при чтении с реплики
+        result = await session.execute(statement, params or {})
+        return list(result.scalars()) if result.returns_rows else []
 
     @manage_async_session
     async def update_obj(self, model, *, session: AsyncSession | None = None, **kwargs) -> None:
@@ -57,9 +117,11 @@ class PostgresRepository:
         await session.execute(query)
 
     @manage_async_session
-    async def delete_obj(self, model, *, session: AsyncSession | None = None, **kwargs) -> None:
+    async def delete_obj(self, model, *, session: AsyncSession | None = None, **kwargs) -> list:
         query = self._build_query(model, action=delete, **kwargs)
-        await session.execute(query)
+        result = await session.execute(query)
+        # ORM-результат не знает returns_rows, поэтому строки есть только при явном returning
+        return list(result.scalars()) if kwargs.get('returning') else []
 
 
 postgres_repository = PostgresRepository()
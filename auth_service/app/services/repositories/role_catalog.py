@@ -0,0 +1,110 @@
+import asyncio
+import uuid
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.logs import logger
+from app.db.postgres.base import unit_of_work
+from app.db.redis.base import redis_client
+from app.schemas.services.auth.role_service_schemas import RoleSchema
+from app.services.repositories.role_repository import RoleRepository, role_repository
+
+
+class RoleCatalog:
+    """
+    Копия справочника ролей в памяти воркера с индексами по id и названию. Прогревается при старте,
+    после изменения ролей в любом воркере (или CLI) перечитывается по сообщению в канал Редиса.
+    """
+
+    CHANNEL = 'role_catalog'
+    RECONNECT_DELAY_SECONDS = 1
+
+    def __init__(self, repository: RoleRepository, redis: Redis):
+        self.repository = repository
+        self.redis = redis
+        self.instance_id = uuid.uuid4().hex
+        self._by_id: dict[uuid.UUID, RoleSchema] = {}
+        self._by_title: dict[str, RoleSchema] = {}
+        self._loaded = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        # Без подписки (CLI, тесты без lifespan) каталог мог устареть, поэтому читаем из БД
+        return self._loaded and self._task is not None and not self._task.done()
+
+    async def load(self) -> None:
+        # Каталог живёт до следующего оповещения, поэтому читаем из мастера: отстающая реплика закешировала бы
+        # справочник без только что зафиксированного изменения
+        async with unit_of_work():
+            roles = await self.repository.get_all()
+        self._by_id = {role.id: role for role in roles}
+        self._by_title = {role.title: role for role in roles}
+        self._loaded = True
+
+    async def get_all(self) -> list[RoleSchema]:
+        if not self.is_ready:
+            return list(await self.repository.get_all())
+        return list(self._by_id.values())
+
+    async def get(self, role_id: uuid.UUID) -> RoleSchema | None:
+        if not self.is_ready:
+            return await self.repository.get(role_id)
+        return self._by_id.get(role_id)
+
+    async def get_by_title(self, role_title: str) -> RoleSchema | None:
+        if not self.is_ready:
+            return await self.repository.get_by_title(role_title)
+        return self._by_title.get(role_title)
+
+    async def get_existing_ids(self, role_ids: set[uuid.UUID]) -> set[uuid.UUID]:
+        if not self.is_ready:
+            return await self.repository.get_existing_ids(role_ids)
+        return role_ids & self._by_id.keys()
+
+    async def refresh(self) -> None:
+        """Перечитывает каталог после изменения ролей и оповещает остальные воркеры."""
+        if self.is_ready:
+            await self.load()
+        try:
+            await self.redis.publish(self.CHANNEL, self.instance_id)
+        except RedisError as err:
+            logger.error('Can not publish role catalog update: %s', err)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    # Пока подписки не было, сообщения могли потеряться
+                    await self.load()
+                    async for message in pubsub.listen():
+                        if message['type'] == 'message' and message['data'] != self.instance_id.encode():
+                            await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                logger.error('Role catalog subscription failed: %s', err)
+                await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+    async def start(self) -> None:
+        try:
+            await self.load()
+        except Exception as err:
+            logger.error('Can not warm role catalog: %s', err)
+        self._task = asyncio.create_task(self._listen(), name='role_catalog')
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+role_catalog = RoleCatalog(role_repository, redis_client)
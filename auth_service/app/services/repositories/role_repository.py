@@ -1,9 +1,11 @@
+import functools
 from typing import Sequence
 from uuid import UUID
 
 from sqlalchemy.exc import IntegrityError
 
 from app.core.logs import logger
+from app.db.postgres.base import after_commit, savepoint
 from app.db.postgres.models.users import RoleModel, UserRoleAssociationModel
 from app.exceptions import RoleAlreadyExistsError
 from app.schemas.services.auth.role_service_schemas import CreateRoleSchema, RoleSchema
@@ -11,6 +13,8 @@ from app.services.repositories.postgres_repository import (
     PostgresRepository,
     postgres_repository,
 )
+from app.services.utils.permissions_version import permissions_version_service
+from app.services.utils.principal_cache import principal_cache
 
 
 class RoleRepository:
@@ -29,6 +33,9 @@ class RoleRepository:
         db_role = await self.db.get_one_obj(RoleModel, where_value=[(RoleModel.title, role_title)])
         return RoleSchema.model_validate(db_role) if db_role else None
 
+    async def get_existing_ids(self, role_ids: set[UUID]) -> set[UUID]:
+        return set(await self.db.get_all_obj(RoleModel.id, filters=[RoleModel.id.in_(role_ids)]))
+
     async def create(self, role_data: CreateRoleSchema) -> RoleSchema | None:
         role = RoleModel(title=role_data.title, description=role_data.description)
         await self.db.create_obj(role)
@@ -36,7 +43,9 @@ class RoleRepository:
 
     async def update(self, role_id: UUID, data: dict) -> RoleSchema | None:
         try:
-            await self.db.update_obj(RoleModel, where_value=[(RoleModel.id, role_id)], update_values=data)
+            async with savepoint():
+                await self.db.update_obj(RoleModel, where_value=[(RoleModel.id, role_id)], update_values=data)
+            await after_commit(principal_cache.clear)
             return await self.get(role_id)
         except IntegrityError:
             logger.error(RoleAlreadyExistsError('Role already exist'))
@@ -44,13 +53,21 @@ class RoleRepository:
 
     async def delete(self, role_id: UUID) -> bool:
         try:
-            # Удалю связи
-            await self.db.delete_obj(
-                UserRoleAssociationModel, where_value=[(UserRoleAssociationModel.role_id, role_id)]
-            )
+            async with savepoint():
+                # Владельцы роли теряют её: их токены с этой ролью больше не годятся для авторизации
+                holder_ids = await self.db.get_all_obj(
+                    UserRoleAssociationModel.user_id, where_value=[(UserRoleAssociationModel.role_id, role_id)]
+                )
+
+                # Удалю связи
+                await self.db.delete_obj(
+                    UserRoleAssociationModel, where_value=[(UserRoleAssociationModel.role_id, role_id)]
+                )
 
-            # Удаляю роль
-            await self.db.delete_obj(RoleModel, where_value=[(RoleModel.id, role_id)])
+                # Удаляю роль
+                await self.db.delete_obj(RoleModel, where_value=[(RoleModel.id, role_id)])
+            await after_commit(functools.partial(permissions_version_service.bump, *holder_ids))
+            await after_commit(principal_cache.clear)
             return True
         except Exception as err:
             logger.error('Can not delete role_id=%s error=%s', role_id, err)
@@ -1,34 +1,52 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
 
-from app.db.postgres.models.users import SocialAccount
-from app.schemas.services.repositories.social_repository_schema import SocialDBSchema
+from app.db.postgres.models.users import SocialAccount, UserModel
+from app.schemas.services.auth.user_service_schemas import UserCreateSchema
 from app.services.repositories.postgres_repository import (
     PostgresRepository,
     postgres_repository,
 )
 
+# Один запрос: создаёт пользователя, если email (без учёта регистра) ещё не занят, иначе берёт существующего,
+# и привязывает к нему социальный аккаунт. Новый пользователь и совпадение по email взаимоисключающие.
+# Если username занят другим пользователем, не вставляется ничего - вызывающий повторяет с другим username.
+# Уже привязанный аккаунт ничего не меняет, даже если email пользователя с тех пор сменился.
+LINK_SOCIAL_ACCOUNT = text(
+    '''
+    WITH new_user AS (
+        INSERT INTO users (username, email, hashed_password)
+        SELECT :username, :email, :hashed_password
+        WHERE NOT EXISTS (SELECT 1 FROM users WHERE lower(email) = lower(:email))
+        AND NOT EXISTS (SELECT 1 FROM social_account WHERE social_name = :social_name AND social_id = :social_id)
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    ), linked_user AS (
+        SELECT id FROM new_user
+        UNION ALL
+        SELECT id FROM users WHERE lower(email) = lower(:email)
+        LIMIT 1
+    )
+    INSERT INTO social_account (user_id, social_name, social_id)
+    SELECT id, :social_name, :social_id FROM linked_user
+    ON CONFLICT ON CONSTRAINT social_pk DO NOTHING
+    RETURNING user_id
+    '''
+)
+
 
 class SocialRepository:
     def __init__(self):
         self.db: PostgresRepository = postgres_repository
 
-    async def create(
-        self, social_data: SocialDBSchema, *, session: AsyncSession | None = None
-    ) -> SocialDBSchema | None:
-        db_social = await self.db.create_obj(
-            SocialAccount(**social_data.model_dump()),
-            session=session,
-        )
-        return db_social
-
-    async def get_user_by_psuid(self, psuid: str, *, session: AsyncSession | None = None) -> SocialDBSchema | None:
-        db_social = await self.db.get_one_obj(
-            SocialAccount,
-            where_value=[(SocialAccount.social_id, psuid)],
-            # select_in_load=[SocialAccount.user],
-            session=session,
+    async def link_user(self, social_name: str, social_id: str, user_data: UserCreateSchema) -> bool:
+        """Возвращает False, если аккаунт не привязан: уже привязан параллельным запросом или username занят."""
+        # Выражение создаёт пользователя и привязывает к нему аккаунт: помечаем записанными обе таблицы
+        linked = await self.db.execute_obj(
+            [UserModel, SocialAccount],
+            LINK_SOCIAL_ACCOUNT,
+            params=user_data.model_dump() | {'social_name': social_name, 'social_id': social_id},
         )
-        return SocialDBSchema.model_validate(db_social) if db_social else None
+        return bool(linked)
 
 
 social_repository = SocialRepository()
@@ -0,0 +1,83 @@
+from typing import cast
+
+import asyncpg
+from sqlalchemy import text
+
+from app.db.postgres import base
+from app.schemas.services.auth.user_import_service_schemas import (
+    ImportChunkResultSchema,
+    ImportChunkSchema,
+)
+
+# Staging-таблицы живут до конца транзакции пачки: COPY не умеет ON CONFLICT, поэтому в целевые таблицы
+# строки переносятся INSERT ... SELECT ... ON CONFLICT DO NOTHING. num - порядок строк в пачке
+STAGING_TABLES = (
+    '''
+    CREATE TEMP TABLE import_users (
+        num bigserial, id uuid, username text, email text, hashed_password text, is_superuser boolean
+    ) ON COMMIT DROP
+    ''',
+    'CREATE TEMP TABLE import_user_roles (user_id uuid, role_title text) ON COMMIT DROP',
+    'CREATE TEMP TABLE import_socials (user_id uuid, social_name text, social_id text) ON COMMIT DROP',
+)
+
+# Занятый email проверяется без учёта регистра, как при регистрации. Из записей пачки, различающихся
+# только регистром email, остаётся первая
+INSERT_USERS = '''
+    INSERT INTO users (id, username, email, hashed_password, is_superuser)
+    SELECT DISTINCT ON (lower(i.email)) i.id, i.username, i.email, i.hashed_password, i.is_superuser
+    FROM import_users i
+    WHERE NOT EXISTS (SELECT 1 FROM users u WHERE lower(u.email) = lower(i.email))
+    ORDER BY lower(i.email), i.num
+    ON CONFLICT DO NOTHING
+'''
+
+# Связи берутся только для вставленных пользователей: id новых строк сгенерированы при импорте
+INSERT_USER_ROLES = '''
+    INSERT INTO user_role_associations (user_id, role_id)
+    SELECT i.user_id, r.id FROM import_user_roles i
+    JOIN users u ON u.id = i.user_id
+    JOIN roles r ON r.title = i.role_title
+    ON CONFLICT DO NOTHING
+'''
+
+INSERT_SOCIALS = '''
+    INSERT INTO social_account (user_id, social_name, social_id)
+    SELECT i.user_id, i.social_name, i.social_id FROM import_socials i
+    JOIN users u ON u.id = i.user_id
+    ON CONFLICT DO NOTHING
+'''
+
+
+class UserImportRepository:
+    """Загружает пачку пользователей с ролями и социальными аккаунтами через COPY в одной транзакции."""
+
+    async def load_chunk(self, chunk: ImportChunkSchema) -> ImportChunkResultSchema:
+        async with base.async_engine.begin() as conn:
+            # DDL через SQLAlchemy открывает транзакцию, в которой затем выполняется COPY драйвера
+            for staging_table in STAGING_TABLES:
+                await conn.execute(text(staging_table))
+
+            driver_connection = cast(asyncpg.Connection, (await conn.get_raw_connection()).driver_connection)
+            await driver_connection.copy_records_to_table(
+                'import_users',
+                records=chunk.users,
+                columns=['id', 'username', 'email', 'hashed_password', 'is_superuser'],
+            )
+            if chunk.user_roles:
+                await driver_connection.copy_records_to_table(
+                    'import_user_roles', records=chunk.user_roles, columns=['user_id', 'role_title']
+                )
+            if chunk.socials:
+                await driver_connection.copy_records_to_table(
+                    'import_socials', records=chunk.socials, columns=['user_id', 'social_name', 'social_id']
+                )
+
+            users = (await conn.execute(text(INSERT_USERS))).rowcount
+            user_roles = (await conn.execute(text(INSERT_USER_ROLES))).rowcount if chunk.user_roles else 0
+            socials = (await conn.execute(text(INSERT_SOCIALS))).rowcount if chunk.socials else 0
+
+        return ImportChunkResultSchema(users=users, user_roles=user_roles, socials=socials)
+
+
+user_import_repository = UserImportRepository()
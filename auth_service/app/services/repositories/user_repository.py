@@ -1,74 +1,185 @@
+import functools
+from typing import AsyncIterator, cast
 from uuid import UUID
 
-from email_validator import EmailNotValidError, validate_email
-from pydantic import EmailStr
+from sqlalchemy import func, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute, load_only
 
-from app.db.postgres.models.users import UserModel
+from app.db.postgres import base
+from app.db.postgres.models.users import RoleModel, SocialAccount, UserModel
+from app.exceptions import UserAlreadyExistsError
 from app.schemas.services.auth.user_service_schemas import UserCreateSchema
-from app.schemas.services.repositories.user_repository_schemas import UserDBSchema
+from app.schemas.services.repositories.user_repository_schemas import (
+    UserDBSchema,
+    UserExportSchema,
+    UserListFiltersSchema,
+    UserProfileDBSchema,
+    UserProjection,
+    UserWithHistoryDBSchema,
+)
 from app.services.repositories.postgres_repository import (
     PostgresRepository,
     postgres_repository,
 )
+from app.services.utils.permissions_version import permissions_version_service
+from app.services.utils.principal_cache import principal_cache
+from app.utils.login_classifier import LoginKind, classify_login, normalize_email
+
+# Для каждой проекции: какие колонки читаем, какие связи подгружаем и какой схемой валидируем
+USER_PROJECTIONS: dict[
+    UserProjection, tuple[list[QueryableAttribute], list[QueryableAttribute], type[UserProfileDBSchema]]
+] = {
+    UserProjection.AUTH: (
+        [UserModel.id, UserModel.username, UserModel.email, UserModel.hashed_password, UserModel.is_superuser],
+        [UserModel.roles],
+        UserDBSchema,
+    ),
+    UserProjection.PROFILE: (
+        [UserModel.id, UserModel.username, UserModel.email, UserModel.is_superuser],
+        [UserModel.roles],
+        UserProfileDBSchema,
+    ),
+    UserProjection.HISTORY: (
+        [UserModel.id, UserModel.username, UserModel.email, UserModel.hashed_password, UserModel.is_superuser],
+        [UserModel.roles, UserModel.history],
+        UserWithHistoryDBSchema,
+    ),
+}
+
+USER_EXPORT_COLUMNS = [UserModel.id, UserModel.username, UserModel.email, UserModel.is_superuser, UserModel.created_at]
 
 
 class UserRepository:
     def __init__(self):
         self.db: PostgresRepository = postgres_repository
 
-    async def get_user_by_login(self, login: str) -> UserDBSchema | None:
-        user = None
-        try:
-            validate_email(login)
-            user = await self._get_user_by_email(login)
-        except EmailNotValidError:
-            pass
-
-        return user or await self._get_user_by_username(login)
-
-    async def get_user_by_credentials(self, email: EmailStr, username: str) -> UserDBSchema | None:
-        if user := await self._get_user_by_email(email=email):
-            return user
-        if user := await self._get_user_by_username(username=username):
-            return user
-
-        return None
-
-    async def _get_user_by_email(self, email: EmailStr, *, session: AsyncSession | None = None) -> UserDBSchema | None:
+    async def _get_user(
+        self,
+        where_value: list[tuple[QueryableAttribute, object]] | None,
+        projection: UserProjection = UserProjection.AUTH,
+        *,
+        session: AsyncSession | None = None,
+        **kwargs,
+    ) -> UserProfileDBSchema | None:
+        load_columns, select_in_load, schema = USER_PROJECTIONS[projection]
         db_user = await self.db.get_one_obj(
             UserModel,
-            where_value=[(UserModel.email, email)],
-            select_in_load=[UserModel.roles, UserModel.history],
+            where_value=where_value,
+            load_columns=load_columns,
+            select_in_load=select_in_load,
             session=session,
+            **kwargs,
         )
-        return UserDBSchema.model_validate(db_user) if db_user else None
+        return schema.model_validate(db_user) if db_user else None
 
-    async def _get_user_by_username(self, username: str, *, session: AsyncSession | None = None) -> UserDBSchema | None:
-        db_user = await self.db.get_one_obj(
-            UserModel,
-            where_value=[(UserModel.username, username)],
-            select_in_load=[UserModel.roles, UserModel.history],
-            session=session,
+    async def get_user_by_login(
+        self, login: str, projection: UserProjection = UserProjection.AUTH
+    ) -> UserDBSchema | UserProfileDBSchema | None:
+        """Один запрос: для логина в форме email - WHERE lower(email) = :email OR username = :login."""
+        if classify_login(login) == LoginKind.USERNAME:
+            return await self._get_user([(UserModel.username, login)], projection)
+
+        email_matches = func.lower(UserModel.email) == normalize_email(login)
+        # Если логин - email одного пользователя и username другого, побеждает email
+        return await self._get_user(
+            None,
+            projection,
+            filters=[or_(email_matches, UserModel.username == login)],
+            order_by=[email_matches.desc()],
+            limit=1,
+        )
+
+    async def get_by_social_account(self, social_name: str, social_id: str) -> UserProfileDBSchema | None:
+        """Пользователь по ключу (social_name, social_id) ограничения social_pk, без хеша пароля и истории."""
+        return await self._get_user(
+            None,
+            UserProjection.PROFILE,
+            filters=[
+                UserModel.id == SocialAccount.user_id,
+                SocialAccount.social_name == social_name,
+                SocialAccount.social_id == social_id,
+            ],
         )
-        return UserDBSchema.model_validate(db_user) if db_user else None
 
-    async def get(self, user_id: UUID) -> UserDBSchema | None:
+    async def get_taken_field(self, email: str, username: str) -> str | None:
+        """Одним запросом: занят ли email (без учёта регистра) или username. Email проверяется первым."""
+        email_matches = func.lower(UserModel.email) == normalize_email(email)
         db_user = await self.db.get_one_obj(
             UserModel,
-            where_value=[(UserModel.id, user_id)],
-            select_in_load=[UserModel.roles, UserModel.history],
+            load_columns=[UserModel.email, UserModel.username],
+            filters=[or_(email_matches, UserModel.username == username)],
+            order_by=[email_matches.desc()],
+            limit=1,
         )
-        return UserDBSchema.model_validate(db_user) if db_user else None
+        if db_user is None:
+            return None
+        return 'email' if normalize_email(db_user.email) == normalize_email(email) else 'username'
+
+    async def get(
+        self, user_id: UUID, projection: UserProjection = UserProjection.AUTH
+    ) -> UserDBSchema | UserProfileDBSchema | None:
+        return await self._get_user([(UserModel.id, user_id)], projection)
+
+    async def get_with_history(self, user_id: UUID) -> UserWithHistoryDBSchema | None:
+        # Проекция HISTORY всегда валидируется схемой UserWithHistoryDBSchema
+        return cast(UserWithHistoryDBSchema | None, await self.get(user_id, projection=UserProjection.HISTORY))
+
+    async def exists(self, user_id: UUID) -> bool:
+        return await self.db.get_one_obj(UserModel.id, where_value=[(UserModel.id, user_id)]) is not None
+
+    async def get_existing_ids(self, user_ids: set[UUID]) -> set[UUID]:
+        return set(await self.db.get_all_obj(UserModel.id, filters=[UserModel.id.in_(user_ids)]))
+
+    async def stream(self, filters: UserListFiltersSchema, batch_size: int) -> AsyncIterator[UserExportSchema]:
+        """
+        Отдаёт пользователей через серверный курсор: в памяти одновременно не больше batch_size строк.
+        Порядок по первичному ключу читается индексом, без сортировки всей таблицы.
+        """
+        query = (
+            select(UserModel)
+            .options(load_only(*USER_EXPORT_COLUMNS))
+            .order_by(UserModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if filters.superusers_only:
+            query = query.where(UserModel.is_superuser.is_(True))
+        if filters.role:
+            query = query.where(UserModel.roles.any(RoleModel.title == filters.role))
+        if filters.created_after:
+            query = query.where(UserModel.created_at >= filters.created_after)
+
+        engine = base.get_read_engine(base.get_entity_tables(UserModel, [UserModel.roles]))
+        async with AsyncSession(bind=engine) as session:
+            async for user in await session.stream_scalars(query):
+                yield UserExportSchema.model_validate(user)
 
     async def create(self, user_data: UserCreateSchema) -> UserDBSchema:
-        user_model = UserModel(**user_data.model_dump())
-        await self.db.create_obj(user_model)
-        return await self.get(user_model.id)
+        load_columns, _, _ = USER_PROJECTIONS[UserProjection.AUTH]
+        try:
+            async with base.savepoint():
+                # Конфликт по уникальному индексу lower(email): email уникален без учёта регистра
+                db_user = await self.db.create_obj_ignore_conflicts(
+                    UserModel,
+                    user_data.model_dump(),
+                    returning=load_columns,
+                    index_elements=[func.lower(UserModel.email)],
+                )
+        except IntegrityError:
+            # Username заняли между проверкой и вставкой
+            raise UserAlreadyExistsError(field='username')
+        if db_user is None:
+            raise UserAlreadyExistsError(field='email')
+        return UserDBSchema.model_validate(db_user)
 
-    async def update(self, user_id: UUID, data: dict) -> UserDBSchema | None:
+    async def update(self, user_id: UUID, data: dict) -> UserProfileDBSchema | None:
         await self.db.update_obj(UserModel, where_value=[(UserModel.id, user_id)], update_values=data)
-        return await self.get(user_id)
+        if 'is_superuser' in data:
+            await base.after_commit(functools.partial(permissions_version_service.bump, user_id))
+        else:
+            await base.after_commit(functools.partial(principal_cache.invalidate_user, user_id))
+        return await self.get(user_id, projection=UserProjection.PROFILE)
 
 
 user_repository = UserRepository()
@@ -1,14 +1,18 @@
+import functools
 from uuid import UUID
 
+from sqlalchemy import tuple_
 from sqlalchemy.exc import IntegrityError
 
 from app.core.logs import logger
+from app.db.postgres.base import after_commit
 from app.db.postgres.models.users import UserRoleAssociationModel
 from app.exceptions import RoleAlreadyAssignedError, RoleNotAssignedError
 from app.services.repositories.postgres_repository import (
     PostgresRepository,
     postgres_repository,
 )
+from app.services.utils.permissions_version import permissions_version_service
 
 
 class UserRoleRepository:
@@ -19,6 +23,7 @@ class UserRoleRepository:
         try:
             user_role = UserRoleAssociationModel(user_id=user_id, role_id=role_id)
             await self.db.create_obj(user_role)
+            await after_commit(functools.partial(permissions_version_service.bump, user_id))
         except IntegrityError as err:
             logger.error('user_id=%s already exist role_id=%s. Error=%s', user_id, role_id, err)
             raise RoleAlreadyAssignedError
@@ -34,6 +39,27 @@ class UserRoleRepository:
             UserRoleAssociationModel,
             where_value=[(UserRoleAssociationModel.user_id, user_id), (UserRoleAssociationModel.role_id, role_id)],
         )
+        await after_commit(functools.partial(permissions_version_service.bump, user_id))
+
+    async def assign_many(self, pairs: list[tuple[UUID, UUID]]) -> int:
+        """Назначает роли одним INSERT, уже назначенные пропускаются. Возвращает число новых назначений."""
+        user_ids = await self.db.create_many_obj_ignore_conflicts(
+            UserRoleAssociationModel,
+            [{'user_id': user_id, 'role_id': role_id} for user_id, role_id in pairs],
+            returning=[UserRoleAssociationModel.user_id],
+        )
+        await after_commit(functools.partial(permissions_version_service.bump, *set(user_ids)))
+        return len(user_ids)
+
+    async def revoke_many(self, pairs: list[tuple[UUID, UUID]]) -> int:
+        """Отзывает роли одним DELETE, неназначенные пропускаются. Возвращает число отозванных назначений."""
+        user_ids = await self.db.delete_obj(
+            UserRoleAssociationModel,
+            filters=[tuple_(UserRoleAssociationModel.user_id, UserRoleAssociationModel.role_id).in_(pairs)],
+            returning=[UserRoleAssociationModel.user_id],
+        )
+        await after_commit(functools.partial(permissions_version_service.bump, *set(user_ids)))
+        return len(user_ids)
 
 
 user_role_repository = UserRoleRepository()
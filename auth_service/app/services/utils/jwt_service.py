@@ -1,21 +1,65 @@
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from jwt import InvalidTokenError
+from jwt.algorithms import get_default_algorithms
 
 from app.core.config import app_settings
 
 
 class JWTService:
     def __init__(self):
-        self.key = app_settings.JWT_SECRET_KEY.get_secret_value()
         self.algorithm = app_settings.JWT_ALGORITHM
         self.access_expire_time = app_settings.JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS
         self.refresh_expire_time = app_settings.JWT_REFRESH_TOKEN_EXPIRE_TIME_SECONDS
+        self.is_symmetric = self.algorithm.startswith('HS')
+
+        self.key = app_settings.JWT_SECRET_KEY.get_secret_value()
+        self.active_kid: str | None = None
+        self.private_keys: dict = {}
+        self.public_keys: dict = {}
+        if not self.is_symmetric:
+            self._load_keys(app_settings.JWT_KEYS_DIR, app_settings.JWT_ACTIVE_KID)
+
+    def _load_keys(self, keys_dir: Path | None, active_kid: str | None) -> None:
+        """
+        Загружает все ключи <kid>.pem из каталога. Подписываем активным ключом, проверяем любым из загруженных:
+        для ротации кладём новый ключ, переключаем JWT_ACTIVE_KID и удаляем старый после жизни refresh-токена.
+        """
+        if not keys_dir or not active_kid:
+            raise ValueError(f'JWT_KEYS_DIR and JWT_ACTIVE_KID are required for {self.algorithm}')
+
+        for key_path in sorted(keys_dir.glob('*.pem')):
+            private_key = load_pem_private_key(key_path.read_bytes(), password=None)
+            self.private_keys[key_path.stem] = private_key
+            self.public_keys[key_path.stem] = private_key.public_key()
+
+        if active_kid not in self.private_keys:
+            raise ValueError(f'Signing key {active_kid} not found in {keys_dir}')
+        self.active_kid = active_kid
+
+    def _get_verification_key(self, token: str):
+        if self.is_symmetric:
+            return self.key
+
+        kid = jwt.get_unverified_header(token).get('kid')
+        if not (public_key := self.public_keys.get(kid)):
+            raise InvalidTokenError(f'Unknown kid {kid}')
+        return public_key
 
     def _create_token(self, payload: dict, expire_time: datetime) -> str:
         payload |= {'exp': expire_time}
-        return jwt.encode(payload=payload, key=self.key, algorithm=self.algorithm)
+        if self.is_symmetric:
+            return jwt.encode(payload=payload, key=self.key, algorithm=self.algorithm)
+
+        return jwt.encode(
+            payload=payload,
+            key=self.private_keys[self.active_kid],
+            algorithm=self.algorithm,
+            headers={'kid': self.active_kid},
+        )
 
     def create_access_token(self, payload: dict, base_expire_time: datetime) -> str:
         return self._create_token(
@@ -34,7 +78,7 @@ class JWTService:
         try:
             return jwt.decode(
                 jwt=token,
-                key=self.key,
+                key=self._get_verification_key(token),
                 algorithms=[self.algorithm],
                 require=['exp'],
                 options={'verify_exp': verify_exp},
@@ -42,5 +86,14 @@ class JWTService:
         except InvalidTokenError as err:
             raise err
 
+    def get_jwks(self) -> dict:
+        """Публичные ключи в формате JWK Set. Для симметричного алгоритма список пуст."""
+        algorithm = get_default_algorithms()[self.algorithm]
+        keys = []
+        for kid, public_key in self.public_keys.items():
+            jwk = algorithm.to_jwk(public_key, as_dict=True)
+            keys.append(jwk | {'kid': kid, 'use': 'sig', 'alg': self.algorithm})
+        return {'keys': keys}
+
 
 jwt_service = JWTService()
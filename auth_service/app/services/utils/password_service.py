@@ -1,6 +1,16 @@
+import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 from argon2 import PasswordHasher
 from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
 
+from app.core.config import app_settings
+from app.exceptions import PasswordServiceOverloadedError
+from app.schemas.services.utils.hash_service_schemas import PasswordPoolMetrics
+
+T = TypeVar('T')
+
 
 class PasswordService:
     def __init__(self):
@@ -17,3 +27,86 @@ class PasswordService:
 
 
 password_service = PasswordService()
+
+
+# Функции уровня модуля, чтобы их можно было передать в ProcessPoolExecutor (pickle)
+def _hash_password(password: str) -> str:
+    return password_service.hash_password(password)
+
+
+def _verify_password(hashed_password: str, password: str) -> bool:
+    return password_service.verify_password(hashed_password, password)
+
+
+class AsyncPasswordService:
+    """Выполняет argon2 в отдельном пуле, чтобы не блокировать событийный цикл."""
+
+    def __init__(self, executor_type: str, max_workers: int, max_pending: int):
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='argon2')
+        return self._executor
+
+    def _finish(self, future: Future) -> None:
+        self._pending -= 1
+        # Ошибки воркера и снятые с очереди задачи не считаются выполненными
+        if future.cancelled() or future.exception() is not None:
+            self._failed += 1
+        else:
+            self._completed += 1
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        # Не ставим в очередь больше max_pending задач: лучше быстро отказать, чем копить логины
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise PasswordServiceOverloadedError
+
+        # Задача считается ожидающей, пока её не завершит пул, а не пока её ждут: отменённое ожидание
+        # снимает с очереди только ещё не начатую задачу, начатая досчитывается в пуле
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        future = self._get_executor().submit(func, *args)
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(self._finish, done))
+        return await asyncio.wrap_future(future)
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(_hash_password, password)
+
+    async def verify_password(self, hashed_password: str, password: str) -> bool:
+        return await self._run(_verify_password, hashed_password, password)
+
+    def get_metrics(self) -> PasswordPoolMetrics:
+        return PasswordPoolMetrics(
+            executor=self.executor_type,
+            max_workers=self.max_workers,
+            max_pending=self.max_pending,
+            pending=self._pending,
+            queue_depth=max(self._pending - self.max_workers, 0),
+            completed=self._completed,
+            failed=self._failed,
+            rejected=self._rejected,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+async_password_service = AsyncPasswordService(
+    executor_type=app_settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=app_settings.PASSWORD_HASH_MAX_WORKERS,
+    max_pending=app_settings.PASSWORD_HASH_MAX_PENDING,
+)
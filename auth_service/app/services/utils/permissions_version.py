@@ -0,0 +1,26 @@
+import uuid
+
+from app.db.redis.redis_repo import RedisRepository, redis_repo
+from app.services.utils.principal_cache import PrincipalCache, principal_cache
+
+
+class PermissionsVersionService:
+    """
+    Счётчик версии прав пользователя в Редисе. Версия попадает в access-токен и увеличивается при изменении
+    is_superuser или ролей: токен со старой версией больше не подходит для авторизации без обращения к БД.
+    """
+
+    def __init__(self, redis: RedisRepository, cache: PrincipalCache):
+        self.redis_repo = redis
+        self.principal_cache = cache
+
+    async def get(self, user_id: uuid.UUID) -> int:
+        return await self.redis_repo.get_permissions_version(user_id)
+
+    async def bump(self, *user_ids: uuid.UUID) -> None:
+        for user_id in user_ids:
+            self.principal_cache.invalidate_user(user_id)
+        await self.redis_repo.incr_permissions_versions(list(user_ids))
+
+
+permissions_version_service = PermissionsVersionService(redis_repo, principal_cache)
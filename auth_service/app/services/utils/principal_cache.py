@@ -0,0 +1,82 @@
+import time
+import uuid
+from collections import OrderedDict
+
+from app.core.config import app_settings
+from app.schemas.services.auth.user_service_schemas import PrincipalSchema
+from app.schemas.services.utils.principal_cache_schemas import PrincipalCacheStats
+
+
+class PrincipalCache:
+    """
+    LRU-кеш принципалов по логину с коротким TTL. Сбрасывается при изменении пользователя или его ролей
+    в этом воркере, в остальных воркерах устаревшая запись живёт не дольше ttl.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[PrincipalSchema, float]] = OrderedDict()
+        self._user_index: dict[uuid.UUID, set[str]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _pop(self, login: str) -> None:
+        principal, _ = self._entries.pop(login)
+        if (logins := self._user_index.get(principal.id)) is not None:
+            logins.discard(login)
+            if not logins:
+                del self._user_index[principal.id]
+
+    def get(self, login: str) -> PrincipalSchema | None:
+        if (entry := self._entries.get(login)) is None:
+            self._misses += 1
+            return None
+
+        principal, expire_at = entry
+        if expire_at <= time.monotonic():
+            self._pop(login)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(login)
+        self._hits += 1
+        return principal
+
+    def set(self, login: str, principal: PrincipalSchema) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+
+        if login in self._entries:
+            self._pop(login)
+        while len(self._entries) >= self.max_size:
+            self._pop(next(iter(self._entries)))
+
+        self._entries[login] = (principal, time.monotonic() + self.ttl)
+        self._user_index.setdefault(principal.id, set()).add(login)
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        for login in self._user_index.pop(user_id, set()):
+            self._entries.pop(login, None)
+        self._invalidations += 1
+
+    def clear(self) -> None:
+        """Сброс всего кеша: изменение самой роли затрагивает всех её владельцев."""
+        self._entries.clear()
+        self._user_index.clear()
+        self._invalidations += 1
+
+    def get_stats(self) -> PrincipalCacheStats:
+        return PrincipalCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+            size=len(self._entries),
+            max_size=self.max_size,
+        )
+
+
+principal_cache = PrincipalCache(
+    ttl=app_settings.PRINCIPAL_CACHE_TTL_SECONDS, max_size=app_settings.PRINCIPAL_CACHE_MAX_SIZE
+)
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import app_settings
+from app.core.logs import logger
+from app.db.redis.base import redis_client
+
+
+class RevocationList:
+    """
+    Отозванные сессии, access-токены которых ещё не истекли. В Редисе хранятся в sorted set (score - момент
+    истечения последнего access-токена сессии), каждый воркер держит копию в памяти и узнаёт о новых отзывах
+    через pub/sub, поэтому проверка токена не ходит в Редис.
+    """
+
+    KEY = 'revoked_sessions'
+    CHANNEL = 'revoked_sessions'
+    RECONNECT_DELAY_SECONDS = 1
+
+    def __init__(self, redis: Redis, max_ttl: int):
+        self.redis = redis
+        self.max_ttl = max_ttl
+        self._revoked: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def is_revoked(self, session_id: str) -> bool:
+        if (expire_at := self._revoked.get(session_id)) is None:
+            return False
+        if expire_at <= time.time():
+            self._revoked.pop(session_id, None)
+            return False
+        return True
+
+    def _add(self, revoked: dict[str, float]) -> None:
+        now = time.time()
+        self._revoked = {
+            session_id: expire_at for session_id, expire_at in (self._revoked | revoked).items() if expire_at > now
+        }
+
+    async def revoke(self, revoked: dict[str, float]) -> None:
+        """Отзывает сессии: {session_id: момент истечения access-токена сессии}."""
+        now = time.time()
+        if not (revoked := {session_id: expire_at for session_id, expire_at in revoked.items() if expire_at > now}):
+            return
+
+        self._add(revoked)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zadd(self.KEY, {session_id: expire_at for session_id, expire_at in revoked.items()})
+                pipe.zremrangebyscore(self.KEY, '-inf', now)
+                pipe.expire(self.KEY, self.max_ttl)
+                pipe.publish(self.CHANNEL, json.dumps(revoked))
+                await pipe.execute()
+        except RedisError as err:
+            logger.error('Can not publish revoked sessions: %s', err)
+
+    async def load(self) -> None:
+        revoked = await self.redis.zrangebyscore(self.KEY, time.time(), '+inf', withscores=True)
+        self._add({session_id.decode(): expire_at for session_id, expire_at in revoked})
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    # Пока подписки не было, отзывы могли потеряться
+                    await self.load()
+                    async for message in pubsub.listen():
+                        if message['type'] == 'message':
+                            self._add(json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                logger.error('Revocation list subscription failed: %s', err)
+                await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+    async def start(self) -> None:
+        try:
+            await self.load()
+        except Exception as err:
+            logger.error('Can not load revoked sessions: %s', err)
+        self._task = asyncio.create_task(self._listen(), name='revocation_list')
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+revocation_list = RevocationList(redis_client, max_ttl=app_settings.JWT_ACCESS_TOKEN_EXPIRE_TIME_SECONDS)
@@ -0,0 +1,76 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from app.core.config import app_settings
+from app.schemas.services.utils.jwt_service_schemas import TokenCacheStats
+
+
+class TokenCache:
+    """LRU-кеш проверенных payload токенов, запись живёт до истечения exp токена."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self._session_index: dict[str, set[bytes]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _build_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _pop(self, key: bytes) -> None:
+        payload, _ = self._entries.pop(key)
+        if (session_id := payload.get('session_id')) and (keys := self._session_index.get(session_id)):
+            keys.discard(key)
+            if not keys:
+                del self._session_index[session_id]
+
+    def get(self, token: str) -> dict | None:
+        key = self._build_key(token)
+        if (entry := self._entries.get(key)) is None:
+            self._misses += 1
+            return None
+
+        payload, expire_at = entry
+        if expire_at <= time.time():
+            self._pop(key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        if self.max_size <= 0 or not (expire_at := payload.get('exp')):
+            return
+
+        key = self._build_key(token)
+        if key in self._entries:
+            self._pop(key)
+        while len(self._entries) >= self.max_size:
+            self._pop(next(iter(self._entries)))
+            self._evictions += 1
+
+        self._entries[key] = (payload, float(expire_at))
+        if session_id := payload.get('session_id'):
+            self._session_index.setdefault(session_id, set()).add(key)
+
+    def invalidate_session(self, session_id: str) -> None:
+        for key in self._session_index.pop(str(session_id), set()):
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> TokenCacheStats:
+        return TokenCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+            max_size=self.max_size,
+        )
+
+
+token_cache = TokenCache(max_size=app_settings.TOKEN_CACHE_MAX_SIZE)
@@ -0,0 +1,29 @@
+from enum import StrEnum
+
+
+class LoginKind(StrEnum):
+    EMAIL = 'email'
+    USERNAME = 'username'
+
+
+def classify_login(login: str) -> LoginKind:
+    """
+    Офлайн-классификация логина по форме: local@domain.tld без пробелов. Это не валидация email
+    (она выполняется при регистрации), поэтому без DNS и полного разбора по RFC.
+    """
+    local_part, at, domain = login.rpartition('@')
+    if (
+        not at
+        or not local_part
+        or '.' not in domain
+        or domain.startswith('.')
+        or domain.endswith('.')
+        or any(char.isspace() for char in login)
+    ):
+        return LoginKind.USERNAME
+    return LoginKind.EMAIL
+
+
+def normalize_email(email: str) -> str:
+    """Email сравниваем без учёта регистра, по функциональному индексу lower(email)."""
+    return email.lower()
@@ -0,0 +1,29 @@
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from typing import TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.exceptions import InvalidCursorError
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class HistoryCursor(BaseModel):
+    auth_date: datetime.datetime
+    id: uuid.UUID
+
+
+def encode_cursor(cursor: BaseModel) -> str:
+    return base64.urlsafe_b64encode(cursor.model_dump_json().encode()).decode().rstrip('=')
+
+
+def decode_cursor(value: str, schema: type[T]) -> T:
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+        return schema.model_validate(json.loads(raw))
+    except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+        raise InvalidCursorError
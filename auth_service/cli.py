@@ -3,31 +3,73 @@
 """
 
 import asyncio
+import csv
+import datetime
+import sys
+from pathlib import Path
+from typing import AsyncIterator, TextIO
 
 import typer
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 from pydantic import EmailStr, validate_email
 from rich.console import Console
 from rich.table import Table
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.postgres.base import async_engine
-from app.db.postgres.models.users import UserModel
+from app.core.config import app_settings
+from app.db.postgres.base import unit_of_work
+from app.db.postgres.partitions import RetentionMode, history_partition_manager
+from app.db.redis.redis_repo import redis_repo
 from app.exceptions import UserAlreadyExistsError
 from app.schemas.api.v1.auth_schemas import CreateUserCredentialsSchema
+from app.schemas.services.auth.user_import_service_schemas import (
+    ImportFormat,
+    UserImportReportSchema,
+)
+from app.schemas.services.repositories.user_repository_schemas import (
+    UserExportFormat,
+    UserExportSchema,
+    UserListFiltersSchema,
+)
 from app.services.auth.registration_service import RegistrationService
+from app.services.auth.user_import_service import UserImportService
+from app.services.repositories.user_import_repository import user_import_repository
 from app.services.repositories.user_repository import user_repository
 
 cli_app = typer.Typer()
 
+IMPORT_FORMAT_SUFFIXES = {'.csv': ImportFormat.CSV, '.ndjson': ImportFormat.NDJSON, '.jsonl': ImportFormat.NDJSON}
+
 
 def _get_valid_email(value: str) -> EmailStr:
     return validate_email(value)[1]
 
 
 @cli_app.command()
-def list_users():
-    asyncio.run(_list_users())
+def list_users(
+    superusers_only: bool = False,
+    role: str | None = None,
+    created_after: datetime.datetime | None = None,
+    export_format: UserExportFormat = typer.Option(UserExportFormat.TABLE, '--format'),
+    page_size: int = 50,
+):
+    """Выводит пользователей постранично: в памяти держится только текущая страница."""
+    filters = UserListFiltersSchema(superusers_only=superusers_only, role=role, created_after=created_after)
+    asyncio.run(_export_users(filters, export_format, page_size, output=None))
+
+
+@cli_app.command()
+def export_users(
+    output: Path | None = typer.Option(None, help='По умолчанию - stdout'),
+    superusers_only: bool = False,
+    role: str | None = None,
+    created_after: datetime.datetime | None = None,
+    export_format: UserExportFormat = typer.Option(UserExportFormat.NDJSON, '--format'),
+    batch_size: int = 1000,
+):
+    """Выгружает пользователей в CSV или NDJSON потоково, через серверный курсор."""
+    filters = UserListFiltersSchema(superusers_only=superusers_only, role=role, created_after=created_after)
+    asyncio.run(_export_users(filters, export_format, batch_size, output))
 
 
 @cli_app.command()
@@ -35,20 +77,178 @@ def create_user():
     asyncio.run(_create_user())
 
 
-async def _list_users():
-    async with AsyncSession(bind=async_engine) as session:
-        console = Console()
-        user_table = Table('', 'id', 'username', 'email', 'is_superuser')
-        users = (await session.execute(select(UserModel))).scalars().all()
-        for num, user in enumerate(users, start=1):
-            user_table.add_row(
-                str(num),
-                str(user.id),
-                user.username,
-                user.email,
-                str(user.is_superuser),
-            )
-        console.print(user_table)
+@cli_app.command()
+def import_users(
+    path: Path,
+    import_format: ImportFormat | None = typer.Option(None, '--format', help='По умолчанию - по расширению файла'),
+    chunk_size: int = app_settings.USER_IMPORT_CHUNK_SIZE,
+    hash_workers: int = app_settings.PASSWORD_HASH_MAX_WORKERS,
+    checkpoint: Path | None = typer.Option(None, help='По умолчанию - <path>.checkpoint рядом с файлом'),
+):
+    """
+    Импортирует пользователей из CSV или NDJSON (username, email, password или hashed_password, is_superuser,
+    roles, socials). Повторный запуск продолжает импорт с последней закоммиченной пачки.
+    """
+    if not (import_format := import_format or IMPORT_FORMAT_SUFFIXES.get(path.suffix.lower())):
+        raise typer.BadParameter(f'Can not detect format of {path.name}, pass --format')
+    checkpoint = checkpoint or path.with_name(f'{path.name}.checkpoint')
+    asyncio.run(_import_users(path, import_format, chunk_size, hash_workers, checkpoint))
+
+
+@cli_app.command()
+def manage_history_partitions(
+    months_ahead: int = app_settings.HISTORY_PARTITIONS_MONTHS_AHEAD,
+    retention_months: int | None = app_settings.HISTORY_PARTITIONS_RETENTION_MONTHS,
+    retention_mode: RetentionMode = RetentionMode(app_settings.HISTORY_PARTITIONS_RETENTION_MODE),
+):
+    """Создаёт партиции истории входов вперёд и отсоединяет/удаляет партиции старше срока хранения."""
+    asyncio.run(_manage_history_partitions(months_ahead, retention_months, retention_mode))
+
+
+@cli_app.command()
+def migrate_sessions(batch_size: int = 1000):
+    """Переводит сессии Редиса из строковых ключей session:{uuid} в компактные хеши."""
+    asyncio.run(_migrate_sessions(batch_size))
+
+
+@cli_app.command()
+def session_memory_report(sample_size: int = 1000):
+    """Показывает средний размер ключей сессий в Редисе по выборке."""
+    asyncio.run(_session_memory_report(sample_size))
+
+
+@cli_app.command()
+def generate_jwt_key(kid: str, algorithm: str = app_settings.JWT_ALGORITHM, keys_dir: Path | None = None):
+    """Создаёт приватный ключ <kid>.pem для RS256/EdDSA в JWT_KEYS_DIR."""
+    keys_dir = keys_dir or app_settings.JWT_KEYS_DIR
+    if not keys_dir:
+        raise typer.BadParameter('JWT_KEYS_DIR is not set, pass --keys-dir')
+
+    private_key: ed25519.Ed25519PrivateKey | rsa.RSAPrivateKey
+    if algorithm == 'EdDSA':
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    elif algorithm.startswith(('RS', 'PS')):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        raise typer.BadParameter(f'Algorithm {algorithm} does not use key pairs')
+
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    key_path = keys_dir / f'{kid}.pem'
+    key_path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    key_path.chmod(0o600)
+    print(f'Key {kid} saved to {key_path}. Set JWT_ACTIVE_KID={kid} to sign new tokens with it.')
+
+
+def _print_users_page(console: Console, users: list[UserExportSchema], first_num: int) -> None:
+    user_table = Table('', 'id', 'username', 'email', 'is_superuser', 'created_at')
+    for num, user in enumerate(users, start=first_num):
+        user_table.add_row(
+            str(num),
+            str(user.id),
+            user.username,
+            user.email,
+            str(user.is_superuser),
+            user.created_at.isoformat(timespec='seconds'),
+        )
+    console.print(user_table)
+
+
+async def _write_users(
+    users: AsyncIterator[UserExportSchema], export_format: UserExportFormat, page_size: int, file: TextIO
+) -> int:
+    count = 0
+    if export_format == UserExportFormat.TABLE:
+        console, page = Console(file=file), []
+        async for user in users:
+            page.append(user)
+            if len(page) == page_size:
+                _print_users_page(console, page, first_num=count + 1)
+                count, page = count + len(page), []
+        if page:
+            _print_users_page(console, page, first_num=count + 1)
+        return count + len(page)
+
+    if export_format == UserExportFormat.CSV:
+        writer = csv.DictWriter(file, fieldnames=list(UserExportSchema.model_fields))
+        writer.writeheader()
+        async for user in users:
+            writer.writerow(user.model_dump(mode='json'))
+            count += 1
+        return count
+
+    async for user in users:
+        file.write(user.model_dump_json() + '\n')
+        count += 1
+    return count
+
+
+async def _export_users(
+    filters: UserListFiltersSchema, export_format: UserExportFormat, batch_size: int, output: Path | None
+) -> None:
+    users = user_repository.stream(filters, batch_size)
+    if output is None:
+        await _write_users(users, export_format, batch_size, sys.stdout)
+        return
+
+    with output.open('w', newline='', encoding='utf-8') as file:
+        count = await _write_users(users, export_format, batch_size, file)
+    print(f'Exported {count} users to {output}')
+
+
+def _print_import_progress(report: UserImportReportSchema) -> None:
+    print(
+        f'Chunk {report.chunks}: processed {report.processed}, imported {report.imported}, '
+        f'{report.records_per_second:.0f} records/s'
+    )
+
+
+async def _import_users(
+    path: Path, import_format: ImportFormat, chunk_size: int, hash_workers: int, checkpoint: Path
+) -> None:
+    import_service = UserImportService(repository=user_import_repository, hash_workers=hash_workers)
+    report = await import_service.import_users(
+        path, import_format, chunk_size, checkpoint, on_progress=_print_import_progress
+    )
+
+    console = Console()
+    report_table = Table('processed', 'imported', 'skipped', 'invalid', 'hashed', 'roles', 'socials', 'records/s')
+    counters = (report.processed, report.imported, report.skipped, report.invalid, report.hashed)
+    report_table.add_row(
+        *map(str, counters), str(report.user_roles), str(report.socials), f'{report.records_per_second:.0f}'
+    )
+    console.print(report_table)
+    print(f'Import finished in {report.elapsed_seconds:.1f} s. Checkpoint: {checkpoint}')
+
+
+async def _manage_history_partitions(
+    months_ahead: int, retention_months: int | None, retention_mode: RetentionMode
+) -> None:
+    created = await history_partition_manager.ensure_partitions(months_ahead)
+    print(f'Created partitions: {", ".join(created) or "none"}')
+    if retention_months is not None:
+        removed = await history_partition_manager.apply_retention(retention_months, retention_mode)
+        print(f'Partitions {retention_mode}: {", ".join(removed) or "none"}')
+
+
+async def _migrate_sessions(batch_size: int) -> None:
+    migrated = await redis_repo.migrate_legacy_sessions(batch_size)
+    print(f'Migrated sessions: {migrated}')
+
+
+async def _session_memory_report(sample_size: int) -> None:
+    report = await redis_repo.get_memory_report(sample_size)
+    console = Console()
+    stats_table = Table('pattern', 'sampled keys', 'avg bytes')
+    for key_stats in report.key_stats:
+        stats_table.add_row(key_stats.pattern, str(key_stats.sampled_keys), f'{key_stats.avg_bytes:.1f}')
+    console.print(stats_table)
+    print(f'Redis used memory: {report.used_memory} bytes, keys: {report.total_keys}')
 
 
 async def _create_user():
@@ -61,8 +261,9 @@ async def _create_user():
     )
     is_superuser = typer.confirm('is_superuser')
     try:
-        user = await registration_service.create_user(user_credentials=user_credentials)
-        await user_repository.update(user_id=user.id, data={'is_superuser': is_superuser})
+        async with unit_of_work():
+            user = await registration_service.create_user(user_credentials=user_credentials)
+            await user_repository.update(user_id=user.id, data={'is_superuser': is_superuser})
         print(f'User {user.username=}, {user.email=}, {is_superuser=} successfully created.')
     except UserAlreadyExistsError:
         print('User already exists.')
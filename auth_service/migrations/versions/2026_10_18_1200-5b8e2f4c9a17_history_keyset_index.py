@@ -0,0 +1,31 @@
+"""history_keyset_index
+
+Revision ID: 5b8e2f4c9a17
+Revises: d1f73811ca78
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f4c9a17'
+down_revision: Union[str, None] = 'd1f73811ca78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Индекс на партиционированной таблице создаётся во всех партициях, включая будущие
+    op.create_index(
+        'history_user_id_auth_date_id_idx',
+        'history',
+        ['user_id', sa.text('auth_date DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('history_user_id_auth_date_id_idx', table_name='history')
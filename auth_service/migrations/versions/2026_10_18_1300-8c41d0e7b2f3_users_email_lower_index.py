@@ -0,0 +1,38 @@
+"""users_email_lower_index
+
+Revision ID: 8c41d0e7b2f3
+Revises: 5b8e2f4c9a17
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d0e7b2f3'
+down_revision: Union[str, None] = '5b8e2f4c9a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Логин по email ищется без учёта регистра: lower(email) = :email, поэтому email уникален без учёта регистра.
+    # Аккаунты, различающиеся только регистром email, нужно объединить вручную до миграции
+    duplicates = (
+        op.get_bind()
+        .execute(sa.text('SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10'))
+        .scalars()
+        .all()
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Users with case-insensitive duplicate emails must be merged before migration: ' + ', '.join(duplicates)
+        )
+    op.create_index('users_email_lower_idx', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('users_email_lower_idx', table_name='users')
@@ -0,0 +1,31 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+
+from app.main import app
+
+
+@pytest.mark.anyio
+class TestJWKS:
+    async def test_jwks_200(self, async_test_client: AsyncClient, mocker: MockerFixture, make_jwt_service):
+        # Arrange
+        service = make_jwt_service('RS256', ['first'], 'first')
+        mocker.patch('app.api.well_known_router.jwt_service', service)
+
+        # Act
+        response = await async_test_client.get(app.url_path_for('jwks'))
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['Cache-Control'].startswith('public, max-age=')
+        assert response.json() == service.get_jwks()
+        assert response.json()['keys'][0]['kty'] == 'RSA'
+
+    async def test_jwks_empty_for_symmetric_algorithm(self, async_test_client: AsyncClient):
+        # Act
+        response = await async_test_client.get(app.url_path_for('jwks'))
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'keys': []}
@@ -0,0 +1,59 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.exceptions import invalid_cursor_error
+from app.main import app
+from app.schemas.api.v1.auth_schemas import (
+    HistoryPageResponseSchema,
+    UserCredentialsSchema,
+)
+from app.schemas.services.auth.user_service_schemas import UserSchema
+
+
+@pytest.fixture
+async def access_token(async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema) -> str:
+    user_credentials = UserCredentialsSchema(login=registered_user.email, password=test_user_data['password'])
+    for _ in range(3):
+        response = await async_test_client.post(
+            app.url_path_for('api_v1_login'), json=user_credentials.model_dump(mode='json')
+        )
+    return response.json()['access_token']
+
+
+@pytest.mark.anyio
+class TestHistory:
+    async def test_history_pages_200(self, async_test_client: AsyncClient, access_token: str):
+        # Arrange
+        headers = {'Authorization': f'Bearer {access_token}'}
+        first_page_response = await async_test_client.get(
+            app.url_path_for('api_v1_get_history'), params={'limit': 2}, headers=headers
+        )
+        first_page = HistoryPageResponseSchema(**first_page_response.json())
+
+        # Act
+        response = await async_test_client.get(
+            app.url_path_for('api_v1_get_history'),
+            params={'limit': 2, 'cursor': first_page.next_cursor},
+            headers=headers,
+        )
+        second_page = HistoryPageResponseSchema(**response.json())
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert len(first_page.items) == 2
+        assert len(second_page.items) == 1
+        assert second_page.next_cursor is None
+        assert first_page.items[-1].auth_date >= second_page.items[0].auth_date
+
+    async def test_history_invalid_cursor_400(self, async_test_client: AsyncClient, access_token: str):
+        # Act
+        response = await async_test_client.get(
+            app.url_path_for('api_v1_get_history'),
+            params={'cursor': 'wrong_cursor'},
+            headers={'Authorization': f'Bearer {access_token}'},
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'detail': invalid_cursor_error.detail}
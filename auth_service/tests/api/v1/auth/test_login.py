@@ -4,8 +4,13 @@ from httpx import AsyncClient
 
 from app.exceptions import auth_error
 from app.main import app
-from app.schemas.api.v1.auth_schemas import TokenPairSchema, UserCredentialsSchema
+from app.schemas.api.v1.auth_schemas import (
+    ACCESS_CLAIMS_VERSION,
+    TokenPairSchema,
+    UserCredentialsSchema,
+)
 from app.schemas.services.auth.user_service_schemas import UserSchema
+from app.services.utils.jwt_service import jwt_service
 
 
 @pytest.mark.anyio
@@ -46,6 +51,25 @@ class TestLogin:
         assert response.status_code == status.HTTP_200_OK
         assert response_json == TokenPairSchema(**response_json).model_dump(mode='json')
 
+    async def test_login_access_token_claims(
+        self, async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema
+    ):
+        # Arrange
+        user_credentials = UserCredentialsSchema(login=registered_user.email, password=test_user_data['password'])
+
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('api_v1_login'), json=user_credentials.model_dump(mode='json')
+        )
+        token_payload = jwt_service.get_token_payload(response.json()['access_token'])
+
+        # Assert
+        assert token_payload['cv'] == ACCESS_CLAIMS_VERSION
+        assert token_payload['uid'] == str(registered_user.id)
+        assert token_payload['sup'] is False
+        assert token_payload['rid'] == []
+        assert isinstance(token_payload['pv'], int)
+
     async def test_login_by_username_401(
         self, async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema
     ):
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.main import app
+from app.schemas.api.v1.auth_schemas import TokenPairSchema, UserCredentialsSchema
+from app.schemas.services.auth.user_service_schemas import UserSchema
+
+
+@pytest.fixture
+async def token_pair(
+    async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema
+) -> TokenPairSchema:
+    user_credentials = UserCredentialsSchema(login=registered_user.email, password=test_user_data['password'])
+    response = await async_test_client.post(
+        app.url_path_for('api_v1_login'), json=user_credentials.model_dump(mode='json')
+    )
+    return TokenPairSchema(**response.json())
+
+
+async def refresh(async_test_client: AsyncClient, refresh_token: str):
+    return await async_test_client.post(
+        app.url_path_for('api_v1_refresh'), headers={'Authorization': f'Bearer {refresh_token}'}
+    )
+
+
+@pytest.mark.anyio
+class TestRefresh:
+    async def test_refresh_rotates_tokens_200(self, async_test_client: AsyncClient, token_pair: TokenPairSchema):
+        # Act
+        response = await refresh(async_test_client, token_pair.refresh_token)
+        new_token_pair = TokenPairSchema(**response.json())
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert new_token_pair.refresh_token != token_pair.refresh_token
+
+    async def test_refresh_reuse_revokes_family_401(self, async_test_client: AsyncClient, token_pair: TokenPairSchema):
+        # Arrange
+        new_token_pair = TokenPairSchema(**(await refresh(async_test_client, token_pair.refresh_token)).json())
+
+        # Act
+        reuse_response = await refresh(async_test_client, token_pair.refresh_token)
+        new_token_response = await refresh(async_test_client, new_token_pair.refresh_token)
+
+        # Assert
+        assert reuse_response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert new_token_response.status_code == status.HTTP_401_UNAUTHORIZED
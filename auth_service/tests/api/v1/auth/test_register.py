@@ -62,3 +62,18 @@ class TestRegister:
         # Assert
         assert response.status_code == status.HTTP_409_CONFLICT
         assert response_json == {'detail': user_already_exists_error.detail}
+
+    async def test_register_409_email_duplicate_case_insensitive(self, async_test_client: AsyncClient):
+        # Arrange
+        user_data = RegisterUserCredentialsSchema(
+            username='random_username', email='random@email.com', password='random_password'
+        )
+        user_data_json = user_data.model_dump(mode='json')
+        await async_test_client.post(app.url_path_for('api_v1_register'), json=user_data_json)
+        user_data_json |= {'username': 'another_username', 'email': 'Random@Email.com'}
+
+        # Act
+        response = await async_test_client.post(app.url_path_for('api_v1_register'), json=user_data_json)
+
+        # Assert
+        assert response.status_code == status.HTTP_409_CONFLICT
@@ -0,0 +1,57 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.main import app
+from app.schemas.api.v1.auth_schemas import (
+    LogoutAllResponseSchema,
+    SessionListResponseSchema,
+    TokenPairSchema,
+    UserCredentialsSchema,
+)
+from app.schemas.services.auth.user_service_schemas import UserSchema
+
+
+@pytest.fixture
+async def token_pairs(
+    async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema
+) -> list[TokenPairSchema]:
+    user_credentials = UserCredentialsSchema(login=registered_user.email, password=test_user_data['password'])
+    token_pairs = []
+    for _ in range(2):
+        response = await async_test_client.post(
+            app.url_path_for('api_v1_login'), json=user_credentials.model_dump(mode='json')
+        )
+        token_pairs.append(TokenPairSchema(**response.json()))
+    return token_pairs
+
+
+@pytest.mark.anyio
+class TestSessions:
+    async def test_sessions_list_200(self, async_test_client: AsyncClient, token_pairs: list[TokenPairSchema]):
+        # Act
+        response = await async_test_client.get(
+            app.url_path_for('api_v1_sessions'), headers={'Authorization': f'Bearer {token_pairs[-1].access_token}'}
+        )
+        sessions = SessionListResponseSchema(**response.json()).sessions
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert len(sessions) >= 2
+        assert len([session for session in sessions if session.current]) == 1
+
+    async def test_logout_all_revokes_refresh_tokens(
+        self, async_test_client: AsyncClient, token_pairs: list[TokenPairSchema]
+    ):
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('api_v1_logout_all'), headers={'Authorization': f'Bearer {token_pairs[-1].access_token}'}
+        )
+        refresh_response = await async_test_client.post(
+            app.url_path_for('api_v1_refresh'), headers={'Authorization': f'Bearer {token_pairs[0].refresh_token}'}
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert LogoutAllResponseSchema(**response.json()).revoked_sessions >= 2
+        assert refresh_response.status_code == status.HTTP_401_UNAUTHORIZED
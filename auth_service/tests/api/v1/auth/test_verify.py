@@ -0,0 +1,90 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.main import app
+from app.schemas.api.v1.auth_schemas import (
+    SessionStatus,
+    UserCredentialsSchema,
+    VerifyBatchResponseSchema,
+)
+from app.schemas.services.auth.user_service_schemas import UserSchema
+from app.services.utils.token_cache import token_cache
+
+
+@pytest.fixture
+async def access_token(async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema) -> str:
+    user_credentials = UserCredentialsSchema(login=registered_user.email, password=test_user_data['password'])
+    response = await async_test_client.post(
+        app.url_path_for('api_v1_login'), json=user_credentials.model_dump(mode='json')
+    )
+    return response.json()['access_token']
+
+
+@pytest.mark.anyio
+class TestVerifyAccessToken:
+    async def test_verify_access_token_200_and_cached(self, async_test_client: AsyncClient, access_token: str):
+        # Arrange
+        headers = {'Authorization': f'Bearer {access_token}'}
+        first_response = await async_test_client.post(app.url_path_for('api_v1_verify_access_token'), headers=headers)
+        stats = token_cache.get_stats()
+
+        # Act
+        response = await async_test_client.post(app.url_path_for('api_v1_verify_access_token'), headers=headers)
+
+        # Assert
+        assert first_response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_200_OK
+        # Повторная проверка не промахивается мимо кеша и не проверяет подпись заново
+        assert token_cache.get_stats().misses == stats.misses
+        assert token_cache.get_stats().hits > stats.hits
+
+    async def test_verify_after_logout_401(self, async_test_client: AsyncClient, access_token: str):
+        # Arrange
+        headers = {'Authorization': f'Bearer {access_token}'}
+        verify_response = await async_test_client.post(app.url_path_for('api_v1_verify_access_token'), headers=headers)
+        logout_response = await async_test_client.post(app.url_path_for('api_v1_logout'), headers=headers)
+
+        # Act
+        response = await async_test_client.post(app.url_path_for('api_v1_verify_access_token'), headers=headers)
+
+        # Assert
+        assert verify_response.status_code == status.HTTP_200_OK
+        assert logout_response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_verify_garbage_token_401(self, async_test_client: AsyncClient):
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('api_v1_verify_access_token'), headers={'Authorization': 'Bearer wrong_token'}
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+class TestVerifyBatch:
+    async def test_verify_batch_200(
+        self, async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema
+    ):
+        # Arrange
+        user_credentials = UserCredentialsSchema(login=registered_user.email, password=test_user_data['password'])
+        login_response = await async_test_client.post(
+            app.url_path_for('api_v1_login'), json=user_credentials.model_dump(mode='json')
+        )
+        access_token = login_response.json()['access_token']
+
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('api_v1_verify_batch'), json={'tokens': [access_token, 'wrong_token']}
+        )
+        results = VerifyBatchResponseSchema(**response.json()).results
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert results[0].valid is True
+        assert results[0].login == registered_user.email
+        assert results[0].session_status == SessionStatus.ACTIVE
+        assert results[1].valid is False
+        assert results[1].session_status is None
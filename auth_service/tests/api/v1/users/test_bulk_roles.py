@@ -0,0 +1,151 @@
+import uuid
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+
+from app.core.config import app_settings
+from app.exceptions import (
+    role_not_found_error,
+    user_not_found_error,
+    user_roles_batch_too_large_error,
+)
+from app.main import app
+from app.schemas.api.v1.auth_schemas import UserCredentialsSchema
+from app.schemas.services.auth.role_service_schemas import CreateRoleSchema, RoleSchema
+from app.schemas.services.auth.user_service_schemas import UserSchema
+from app.services.auth.user_service import user_service
+from app.services.repositories.role_repository import role_repository
+from app.services.repositories.user_repository import user_repository
+from app.services.utils.permissions_version import permissions_version_service
+
+
+@pytest.fixture
+async def superuser_headers(async_test_client: AsyncClient, test_user_data: dict, registered_user: UserSchema) -> dict:
+    await user_repository.update(registered_user.id, {'is_superuser': True})
+    user_credentials = UserCredentialsSchema(login=registered_user.email, password=test_user_data['password'])
+    response = await async_test_client.post(
+        app.url_path_for('api_v1_login'), json=user_credentials.model_dump(mode='json')
+    )
+    return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+
+@pytest.fixture
+async def role(async_test_client: AsyncClient) -> RoleSchema:
+    created_role = await role_repository.create(CreateRoleSchema(title='random_role', description=None))
+    assert created_role is not None
+    return created_role
+
+
+def build_pairs(*pairs: tuple[uuid.UUID, uuid.UUID]) -> dict:
+    return {'pairs': [{'user_id': str(user_id), 'role_id': str(role_id)} for user_id, role_id in pairs]}
+
+
+@pytest.mark.anyio
+class TestBulkUserRoles:
+    async def test_bulk_assign_200(
+        self, async_test_client: AsyncClient, superuser_headers: dict, registered_user: UserSchema, role: RoleSchema
+    ):
+        # Arrange
+        permissions_version = await permissions_version_service.get(registered_user.id)
+
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('bulk_assign_user_roles'),
+            json=build_pairs((registered_user.id, role.id), (registered_user.id, role.id)),
+            headers=superuser_headers,
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'requested': 1, 'affected': 1}
+        assert await permissions_version_service.get(registered_user.id) == permissions_version + 1
+        user = await user_service.get_user_by_id(registered_user.id)
+        assert [user_role.id for user_role in user.roles] == [role.id]
+
+    async def test_bulk_revoke_bumps_only_changed_users(
+        self, async_test_client: AsyncClient, superuser_headers: dict, registered_user: UserSchema, role: RoleSchema
+    ):
+        # Arrange
+        await async_test_client.post(
+            app.url_path_for('bulk_assign_user_roles'),
+            json=build_pairs((registered_user.id, role.id)),
+            headers=superuser_headers,
+        )
+        first_response = await async_test_client.post(
+            app.url_path_for('bulk_revoke_user_roles'),
+            json=build_pairs((registered_user.id, role.id)),
+            headers=superuser_headers,
+        )
+        permissions_version = await permissions_version_service.get(registered_user.id)
+
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('bulk_revoke_user_roles'),
+            json=build_pairs((registered_user.id, role.id)),
+            headers=superuser_headers,
+        )
+
+        # Assert
+        assert first_response.json() == {'requested': 1, 'affected': 1}
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'requested': 1, 'affected': 0}
+        assert await permissions_version_service.get(registered_user.id) == permissions_version
+
+    @pytest.mark.parametrize('unknown', ['user', 'role'])
+    async def test_bulk_assign_unknown_ids_404(
+        self,
+        async_test_client: AsyncClient,
+        superuser_headers: dict,
+        registered_user: UserSchema,
+        role: RoleSchema,
+        unknown: str,
+    ):
+        # Arrange
+        user_id = uuid.uuid4() if unknown == 'user' else registered_user.id
+        role_id = uuid.uuid4() if unknown == 'role' else role.id
+        error = user_not_found_error if unknown == 'user' else role_not_found_error
+
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('bulk_assign_user_roles'),
+            json=build_pairs((registered_user.id, role.id), (user_id, role_id)),
+            headers=superuser_headers,
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {'detail': error.detail}
+        assert (await user_service.get_user_by_id(registered_user.id)).roles == []
+
+    async def test_bulk_assign_too_many_pairs_422(
+        self,
+        async_test_client: AsyncClient,
+        mocker: MockerFixture,
+        superuser_headers: dict,
+        registered_user: UserSchema,
+        role: RoleSchema,
+    ):
+        # Arrange
+        mocker.patch.object(app_settings, 'USER_ROLES_BULK_MAX_SIZE', 1)
+
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('bulk_assign_user_roles'),
+            json=build_pairs((registered_user.id, role.id), (uuid.uuid4(), role.id)),
+            headers=superuser_headers,
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json() == {'detail': user_roles_batch_too_large_error.detail}
+
+    async def test_bulk_assign_empty_batch_422(self, async_test_client: AsyncClient, superuser_headers: dict):
+        # Act
+        response = await async_test_client.post(
+            app.url_path_for('bulk_assign_user_roles'), json={'pairs': []}, headers=superuser_headers
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
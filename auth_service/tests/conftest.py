@@ -1,9 +1,12 @@
-from typing import AsyncGenerator, Generator
+from pathlib import Path
+from typing import AsyncGenerator, Callable, Generator
 from uuid import uuid4
 
 import pytest
 from alembic import command
 from alembic.config import Config
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 from httpx import AsyncClient
 from pytest_mock import MockerFixture
 from sqlalchemy import URL, text
@@ -11,7 +14,9 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engin
 
 from app.core.config import BASEDIR, app_settings
 from app.db.postgres.models.base import Base
+from app.db.postgres.partitions import history_partition_manager
 from app.main import app as fastapi_app
+from app.services.utils.jwt_service import JWTService
 from tests.utils import (
     async_create_database,
     async_database_exists,
@@ -100,7 +105,15 @@ async def async_test_engine(mocker: MockerFixture, randomized_postgres_dsn: str)
 
 
 @pytest.fixture
-async def _manage_tables(_manage_migrations: None, async_test_engine: AsyncEngine) -> Generator[None, None, None]:
+async def _manage_history_partitions(_manage_migrations: None, async_test_engine: AsyncEngine) -> None:
+    """Миграции создают партиции истории только до момента их написания, поэтому создаём партицию текущего месяца."""
+    await history_partition_manager.ensure_partitions(months_ahead=1)
+
+
+@pytest.fixture
+async def _manage_tables(
+    _manage_migrations: None, _manage_history_partitions: None, async_test_engine: AsyncEngine
+) -> Generator[None, None, None]:
     yield
     async with async_test_engine.begin() as conn:
         await conn.execute(
@@ -124,3 +137,34 @@ async def async_test_session(
 async def async_test_client(_manage_tables: None) -> AsyncGenerator[AsyncClient, None]:
     async with AsyncClient(app=fastapi_app, base_url='http://test') as app:
         yield app
+
+
+def _write_private_key(keys_dir: Path, kid: str, algorithm: str) -> None:
+    private_key: ed25519.Ed25519PrivateKey | rsa.RSAPrivateKey
+    if algorithm == 'EdDSA':
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (keys_dir / f'{kid}.pem').write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+
+
+@pytest.fixture
+def make_jwt_service(mocker: MockerFixture, tmp_path: Path) -> Callable[[str, list[str], str], JWTService]:
+    """Создаёт JWTService с асимметричными ключами <kid>.pem во временном каталоге."""
+
+    def _make_jwt_service(algorithm: str, kids: list[str], active_kid: str) -> JWTService:
+        for kid in kids:
+            if not (tmp_path / f'{kid}.pem').exists():
+                _write_private_key(tmp_path, kid, algorithm)
+        mocker.patch.object(app_settings, 'JWT_ALGORITHM', algorithm)
+        mocker.patch.object(app_settings, 'JWT_KEYS_DIR', tmp_path)
+        mocker.patch.object(app_settings, 'JWT_ACTIVE_KID', active_kid)
+        return JWTService()
+
+    return _make_jwt_service
@@ -0,0 +1,82 @@
+import asyncio
+import datetime
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.db.postgres.partitions import (
+    PartitionMaintenance,
+    add_months,
+    build_partition_name,
+    parse_partition_month,
+    plan_partitions,
+)
+
+
+class TestPartitionPlanning:
+    def test_plan_crosses_year(self):
+        # Arrange
+        today = datetime.date(2025, 11, 17)
+
+        result = plan_partitions(today, months_ahead=2)
+
+        # Assert
+        assert result == [
+            (datetime.date(2025, 11, 1), datetime.date(2025, 12, 1)),
+            (datetime.date(2025, 12, 1), datetime.date(2026, 1, 1)),
+            (datetime.date(2026, 1, 1), datetime.date(2026, 2, 1)),
+        ]
+
+    def test_plan_backfills_missing_months(self):
+        # Arrange
+        today = datetime.date(2026, 3, 5)
+
+        result = plan_partitions(today, months_ahead=1, since=datetime.date(2026, 1, 1))
+
+        # Assert
+        assert [start for start, _ in result] == [
+            datetime.date(2026, 1, 1),
+            datetime.date(2026, 2, 1),
+            datetime.date(2026, 3, 1),
+            datetime.date(2026, 4, 1),
+        ]
+
+    def test_plan_ignores_future_since(self):
+        result = plan_partitions(datetime.date(2026, 3, 5), months_ahead=1, since=datetime.date(2026, 6, 1))
+
+        # Assert
+        assert [start for start, _ in result] == [datetime.date(2026, 3, 1), datetime.date(2026, 4, 1)]
+
+    def test_partition_name_roundtrip(self):
+        # Arrange
+        month = datetime.date(2024, 3, 1)
+
+        result = build_partition_name('history', month)
+
+        # Assert
+        assert result == 'history_2024_03'
+        assert parse_partition_month('history', result) == month
+        assert parse_partition_month('history', 'history_default') is None
+
+    def test_add_months_backwards(self):
+        result = add_months(datetime.date(2024, 1, 1), -13)
+
+        # Assert
+        assert result == datetime.date(2022, 12, 1)
+
+
+@pytest.mark.anyio
+class TestPartitionMaintenance:
+    async def test_partitions_are_managed_periodically(self, mocker: MockerFixture):
+        # Arrange
+        manage = mocker.patch('app.db.postgres.partitions.manage_history_partitions')
+        maintenance = PartitionMaintenance(interval=0.01)
+
+        # Act
+        await maintenance.start()
+        while manage.await_count < 3:
+            await asyncio.sleep(0.01)
+        await maintenance.stop()
+
+        # Assert
+        assert manage.await_count >= 3
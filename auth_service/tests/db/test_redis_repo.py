@@ -0,0 +1,152 @@
+import uuid
+from typing import AsyncGenerator
+
+import pytest
+
+from app.db.redis.base import redis_pool
+from app.db.redis.redis_repo import SessionField, redis_repo
+from app.schemas.services.auth.session_service_schemas import SessionRotationStatus
+
+
+@pytest.fixture(autouse=True)
+async def _disconnect_redis() -> AsyncGenerator[None, None]:
+    """Соединения пула привязаны к событийному циклу теста, поэтому закрываем их после каждого теста."""
+    yield
+    await redis_pool.disconnect()
+
+
+def random_login() -> str:
+    return f'{uuid.uuid4().hex}@mail.ru'
+
+
+async def save_legacy_session(login: str, session_id: uuid.UUID, family_id: uuid.UUID) -> None:
+    await redis_repo.redis.set(f'session:{session_id}', login, ex=redis_repo.expire_time)
+    await redis_repo.redis.set(f'refresh_family:{family_id}', str(session_id), ex=redis_repo.expire_time)
+    await redis_repo.redis.zadd(f'user_sessions:{login}', {str(session_id): 4102444800})
+
+
+@pytest.mark.anyio
+class TestRedisRepositorySessions:
+    async def test_session_is_stored_as_hash(self):
+        # Arrange
+        login, session_id, family_id = random_login(), uuid.uuid4(), uuid.uuid4()
+
+        # Act
+        await redis_repo.save_session(login, session_id, family_id, user_agent='test-agent')
+
+        # Assert
+        session_key = b's:' + session_id.bytes
+        assert await redis_repo.redis.type(session_key) == b'hash'
+        assert await redis_repo.redis.hget(session_key, SessionField.LOGIN) == login.encode()
+        assert await redis_repo.redis.get(b'f:' + family_id.bytes) == session_id.bytes
+        assert await redis_repo.get_session(session_id) == login.encode()
+        [stored_session] = await redis_repo.get_user_sessions(login)
+        assert stored_session.session_id == session_id
+        assert stored_session.user_agent == 'test-agent'
+        assert stored_session.created_at is not None
+
+    async def test_rotation_moves_hash_and_detects_reuse(self):
+        # Arrange
+        login, family_id = random_login(), uuid.uuid4()
+        old_session_id, new_session_id = uuid.uuid4(), uuid.uuid4()
+        await redis_repo.save_session(login, old_session_id, family_id, user_agent='old-agent')
+
+        # Act
+        result = await redis_repo.rotate_session(
+            login, family_id, old_session_id, new_session_id, user_agent='new-agent'
+        )
+        reuse_result = await redis_repo.rotate_session(
+            login, family_id, old_session_id, uuid.uuid4(), user_agent='new-agent'
+        )
+
+        # Assert
+        assert result.status == SessionRotationStatus.ROTATED
+        assert reuse_result.status == SessionRotationStatus.REUSED
+        assert reuse_result.revoked_session_id == str(new_session_id)
+        assert await redis_repo.get_sessions([old_session_id, new_session_id]) == [None, None]
+        assert await redis_repo.get_user_sessions(login) == []
+
+    async def test_rotation_keeps_created_at(self):
+        # Arrange
+        login, family_id = random_login(), uuid.uuid4()
+        old_session_id, new_session_id = uuid.uuid4(), uuid.uuid4()
+        await redis_repo.save_session(login, old_session_id, family_id, user_agent='old-agent')
+        [old_session] = await redis_repo.get_user_sessions(login)
+
+        # Act
+        await redis_repo.rotate_session(login, family_id, old_session_id, new_session_id, user_agent='new-agent')
+
+        # Assert
+        [new_session] = await redis_repo.get_user_sessions(login)
+        assert new_session.session_id == new_session_id
+        assert new_session.created_at == old_session.created_at
+        assert new_session.user_agent == 'new-agent'
+
+    async def test_legacy_session_is_read_and_rotated(self):
+        # Arrange
+        login, family_id = random_login(), uuid.uuid4()
+        old_session_id, new_session_id = uuid.uuid4(), uuid.uuid4()
+        await save_legacy_session(login, old_session_id, family_id)
+        legacy_login = await redis_repo.get_session(old_session_id)
+        [legacy_session] = await redis_repo.get_user_sessions(login)
+
+        # Act
+        result = await redis_repo.rotate_session(
+            login, family_id, old_session_id, new_session_id, user_agent='new-agent'
+        )
+
+        # Assert
+        assert legacy_login == login.encode()
+        assert legacy_session.session_id == old_session_id
+        assert legacy_session.created_at is None
+        assert result.status == SessionRotationStatus.ROTATED
+        assert await redis_repo.redis.exists(f'session:{old_session_id}', f'refresh_family:{family_id}') == 0
+        assert [session.session_id for session in await redis_repo.get_user_sessions(login)] == [new_session_id]
+
+    async def test_delete_user_sessions_skips_invalid_members(self):
+        # Arrange
+        login, session_id, legacy_session_id = random_login(), uuid.uuid4(), uuid.uuid4()
+        await redis_repo.save_session(login, session_id, uuid.uuid4(), user_agent='test')
+        await save_legacy_session(login, legacy_session_id, uuid.uuid4())
+        await redis_repo.redis.zadd(f'user_sessions:{login}', {'garbage': 4102444800})
+
+        # Act
+        deleted = await redis_repo.delete_user_sessions(login)
+
+        # Assert
+        assert {session_id for session_id, _ in deleted} == {str(session_id), str(legacy_session_id)}
+        assert await redis_repo.get_sessions([session_id, legacy_session_id]) == [None, None]
+        assert await redis_repo.redis.zrange(f'user_sessions:{login}', 0, -1) == [b'garbage']
+
+
+@pytest.mark.anyio
+class TestRedisRepositoryMaintenance:
+    async def test_migrate_legacy_sessions(self):
+        # Arrange
+        login, session_id, family_id = random_login(), uuid.uuid4(), uuid.uuid4()
+        await save_legacy_session(login, session_id, family_id)
+
+        # Act
+        migrated = await redis_repo.migrate_legacy_sessions(batch_size=10)
+
+        # Assert
+        assert migrated >= 1
+        assert await redis_repo.redis.exists(f'session:{session_id}', f'refresh_family:{family_id}') == 0
+        assert await redis_repo.redis.hget(b's:' + session_id.bytes, SessionField.LOGIN) == login.encode()
+        assert await redis_repo.redis.get(b'f:' + family_id.bytes) == session_id.bytes
+        assert await redis_repo.redis.zrange(f'user_sessions:{login}', 0, -1) == [session_id.bytes]
+
+    async def test_memory_report(self):
+        # Arrange
+        await redis_repo.save_session(random_login(), uuid.uuid4(), uuid.uuid4(), user_agent='test')
+
+        # Act
+        report = await redis_repo.get_memory_report(sample_size=5)
+
+        # Assert
+        key_stats = {stats.pattern: stats for stats in report.key_stats}
+        assert set(key_stats) == {'s:*', 'f:*', 'user_sessions:*', 'session:*', 'refresh_family:*'}
+        assert key_stats['s:*'].sampled_keys >= 1
+        assert key_stats['s:*'].avg_bytes > 0
+        assert report.used_memory > 0
+        assert report.total_keys >= 3
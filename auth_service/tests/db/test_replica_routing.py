@@ -0,0 +1,41 @@
+from app.db.postgres.base import ReadYourWritesGuard, get_entity_tables
+from app.db.postgres.models.users import SocialAccount, UserModel
+
+
+class TestReplicaRouting:
+    def test_entity_tables_include_relationships(self):
+        result = get_entity_tables(UserModel, [UserModel.roles])
+
+        # Assert
+        assert result == {'users', 'roles', 'user_role_associations'}
+
+    def test_entity_tables_from_column(self):
+        result = get_entity_tables(UserModel.id)
+
+        # Assert
+        assert result == get_entity_tables(UserModel)
+
+    def test_entity_tables_from_several_models(self):
+        result = get_entity_tables([UserModel, SocialAccount])
+
+        # Assert
+        assert result == {'users', 'social_account'}
+
+    def test_guard_keeps_written_tables_on_primary(self):
+        # Arrange
+        guard = ReadYourWritesGuard(window=60)
+
+        guard.mark({'users'})  # act
+
+        # Assert
+        assert guard.is_recently_written({'users', 'roles'})
+        assert not guard.is_recently_written({'roles'})
+
+    def test_guard_window_expires(self):
+        # Arrange
+        guard = ReadYourWritesGuard(window=0)
+
+        guard.mark({'users'})  # act
+
+        # Assert
+        assert not guard.is_recently_written({'users'})
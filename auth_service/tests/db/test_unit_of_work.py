@@ -0,0 +1,48 @@
+import datetime
+import uuid
+
+import pytest
+
+from app.db.postgres.base import unit_of_work
+from app.schemas.api.v1.auth_schemas import HistorySchemaCreate, LoginType
+from app.schemas.services.auth.role_service_schemas import CreateRoleSchema
+from app.services.repositories.history_repository import history_repository
+from app.services.repositories.role_repository import role_repository
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures('_manage_tables')
+class TestUnitOfWorkSavepoints:
+    async def test_swallowed_integrity_error_keeps_transaction(self):
+        # Arrange
+        first_role = CreateRoleSchema(title='first_role', description=None)
+        second_role = CreateRoleSchema(title='second_role', description=None)
+
+        # Act
+        async with unit_of_work():
+            await role_repository.create(first_role)
+            role = await role_repository.create(second_role)
+            updated_role = await role_repository.update(role.id, {'title': 'first_role'})
+            await role_repository.create(CreateRoleSchema(title='third_role', description=None))
+
+        # Assert
+        assert updated_role is None
+        assert {role.title for role in await role_repository.get_all()} == {'first_role', 'second_role', 'third_role'}
+
+    async def test_failed_history_write_keeps_transaction(self):
+        # Arrange
+        history_data = HistorySchemaCreate(
+            user_id=uuid.uuid4(),
+            auth_date=datetime.datetime.now(datetime.timezone.utc),
+            user_agent='test',
+            login_type=LoginType.CREDENTIALS,
+            session_id=uuid.uuid4(),
+        )
+
+        # Act
+        async with unit_of_work():
+            await history_repository.create(history_data)
+            await role_repository.create(CreateRoleSchema(title='random_role', description=None))
+
+        # Assert
+        assert [role.title for role in await role_repository.get_all()] == ['random_role']
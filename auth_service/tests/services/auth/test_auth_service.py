@@ -0,0 +1,126 @@
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.exceptions import UserNotFoundError
+from app.schemas.api.v1.auth_schemas import LoginType, RefreshLoginDataSchema
+from app.schemas.services.auth.session_service_schemas import (
+    SessionRotationResult,
+    SessionRotationStatus,
+)
+from app.schemas.services.repositories.user_repository_schemas import (
+    UserProfileDBSchema,
+)
+from app.services.auth.auth_service import AuthenticationService
+from app.services.auth.session_service import SessionService
+
+
+@pytest.mark.anyio
+class TestCreateSession:
+    async def test_permissions_version_is_read_before_user(self, mocker: MockerFixture):
+        # Arrange
+        user = UserProfileDBSchema(
+            id=uuid.uuid4(), username='random_username', email='random@email.com', is_superuser=True
+        )
+        calls = mocker.AsyncMock()
+        calls.get_permissions_version.return_value = 7
+        calls.get_user_by_id.return_value = user
+        service = AuthenticationService()
+        service.permissions_version_service = mocker.Mock(get=calls.get_permissions_version)
+        service.user_service = mocker.Mock(get_user_by_id=calls.get_user_by_id)
+        service.session_service = mocker.AsyncMock()
+
+        # Act
+        await service._create_session(user.id, user_agent='test')
+
+        # Assert
+        assert [name for name, _, _ in calls.mock_calls] == ['get_permissions_version', 'get_user_by_id']
+        token_data = service.session_service.create_session.await_args.args[0]
+        assert token_data.pv == 7
+        assert token_data.sup is True
+
+
+def make_refresh_service(mocker: MockerFixture, calls, refresh_token_payload: dict) -> AuthenticationService:
+    session_service = SessionService()
+    session_service.redis_repo = mocker.Mock(rotate_session=calls.rotate_session)
+    mocker.patch.object(session_service, 'get_validated_refresh_token_payload', return_value=refresh_token_payload)
+    service = AuthenticationService()
+    service.session_service = session_service
+    service.permissions_version_service = mocker.Mock(get=calls.get_permissions_version)
+    service.user_service = mocker.Mock(
+        get_user=calls.get_user, get_user_by_id=calls.get_user_by_id, save_login_history=mocker.AsyncMock()
+    )
+    return service
+
+
+REFRESH_LOGIN_DATA = RefreshLoginDataSchema(
+    refresh_token='refresh_token', user_agent='test', login_type=LoginType.REFRESH
+)
+
+
+@pytest.mark.anyio
+class TestRefresh:
+    async def test_user_id_is_taken_from_token(self, mocker: MockerFixture):
+        # Arrange
+        user = UserProfileDBSchema(
+            id=uuid.uuid4(), username='random_username', email='random@email.com', is_superuser=False
+        )
+        calls = mocker.AsyncMock()
+        calls.get_permissions_version.return_value = 3
+        calls.get_user_by_id.return_value = user
+        calls.rotate_session.return_value = SessionRotationResult(status=SessionRotationStatus.ROTATED)
+        service = make_refresh_service(
+            mocker, calls, {'login': user.email, 'uid': str(user.id), 'session_id': str(uuid.uuid4())}
+        )
+
+        # Act
+        token_pair = await service.authenticate_by_refresh_token(REFRESH_LOGIN_DATA)
+
+        # Assert
+        assert [name for name, _, _ in calls.mock_calls] == [
+            'get_permissions_version',
+            'get_user_by_id',
+            'rotate_session',
+        ]
+        assert service.session_service.jwt_service.get_token_payload(token_pair.access_token)['pv'] == 3
+        assert service.session_service.jwt_service.get_token_payload(token_pair.refresh_token)['uid'] == str(user.id)
+
+    async def test_legacy_token_without_user_id_is_resolved_by_login(self, mocker: MockerFixture):
+        # Arrange
+        user = UserProfileDBSchema(
+            id=uuid.uuid4(), username='random_username', email='random@email.com', is_superuser=False
+        )
+        calls = mocker.AsyncMock()
+        calls.get_permissions_version.return_value = 0
+        calls.get_user.return_value = user
+        calls.get_user_by_id.return_value = user
+        calls.rotate_session.return_value = SessionRotationResult(status=SessionRotationStatus.ROTATED)
+        service = make_refresh_service(mocker, calls, {'login': user.email, 'session_id': str(uuid.uuid4())})
+
+        # Act
+        await service.authenticate_by_refresh_token(REFRESH_LOGIN_DATA)
+
+        # Assert
+        assert [name for name, _, _ in calls.mock_calls] == [
+            'get_user',
+            'get_permissions_version',
+            'get_user_by_id',
+            'rotate_session',
+        ]
+
+    async def test_failed_user_load_keeps_refresh_family(self, mocker: MockerFixture):
+        # Arrange
+        calls = mocker.AsyncMock()
+        calls.get_permissions_version.return_value = 0
+        calls.get_user_by_id.side_effect = UserNotFoundError
+        service = make_refresh_service(
+            mocker, calls, {'login': 'random@email.com', 'uid': str(uuid.uuid4()), 'session_id': str(uuid.uuid4())}
+        )
+
+        # Act
+        with pytest.raises(UserNotFoundError):
+            await service.authenticate_by_refresh_token(REFRESH_LOGIN_DATA)
+
+        # Assert
+        calls.rotate_session.assert_not_awaited()
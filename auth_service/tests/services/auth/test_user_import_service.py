@@ -0,0 +1,119 @@
+import json
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.schemas.services.auth.user_import_service_schemas import (
+    ImportChunkResultSchema,
+    ImportFormat,
+    ImportUserSchema,
+)
+from app.services.auth.user_import_service import UserImportService
+
+HASHED_PASSWORD = '$argon2id$v=19$m=65536,t=3,p=4$c2FsdA$aGFzaA'
+
+
+@pytest.fixture
+def import_file(tmp_path: Path) -> Path:
+    path = tmp_path / 'users.ndjson'
+    records = [
+        {'username': f'user_{num}', 'email': f'user_{num}@email.com', 'hashed_password': HASHED_PASSWORD}
+        for num in range(5)
+    ]
+    records.append({'username': 'broken', 'email': 'not an email', 'hashed_password': HASHED_PASSWORD})
+    path.write_text('\n'.join(json.dumps(record) for record in records))
+    return path
+
+
+class TestImportUserSchema:
+    def test_csv_fields(self):
+        result = ImportUserSchema.model_validate(
+            {
+                'username': 'random_username',
+                'email': 'random@email.com',
+                'password': 'random_password',
+                'hashed_password': '',
+                'is_superuser': '',
+                'roles': 'admin|editor',
+                'socials': 'yandex:123',
+            }
+        )
+
+        # Assert
+        assert result.hashed_password is None
+        assert result.is_superuser is False
+        assert result.roles == ['admin', 'editor']
+        assert result.socials[0].social_name == 'yandex'
+        assert result.socials[0].social_id == '123'
+
+    def test_rejects_non_argon2_hash(self):
+        with pytest.raises(ValueError, match='hashed_password must be an argon2 hash'):
+            ImportUserSchema(username='random_username', email='random@email.com', hashed_password='md5hash')
+
+
+@pytest.mark.anyio
+class TestUserImportService:
+    async def test_imports_in_chunks(self, mocker: MockerFixture, import_file: Path, tmp_path: Path):
+        # Arrange
+        repository = mocker.AsyncMock()
+        repository.load_chunk.side_effect = lambda chunk: ImportChunkResultSchema(
+            users=len(chunk.users), user_roles=0, socials=0
+        )
+        service = UserImportService(repository, hash_workers=1)
+
+        # Act
+        report = await service.import_users(import_file, ImportFormat.NDJSON, 2, tmp_path / 'checkpoint')
+
+        # Assert
+        assert repository.load_chunk.await_count == 3
+        assert report.processed == 6
+        assert report.imported == 5
+        assert report.invalid == 1
+        assert report.hashed == 0
+
+    async def test_malformed_line_is_counted_as_invalid(self, mocker: MockerFixture, import_file: Path, tmp_path: Path):
+        # Arrange
+        with import_file.open('a') as file:
+            file.write('\n{"username": "cut_off", "email"\n')
+        repository = mocker.AsyncMock()
+        repository.load_chunk.side_effect = lambda chunk: ImportChunkResultSchema(
+            users=len(chunk.users), user_roles=0, socials=0
+        )
+        service = UserImportService(repository, hash_workers=1)
+
+        # Act
+        report = await service.import_users(import_file, ImportFormat.NDJSON, 2, tmp_path / 'checkpoint')
+
+        # Assert
+        assert report.processed == 7
+        assert report.imported == 5
+        assert report.invalid == 2
+
+    async def test_resumes_from_checkpoint(self, mocker: MockerFixture, import_file: Path, tmp_path: Path):
+        # Arrange
+        repository = mocker.AsyncMock()
+        repository.load_chunk.side_effect = [
+            ImportChunkResultSchema(users=2, user_roles=0, socials=0),
+            RuntimeError('connection lost'),
+        ]
+        service = UserImportService(repository, hash_workers=1)
+        checkpoint_path = tmp_path / 'checkpoint'
+        with pytest.raises(RuntimeError):
+            await service.import_users(import_file, ImportFormat.NDJSON, 2, checkpoint_path)
+        repository.load_chunk.side_effect = lambda chunk: ImportChunkResultSchema(
+            users=len(chunk.users), user_roles=0, socials=0
+        )
+
+        # Act
+        report = await service.import_users(import_file, ImportFormat.NDJSON, 2, checkpoint_path)
+
+        # Assert
+        assert [call.args[0].users[0][1] for call in repository.load_chunk.await_args_list] == [
+            'user_0',
+            'user_2',
+            'user_2',
+            'user_4',
+        ]
+        assert report.processed == 6
+        assert report.imported == 5
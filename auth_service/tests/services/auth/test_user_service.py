@@ -0,0 +1,104 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from app.schemas.services.auth.user_service_schemas import UserCreateSchema
+from app.services.auth.user_service import user_service
+from app.services.repositories.user_repository import user_repository
+from app.utils.yandex_id.yandex_id_schema import User as SocialUser
+
+
+def build_social_user(psuid: str = 'psuid', email: str = 'social@email.com', login: str = 'social_login') -> SocialUser:
+    return SocialUser(login=login, id='1', client_id='client', psuid=psuid, default_email=email)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures('_manage_tables')
+class TestSocialLogin:
+    async def test_creates_and_reuses_linked_user(self):
+        # Arrange
+        social_user = build_social_user()
+
+        # Act
+        created_user = await user_service.get_or_create_user_by_provider(social_user, social_name='yandex')
+        linked_user = await user_service.get_or_create_user_by_provider(social_user, social_name='yandex')
+
+        # Assert
+        assert linked_user == created_user
+        assert created_user.username == 'social_login'
+        assert created_user.email == 'social@email.com'
+
+    async def test_links_existing_user_by_email(self):
+        # Arrange
+        user = await user_repository.create(
+            UserCreateSchema(username='random_username', email='social@email.com', hashed_password='hash')
+        )
+
+        # Act
+        linked_user = await user_service.get_or_create_user_by_provider(build_social_user(), social_name='yandex')
+
+        # Assert
+        assert linked_user.id == user.id
+
+    async def test_same_social_id_of_other_provider_is_separate(self):
+        # Arrange
+        yandex_user = await user_service.get_or_create_user_by_provider(build_social_user(), social_name='yandex')
+
+        # Act
+        other_user = await user_service.get_or_create_user_by_provider(
+            build_social_user(email='other@email.com', login='other_login'), social_name='other'
+        )
+
+        # Assert
+        assert other_user.id != yandex_user.id
+
+    async def test_taken_username_gets_suffix(self):
+        # Arrange
+        await user_repository.create(
+            UserCreateSchema(username='social_login', email='random@email.com', hashed_password='hash')
+        )
+
+        # Act
+        user = await user_service.get_or_create_user_by_provider(build_social_user(), social_name='yandex')
+
+        # Assert
+        assert user.email == 'social@email.com'
+        assert user.username.startswith('social_login_')
+
+    async def test_new_and_linked_account_cost_two_queries(self, mocker: MockerFixture):
+        # Arrange
+        link_user = mocker.spy(user_service.social_repository, 'link_user')
+        get_user = mocker.spy(user_service.user_repository, 'get_by_social_account')
+        created_user = await user_service.get_or_create_user_by_provider(build_social_user(), social_name='yandex')
+        new_account_calls = (link_user.await_count, get_user.await_count)
+
+        # Act
+        linked_user = await user_service.get_or_create_user_by_provider(build_social_user(), social_name='yandex')
+
+        # Assert
+        assert linked_user == created_user
+        assert new_account_calls == (1, 1)
+        assert (link_user.await_count, get_user.await_count) == (2, 2)
+
+    async def test_linked_account_with_changed_email_does_not_create_user(self):
+        # Arrange
+        user = await user_service.get_or_create_user_by_provider(build_social_user(), social_name='yandex')
+        await user_repository.update(user.id, {'email': 'changed@email.com'})
+
+        # Act
+        linked_user = await user_service.get_or_create_user_by_provider(
+            build_social_user(login='renamed_login'), social_name='yandex'
+        )
+
+        # Assert
+        assert linked_user.id == user.id
+        assert await user_repository.get_user_by_login('social@email.com') is None
+
+    async def test_link_marks_users_and_social_accounts_as_written(self, mocker: MockerFixture):
+        # Arrange
+        mark = mocker.patch('app.db.postgres.base.read_your_writes_guard.mark')
+
+        # Act
+        await user_service.get_or_create_user_by_provider(build_social_user(), social_name='yandex')
+
+        # Assert
+        assert {'users', 'social_account'} in [call.args[0] for call in mark.call_args_list]
@@ -0,0 +1,91 @@
+import httpx
+import pytest
+
+from app.exceptions import ProviderAuthError
+from app.services.providers.http_client import ProviderHTTPClient
+from app.services.providers.yandex_provider import YandexProvider
+
+USER_INFO = {'login': 'random_login', 'id': '1', 'client_id': 'client', 'psuid': 'psuid', 'default_email': 'a@b.ru'}
+
+
+class StubOAuthServer:
+    """Заглушка OAuth-сервера: отвечает на /token и /info, первые failures ответов - 503."""
+
+    def __init__(self, failures: int = 0, token_status: int = 200):
+        self.failures = failures
+        self.token_status = token_status
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503)
+        if request.url.path == '/token':
+            return httpx.Response(self.token_status, json={'access_token': 'random_token'})
+        if request.headers.get('Authorization') != 'OAuth random_token':
+            return httpx.Response(401)
+        return httpx.Response(200, json=USER_INFO)
+
+
+def build_provider(server: StubOAuthServer, retries: int = 2) -> YandexProvider:
+    http_client = ProviderHTTPClient(
+        timeout=1,
+        connect_timeout=1,
+        max_connections=2,
+        retries=retries,
+        backoff=0,
+        transport=httpx.MockTransport(server),
+    )
+    return YandexProvider(http_client, token_url='http://oauth.test/token', user_info_url='http://oauth.test/info')
+
+
+@pytest.mark.anyio
+class TestYandexProvider:
+    async def test_get_userdata(self):
+        # Arrange
+        server = StubOAuthServer()
+        provider = build_provider(server)
+
+        # Act
+        social_user = await provider.get_userdata(12345)
+
+        # Assert
+        assert social_user.psuid == 'psuid'
+        assert [request.url.path for request in server.requests] == ['/token', '/info']
+        await provider.aclose()
+
+    async def test_retries_unavailable_provider(self):
+        # Arrange
+        server = StubOAuthServer(failures=2)
+        provider = build_provider(server)
+
+        # Act
+        social_user = await provider.get_userdata(12345)
+
+        # Assert
+        assert social_user.login == 'random_login'
+        assert len(server.requests) == 4
+        await provider.aclose()
+
+    async def test_gives_up_after_retries(self):
+        # Arrange
+        server = StubOAuthServer(failures=10)
+        provider = build_provider(server, retries=1)
+
+        # Act / Assert
+        with pytest.raises(ProviderAuthError):
+            await provider.get_userdata(12345)
+        assert len(server.requests) == 2
+        await provider.aclose()
+
+    async def test_does_not_retry_rejected_code(self):
+        # Arrange
+        server = StubOAuthServer(token_status=400)
+        provider = build_provider(server)
+
+        # Act / Assert
+        with pytest.raises(ProviderAuthError):
+            await provider.get_userdata(12345)
+        assert len(server.requests) == 1
+        await provider.aclose()
@@ -0,0 +1,48 @@
+import datetime
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.schemas.api.v1.auth_schemas import HistorySchemaCreate, LoginType
+from app.services.repositories.history_writer import HistoryWriter
+
+
+@pytest.fixture
+def history_data() -> HistorySchemaCreate:
+    return HistorySchemaCreate(
+        user_id=uuid.uuid4(),
+        auth_date=datetime.datetime.now(datetime.UTC),
+        user_agent='random_user_agent_info',
+        login_type=LoginType.CREDENTIALS,
+        session_id=uuid.uuid4(),
+    )
+
+
+@pytest.mark.anyio
+class TestHistoryWriter:
+    async def test_writes_inline_when_not_started(self, mocker: MockerFixture, history_data: HistorySchemaCreate):
+        # Arrange
+        repository = mocker.AsyncMock()
+        writer = HistoryWriter(repository, batch_size=10, flush_interval=60, queue_size=10)
+
+        # Act
+        await writer.put(history_data)
+
+        # Assert
+        repository.create.assert_awaited_once_with(history_data)
+
+    async def test_flushes_batch_on_stop(self, mocker: MockerFixture, history_data: HistorySchemaCreate):
+        # Arrange
+        repository = mocker.AsyncMock()
+        writer = HistoryWriter(repository, batch_size=10, flush_interval=60, queue_size=10)
+        writer.start()
+
+        # Act
+        for _ in range(3):
+            await writer.put(history_data)
+        await writer.stop()
+
+        # Assert
+        repository.create_many.assert_awaited_once_with([history_data] * 3)
+        assert writer.get_metrics().written == 3
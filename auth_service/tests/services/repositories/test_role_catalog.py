@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.db.postgres.base import ReadYourWritesGuard
+from app.schemas.services.auth.role_service_schemas import CreateRoleSchema, RoleSchema
+from app.services.repositories.role_catalog import RoleCatalog
+from app.services.repositories.role_repository import role_repository
+
+
+@pytest.fixture
+def role() -> RoleSchema:
+    return RoleSchema(id=uuid.uuid4(), title='admin', description=None)
+
+
+@pytest.mark.anyio
+class TestRoleCatalog:
+    async def test_reads_repository_when_not_started(self, mocker: MockerFixture, role: RoleSchema):
+        # Arrange
+        repository = mocker.AsyncMock()
+        repository.get.return_value = role
+        catalog = RoleCatalog(repository, mocker.AsyncMock())
+
+        # Act
+        found_role = await catalog.get(role.id)
+
+        # Assert
+        assert found_role == role
+        repository.get.assert_awaited_once_with(role.id)
+
+    async def test_load_builds_indexes(self, mocker: MockerFixture, role: RoleSchema):
+        # Arrange
+        repository = mocker.AsyncMock()
+        repository.get_all.return_value = [role]
+        catalog = RoleCatalog(repository, mocker.AsyncMock())
+        mocker.patch.object(RoleCatalog, 'is_ready', new_callable=mocker.PropertyMock, return_value=True)
+
+        # Act
+        await catalog.load()
+
+        # Assert
+        assert await catalog.get(role.id) == role
+        assert await catalog.get_by_title('admin') == role
+        assert await catalog.get(uuid.uuid4()) is None
+        repository.get.assert_not_awaited()
+
+    async def test_refresh_notifies_other_workers(self, mocker: MockerFixture):
+        # Arrange
+        redis = mocker.AsyncMock()
+        catalog = RoleCatalog(mocker.AsyncMock(), redis)
+
+        # Act
+        await catalog.refresh()
+
+        # Assert
+        redis.publish.assert_awaited_once_with(RoleCatalog.CHANNEL, catalog.instance_id)
+
+    @pytest.mark.usefixtures('_manage_tables')
+    async def test_load_reads_primary_when_replica_is_configured(self, mocker: MockerFixture):
+        # Arrange
+        role = await role_repository.create(CreateRoleSchema(title='admin', description=None))
+        replica_engine = mocker.patch('app.db.postgres.base.replica_engine')
+        mocker.patch('app.db.postgres.base.read_your_writes_guard', ReadYourWritesGuard(window=0))
+        catalog = RoleCatalog(role_repository, mocker.AsyncMock())
+        mocker.patch.object(RoleCatalog, 'is_ready', new_callable=mocker.PropertyMock, return_value=True)
+
+        # Act
+        await catalog.load()
+
+        # Assert
+        assert await catalog.get_all() == [role]
+        replica_engine.assert_not_called()
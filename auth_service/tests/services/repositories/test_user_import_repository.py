@@ -0,0 +1,32 @@
+import uuid
+
+import pytest
+
+from app.schemas.services.auth.user_import_service_schemas import ImportChunkSchema
+from app.services.repositories.user_import_repository import user_import_repository
+from app.services.repositories.user_repository import user_repository
+
+HASHED_PASSWORD = '$argon2id$v=19$m=65536,t=3,p=4$c2FsdA$aGFzaA'
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures('_manage_tables')
+class TestUserImportRepository:
+    async def test_case_duplicates_in_chunk_keep_first(self):
+        # Arrange
+        first_id, second_id = uuid.uuid4(), uuid.uuid4()
+        chunk = ImportChunkSchema(
+            records=2,
+            users=[
+                (first_id, 'first_username', 'Random@Email.com', HASHED_PASSWORD, False),
+                (second_id, 'second_username', 'random@email.com', HASHED_PASSWORD, False),
+            ],
+        )
+
+        # Act
+        result = await user_import_repository.load_chunk(chunk)
+
+        # Assert
+        assert result.users == 1
+        assert await user_repository.get(first_id) is not None
+        assert await user_repository.get(second_id) is None
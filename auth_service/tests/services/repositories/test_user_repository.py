@@ -0,0 +1,118 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from app.db.postgres.base import unit_of_work
+from app.exceptions import UserAlreadyExistsError
+from app.schemas.services.auth.user_service_schemas import (
+    PrincipalSchema,
+    UserCreateSchema,
+)
+from app.schemas.services.repositories.user_repository_schemas import (
+    UserListFiltersSchema,
+)
+from app.services.repositories.user_repository import UserRepository, user_repository
+from app.services.utils.principal_cache import PrincipalCache
+
+
+@pytest.mark.anyio
+class TestUserRepositoryCreate:
+    async def test_conflict_on_insert_raises_with_field(self, mocker: MockerFixture):
+        # Arrange
+        repository = UserRepository()
+        repository.db = mocker.AsyncMock()
+        repository.db.create_obj_ignore_conflicts.return_value = None
+        user_data = UserCreateSchema(username='random_username', email='random@email.com', hashed_password='hash')
+
+        # Act
+        with pytest.raises(UserAlreadyExistsError) as err:
+            await repository.create(user_data)
+
+        # Assert
+        assert err.value.field == 'email'
+        repository.db.create_obj_ignore_conflicts.assert_awaited_once()
+        repository.db.get_one_obj.assert_not_awaited()
+
+    @pytest.mark.usefixtures('_manage_tables')
+    @pytest.mark.parametrize(
+        ('email', 'username', 'field'),
+        [('Random@Email.com', 'another_username', 'email'), ('another@email.com', 'random_username', 'username')],
+    )
+    async def test_insert_enforces_unique_login(self, email: str, username: str, field: str):
+        # Arrange
+        await user_repository.create(
+            UserCreateSchema(username='random_username', email='random@email.com', hashed_password='hash')
+        )
+
+        # Act
+        async with unit_of_work():
+            with pytest.raises(UserAlreadyExistsError) as err:
+                await user_repository.create(UserCreateSchema(username=username, email=email, hashed_password='hash'))
+            user = await user_repository.create(
+                UserCreateSchema(username='third_username', email='third@email.com', hashed_password='hash')
+            )
+
+        # Assert
+        assert err.value.field == field
+        assert await user_repository.get(user.id) is not None
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures('_manage_tables')
+class TestUserRepositoryStream:
+    async def test_streams_filtered_users_in_batches(self):
+        # Arrange
+        for num in range(5):
+            user = await user_repository.create(
+                UserCreateSchema(username=f'user_{num}', email=f'user_{num}@email.com', hashed_password='hash')
+            )
+            if num % 2:
+                await user_repository.update(user.id, {'is_superuser': True})
+
+        # Act
+        all_users = [user async for user in user_repository.stream(UserListFiltersSchema(), batch_size=2)]
+        superusers = [
+            user async for user in user_repository.stream(UserListFiltersSchema(superusers_only=True), batch_size=2)
+        ]
+
+        # Assert
+        assert len(all_users) == 5
+        assert all_users == sorted(all_users, key=lambda user: user.id)
+        assert {user.username for user in superusers} == {'user_1', 'user_3'}
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures('_manage_tables')
+class TestUserRepositoryUpdate:
+    async def test_principal_is_invalidated_after_commit(self, mocker: MockerFixture):
+        # Arrange
+        cache = mocker.patch('app.services.repositories.user_repository.principal_cache', PrincipalCache(60, 10))
+        user = await user_repository.create(
+            UserCreateSchema(username='random_username', email='random@email.com', hashed_password='hash')
+        )
+        principal = PrincipalSchema(id=user.id, is_superuser=False, roles=[])
+        cache.set(user.email, principal)
+
+        # Act
+        async with unit_of_work():
+            await user_repository.update(user.id, {'username': 'new_username'})
+            cached_before_commit = cache.get(user.email)
+
+        # Assert
+        assert cached_before_commit == principal
+        assert cache.get(user.email) is None
+
+    async def test_superuser_change_bumps_permissions_version_after_commit(self, mocker: MockerFixture):
+        # Arrange
+        bump = mocker.patch('app.services.repositories.user_repository.permissions_version_service.bump')
+        user = await user_repository.create(
+            UserCreateSchema(username='random_username', email='random@email.com', hashed_password='hash')
+        )
+
+        # Act
+        async with unit_of_work():
+            await user_repository.update(user.id, {'is_superuser': True})
+            bumped_before_commit = bump.await_count
+
+        # Assert
+        assert bumped_before_commit == 0
+        bump.assert_awaited_once_with(user.id)
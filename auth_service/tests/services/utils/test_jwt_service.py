@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import jwt
+import pytest
+
+
+class TestJWTService:
+    @pytest.mark.parametrize('algorithm', ['RS256', 'EdDSA'])
+    def test_asymmetric_roundtrip(self, make_jwt_service, algorithm: str):
+        # Arrange
+        service = make_jwt_service(algorithm, ['first'], 'first')
+        token = service.create_access_token({'login': 'test@mail.ru'}, datetime.now(timezone.utc))
+
+        result = service.get_token_payload(token)
+
+        # Assert
+        assert result['login'] == 'test@mail.ru'
+        assert jwt.get_unverified_header(token) == {'alg': algorithm, 'kid': 'first', 'typ': 'JWT'}
+
+    def test_signs_with_active_kid_and_verifies_rotated_keys(self, make_jwt_service):
+        # Arrange
+        old_service = make_jwt_service('RS256', ['old', 'new'], 'old')
+        old_token = old_service.create_access_token({'login': 'test@mail.ru'}, datetime.now(timezone.utc))
+        service = make_jwt_service('RS256', ['old', 'new'], 'new')
+
+        result = service.get_token_payload(old_token)
+
+        # Assert
+        assert result['login'] == 'test@mail.ru'
+        new_token = service.create_access_token({'login': 'test@mail.ru'}, datetime.now(timezone.utc))
+        assert jwt.get_unverified_header(new_token)['kid'] == 'new'
+
+    def test_unknown_kid_is_rejected(self, make_jwt_service, tmp_path: Path):
+        # Arrange
+        service = make_jwt_service('EdDSA', ['removed', 'active'], 'removed')
+        token = service.create_access_token({'login': 'test@mail.ru'}, datetime.now(timezone.utc))
+        (tmp_path / 'removed.pem').unlink()
+        service = make_jwt_service('EdDSA', ['active'], 'active')
+
+        with pytest.raises(jwt.InvalidTokenError, match='Unknown kid removed'):
+            service.get_token_payload(token)
+
+    def test_missing_active_kid_is_rejected(self, make_jwt_service):
+        with pytest.raises(ValueError, match='Signing key missing not found'):
+            make_jwt_service('RS256', ['first'], 'missing')
+
+    def test_jwks_contains_public_keys(self, make_jwt_service):
+        # Arrange
+        service = make_jwt_service('EdDSA', ['first', 'second'], 'second')
+
+        result = service.get_jwks()
+
+        # Assert
+        assert [key['kid'] for key in result['keys']] == ['first', 'second']
+        assert all(key['alg'] == 'EdDSA' and key['use'] == 'sig' and key['crv'] == 'Ed25519' for key in result['keys'])
+        assert all('d' not in key for key in result['keys'])
@@ -0,0 +1,31 @@
+import pytest
+
+from app.utils.login_classifier import LoginKind, classify_login, normalize_email
+
+
+class TestLoginClassifier:
+    @pytest.mark.parametrize(
+        'login',
+        ['test@mail.ru', 'Test.User+tag@Mail.Example.com', 'a@b.co'],
+    )
+    def test_email_like_logins(self, login):
+        result = classify_login(login)
+
+        # Assert
+        assert result == LoginKind.EMAIL
+
+    @pytest.mark.parametrize(
+        'login',
+        ['test', '@mail.ru', 'test@', 'test@localhost', 'test@.ru', 'test@mail.', 'te st@mail.ru'],
+    )
+    def test_username_like_logins(self, login):
+        result = classify_login(login)
+
+        # Assert
+        assert result == LoginKind.USERNAME
+
+    def test_normalize_email(self):
+        result = normalize_email('Test.User@Mail.RU')
+
+        # Assert
+        assert result == 'test.user@mail.ru'
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.exceptions import PasswordServiceOverloadedError
+from app.services.utils.password_service import AsyncPasswordService
+
+
+@pytest.mark.anyio
+class TestAsyncPasswordService:
+    async def test_hash_and_verify(self):
+        # Arrange
+        service = AsyncPasswordService(executor_type='thread', max_workers=2, max_pending=4)
+        hashed_password = await service.hash_password('random_password')
+
+        # Act
+        is_valid = await service.verify_password(hashed_password, 'random_password')
+        is_invalid = await service.verify_password(hashed_password, 'wrong_password')
+
+        # Assert
+        assert is_valid is True
+        assert is_invalid is False
+        assert service.get_metrics().completed == 3
+        service.shutdown()
+
+    async def test_failed_jobs_are_not_completed(self):
+        # Arrange
+        service = AsyncPasswordService(executor_type='thread', max_workers=1, max_pending=2)
+
+        # Act
+        with pytest.raises(AttributeError, match='encode'):
+            await service.hash_password(None)
+
+        # Assert
+        metrics = service.get_metrics()
+        assert metrics.completed == 0
+        assert metrics.failed == 1
+        assert metrics.pending == 0
+        service.shutdown()
+
+    async def test_rejects_when_queue_is_full(self):
+        # Arrange
+        service = AsyncPasswordService(executor_type='thread', max_workers=1, max_pending=1)
+
+        # Act
+        results = await asyncio.gather(
+            service.hash_password('first_password'),
+            service.hash_password('second_password'),
+            return_exceptions=True,
+        )
+
+        # Assert
+        assert isinstance(results[1], PasswordServiceOverloadedError)
+        assert service.get_metrics().rejected == 1
+        service.shutdown()
+
+    async def test_cancelled_wait_keeps_running_job_pending(self):
+        # Arrange
+        service = AsyncPasswordService(executor_type='thread', max_workers=1, max_pending=2)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_job() -> None:
+            started.set()
+            release.wait(timeout=5)
+
+        task = asyncio.create_task(service._run(slow_job))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        # Act
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        pending_after_cancel = service.get_metrics().pending
+        release.set()
+        while service.get_metrics().pending:
+            await asyncio.sleep(0.01)
+
+        # Assert
+        assert pending_after_cancel == 1
+        assert service.get_metrics().completed == 1
+        service.shutdown()
@@ -0,0 +1,64 @@
+import uuid
+
+import pytest
+
+from app.schemas.services.auth.user_service_schemas import PrincipalSchema
+from app.services.utils.principal_cache import PrincipalCache
+
+
+class TestPrincipalCache:
+    def test_invalidate_user_drops_all_logins(self):
+        # Arrange
+        cache = PrincipalCache(ttl=60, max_size=10)
+        principal = PrincipalSchema(id=uuid.uuid4(), is_superuser=False, roles=[])
+        other = PrincipalSchema(id=uuid.uuid4(), is_superuser=False, roles=[])
+        cache.set('test@mail.ru', principal)
+        cache.set('test', principal)
+        cache.set('other@mail.ru', other)
+
+        cache.invalidate_user(principal.id)  # act
+
+        # Assert
+        assert cache.get('test@mail.ru') is None
+        assert cache.get('test') is None
+        assert cache.get('other@mail.ru') == other
+        assert cache.get_stats().invalidations == 1
+
+    def test_invalidate_user_keeps_login_taken_by_another_user(self):
+        # Arrange
+        cache = PrincipalCache(ttl=60, max_size=10)
+        old_principal = PrincipalSchema(id=uuid.uuid4(), is_superuser=True, roles=[])
+        new_principal = PrincipalSchema(id=uuid.uuid4(), is_superuser=False, roles=['admin'])
+        cache.set('test@mail.ru', old_principal)
+        cache.set('test@mail.ru', new_principal)
+
+        cache.invalidate_user(old_principal.id)  # act
+
+        # Assert
+        assert cache.get('test@mail.ru') == new_principal
+
+    def test_evicted_login_is_not_invalidated_twice(self):
+        # Arrange
+        cache = PrincipalCache(ttl=60, max_size=1)
+        principal = PrincipalSchema(id=uuid.uuid4(), is_superuser=True, roles=[])
+        other = PrincipalSchema(id=uuid.uuid4(), is_superuser=False, roles=[])
+        cache.set('test@mail.ru', principal)
+        cache.set('other@mail.ru', other)
+
+        cache.invalidate_user(principal.id)  # act
+
+        # Assert
+        assert cache.get('other@mail.ru') == other
+        assert cache.get_stats().size == 1
+
+    @pytest.mark.parametrize(('ttl', 'max_size'), [(0, 10), (60, 0)])
+    def test_disabled_cache_is_bypassed(self, ttl: float, max_size: int):
+        # Arrange
+        cache = PrincipalCache(ttl=ttl, max_size=max_size)
+        cache.set('test@mail.ru', PrincipalSchema(id=uuid.uuid4(), is_superuser=True, roles=[]))
+
+        result = cache.get('test@mail.ru')
+
+        # Assert
+        assert result is None
+        assert cache.get_stats().size == 0
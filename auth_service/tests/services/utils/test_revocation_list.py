@@ -0,0 +1,49 @@
+import json
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.services.utils.revocation_list import RevocationList
+
+
+@pytest.mark.anyio
+class TestRevocationList:
+    async def test_revoked_session_is_checked_locally(self, mocker: MockerFixture):
+        # Arrange
+        redis = mocker.MagicMock()
+        redis.pipeline.return_value.__aenter__.return_value = mocker.MagicMock(execute=mocker.AsyncMock())
+        revocation_list = RevocationList(redis, max_ttl=60)
+
+        # Act
+        await revocation_list.revoke({'session': time.time() + 60})
+
+        # Assert
+        assert revocation_list.is_revoked('session')
+        assert not revocation_list.is_revoked('other_session')
+
+    async def test_expired_revocation_is_ignored(self, mocker: MockerFixture):
+        # Arrange
+        redis = mocker.MagicMock()
+        revocation_list = RevocationList(redis, max_ttl=60)
+
+        # Act
+        await revocation_list.revoke({'session': time.time() - 1})
+
+        # Assert
+        assert not revocation_list.is_revoked('session')
+        redis.pipeline.assert_not_called()
+
+    async def test_revocation_is_published(self, mocker: MockerFixture):
+        # Arrange
+        redis = mocker.MagicMock()
+        pipe = mocker.MagicMock(execute=mocker.AsyncMock())
+        redis.pipeline.return_value.__aenter__.return_value = pipe
+        revocation_list = RevocationList(redis, max_ttl=60)
+        revoked = {'session': time.time() + 60}
+
+        # Act
+        await revocation_list.revoke(revoked)
+
+        # Assert
+        pipe.publish.assert_called_once_with(RevocationList.CHANNEL, json.dumps(revoked))
@@ -0,0 +1,56 @@
+import time
+import uuid
+
+from app.services.utils.token_cache import TokenCache
+
+
+class TestTokenCache:
+    def test_hit_after_set(self):
+        # Arrange
+        cache = TokenCache(max_size=2)
+        payload = {'login': 'test@mail.ru', 'session_id': str(uuid.uuid4()), 'exp': time.time() + 60}
+        cache.set('token', payload)
+
+        result = cache.get('token')
+
+        # Assert
+        assert result == payload
+        assert cache.get_stats().hits == 1
+
+    def test_expired_entry_is_miss(self):
+        # Arrange
+        cache = TokenCache(max_size=2)
+        cache.set('token', {'login': 'test@mail.ru', 'exp': time.time() - 1})
+
+        result = cache.get('token')
+
+        # Assert
+        assert result is None
+        assert cache.get_stats().misses == 1
+
+    def test_lru_eviction(self):
+        # Arrange
+        cache = TokenCache(max_size=2)
+        exp = time.time() + 60
+        cache.set('first', {'exp': exp})
+        cache.set('second', {'exp': exp})
+        cache.get('first')
+
+        cache.set('third', {'exp': exp})  # act
+
+        # Assert
+        assert cache.get('second') is None
+        assert cache.get('first') is not None
+        assert cache.get_stats().evictions == 1
+
+    def test_invalidate_session(self):
+        # Arrange
+        cache = TokenCache(max_size=2)
+        session_id = str(uuid.uuid4())
+        cache.set('token', {'session_id': session_id, 'exp': time.time() + 60})
+
+        cache.invalidate_session(session_id)  # act
+
+        # Assert
+        assert cache.get('token') is None
+        assert cache.get_stats().size == 0